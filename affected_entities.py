@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Affected Entity Resolution
+Looks up which resources each AWS Health event hit, in API-sized batches
+"""
+
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+
+from enrichment import DEFAULT_MAX_WORKERS, chunked
+from instrumentation import SPAN_KIND_CLIENT, tracer
+from rate_limiter import THROTTLE_CODES
+from terminal import console
+
+# describe_affected_entities accepts at most 10 event ARNs per filter
+ENTITIES_BATCH_SIZE = 10
+
+# describe_affected_entities accepts at most 100 results per page
+ENTITIES_PAGE_SIZE = 100
+
+# Event key holding the compact entity list: a tuple of entity values
+# (instance IDs, DB identifiers, ...), one string per affected resource
+ENTITIES_KEY = "affectedEntities"
+
+# Errors that leave a batch's entities unresolved instead of failing the fetch:
+# the lookup needs health:DescribeAffectedEntities, which older policies lack
+SKIPPABLE_ERROR_CODES = THROTTLE_CODES | {"AccessDenied", "AccessDeniedException"}
+
+EntityKey = Tuple[str, Optional[str]]
+
+_warning_lock = threading.Lock()
+_warned = False
+
+
+def warn_entities_skipped(code: str) -> None:
+    """Tell the user once per run that some entity lookups were skipped"""
+    global _warned
+    with _warning_lock:
+        if _warned:
+            return
+        _warned = True
+    console.print(
+        f"[yellow]⚠️  Affected entities unavailable ({code}); those events show \"-\". "
+        "Grant health:DescribeAffectedEntities or use --skip-entities.[/yellow]"
+    )
+
+
+def _collect_pages(
+    operation: Any, request: Dict[str, Any], account_key: bool
+) -> Dict[EntityKey, List[str]]:
+    """Page through an entity operation, keeping only each entity's value"""
+    values: Dict[EntityKey, List[str]] = {}
+    request = dict(request, maxResults=ENTITIES_PAGE_SIZE)
+    while True:
+        response = operation(**request)
+        for entity in response.get("entities", []):
+            key = (entity["eventArn"], entity.get("awsAccountId") if account_key else None)
+            values.setdefault(key, []).append(
+                entity.get("entityValue") or entity.get("entityArn", "")
+            )
+
+        next_token = response.get("nextToken")
+        if not next_token:
+            return values
+        request["nextToken"] = next_token
+
+
+def fetch_entities_batch(health: Any, event_arns: List[str]) -> Dict[EntityKey, List[str]]:
+    """Return entity values for up to 10 events, across every page"""
+    with tracer.span("describe_affected_entities", SPAN_KIND_CLIENT, arns=len(event_arns)):
+        return _collect_pages(
+            health.describe_affected_entities, {"filter": {"eventArns": event_arns}}, False
+        )
+
+
+def fetch_organization_entities_batch(
+    health: Any, pairs: List[EntityKey]
+) -> Dict[EntityKey, List[str]]:
+    """Return entity values for up to 10 (event ARN, account ID) pairs"""
+    filters = []
+    for arn, account_id in pairs:
+        item = {"eventArn": arn}
+        if account_id:
+            item["awsAccountId"] = account_id
+        filters.append(item)
+    return _collect_pages(
+        health.describe_affected_entities_for_organization,
+        {"organizationEntityFilters": filters},
+        True,
+    )
+
+
+def attach_affected_entities(
+    health: Any,
+    events: List[Dict[str, Any]],
+    executor: Optional[Executor] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    organization: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Set `affectedEntities` on each event to a tuple of entity values.
+    With `organization`, events are matched per (ARN, awsAccountId) using the
+    organizational view. Batches run concurrently on `executor` if given.
+    A batch that is denied or throttled leaves its events at None (unknown)
+    and warns once; other errors propagate.
+    """
+    from botocore.exceptions import ClientError
+
+    if not events:
+        return events
+
+    by_key: Dict[EntityKey, List[Dict[str, Any]]] = {}
+    for event in events:
+        account_id = event.get("awsAccountId") if organization else None
+        by_key.setdefault((event["arn"], account_id), []).append(event)
+        event[ENTITIES_KEY] = ()
+
+    key_batches = list(chunked(by_key, ENTITIES_BATCH_SIZE))
+    if organization:
+        batches = [(fetch_organization_entities_batch, batch) for batch in key_batches]
+    else:
+        batches = [
+            (fetch_entities_batch, [arn for arn, _ in batch]) for batch in key_batches
+        ]
+
+    own_executor = executor is None
+    pool = executor or ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="health-entities"
+    )
+    try:
+        futures: Dict[Future, List[EntityKey]] = {
+            pool.submit(fetch, health, batch): keys
+            for (fetch, batch), keys in zip(batches, key_batches)
+        }
+        for future in as_completed(futures):
+            try:
+                found = future.result()
+            except ClientError as e:
+                code = e.response.get("Error", {}).get("Code", "")
+                if code not in SKIPPABLE_ERROR_CODES:
+                    raise
+                warn_entities_skipped(code)
+                for key in futures[future]:
+                    for event in by_key[key]:
+                        event[ENTITIES_KEY] = None
+                continue
+            for key, values in found.items():
+                entity_values = tuple(values)
+                for event in by_key.get(key, []):
+                    event[ENTITIES_KEY] = entity_values
+    finally:
+        if own_executor:
+            pool.shutdown(wait=True)
+
+    return events
+
+
+def entity_count(event: Dict[str, Any]) -> Optional[int]:
+    """Number of affected entities, or None if they were not resolved"""
+    entities = event.get(ENTITIES_KEY)
+    return None if entities is None else len(entities)
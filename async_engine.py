@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Async Health Fetch Engine
+asyncio version of the fetch/enrich pipeline, built on aiobotocore (optional)
+"""
+
+import asyncio
+from typing import Any, Awaitable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from affected_entities import (
+    ENTITIES_BATCH_SIZE,
+    ENTITIES_KEY,
+    ENTITIES_PAGE_SIZE,
+    SKIPPABLE_ERROR_CODES,
+    warn_entities_skipped,
+)
+from enrichment import DETAILS_BATCH_SIZE, MAX_DETAIL_ATTEMPTS, RETRY_BACKOFF, chunked
+from instrumentation import tracer
+
+T = TypeVar("T")
+
+# Concurrent in-flight requests allowed per Health API operation
+DEFAULT_OPERATION_LIMITS = {
+    "describe_events": 2,
+    "describe_event_details": 8,
+    "describe_affected_entities": 8,
+}
+
+INSTALL_HINT = "The async engine needs aiobotocore: pip install 'aws-sla-hunter[async]'"
+
+
+class OperationLimiter:
+    """One semaphore per API operation, bounding in-flight calls to each"""
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None):
+        self.limits = dict(DEFAULT_OPERATION_LIMITS, **(limits or {}))
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def call(self, client: Any, operation: str, **kwargs: Any) -> Dict[str, Any]:
+        """Call `operation` on `client` once a slot for it is free"""
+        semaphore = self._semaphores.get(operation)
+        if semaphore is None:
+            # Created lazily so the semaphore binds to the running loop
+            semaphore = asyncio.Semaphore(self.limits.get(operation, 4))
+            self._semaphores[operation] = semaphore
+        async with semaphore:
+            return await getattr(client, operation)(**kwargs)
+
+
+async def gather_or_cancel(aws: Iterable[Awaitable[T]]) -> List[T]:
+    """
+    Run awaitables concurrently; if one fails, cancel the rest, wait for them
+    to unwind, then re-raise the first error
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def fetch_details_batch_async(
+    client: Any, limiter: OperationLimiter, event_arns: List[str]
+) -> Dict[str, str]:
+    """Fetch descriptions for up to 10 ARNs, retrying failedSet entries"""
+    descriptions: Dict[str, str] = {}
+    pending = list(event_arns)
+    for attempt in range(MAX_DETAIL_ATTEMPTS):
+        if attempt:
+            await asyncio.sleep(RETRY_BACKOFF * (2 ** (attempt - 1)))
+
+        response = await limiter.call(client, "describe_event_details", eventArns=pending)
+        for detail in response.get("successfulSet", []):
+            descriptions[detail["event"]["arn"]] = detail.get("eventDescription", {}).get(
+                "latestDescription", ""
+            )
+
+        pending = [item["eventArn"] for item in response.get("failedSet", [])]
+        if not pending:
+            break
+    return descriptions
+
+
+async def fetch_entities_batch_async(
+    client: Any, limiter: OperationLimiter, event_arns: List[str]
+) -> Dict[str, List[str]]:
+    """Return entity values for up to 10 events, across every page"""
+    values: Dict[str, List[str]] = {}
+    request: Dict[str, Any] = {
+        "filter": {"eventArns": event_arns},
+        "maxResults": ENTITIES_PAGE_SIZE,
+    }
+    while True:
+        response = await limiter.call(client, "describe_affected_entities", **request)
+        for entity in response.get("entities", []):
+            values.setdefault(entity["eventArn"], []).append(
+                entity.get("entityValue") or entity.get("entityArn", "")
+            )
+
+        next_token = response.get("nextToken")
+        if not next_token:
+            return values
+        request["nextToken"] = next_token
+
+
+async def resolve_entities_batch_async(
+    client: Any, limiter: OperationLimiter, event_arns: List[str]
+) -> Tuple[List[str], Optional[Dict[str, List[str]]]]:
+    """
+    Entity values for a batch, or None if the lookup was denied or throttled
+    (warned once, like the threaded path); other errors propagate
+    """
+    from botocore.exceptions import ClientError
+
+    try:
+        return event_arns, await fetch_entities_batch_async(client, limiter, event_arns)
+    except ClientError as e:
+        code = e.response.get("Error", {}).get("Code", "")
+        if code not in SKIPPABLE_ERROR_CODES:
+            raise
+        warn_entities_skipped(code)
+        return event_arns, None
+
+
+async def process_page_async(
+    client: Any,
+    limiter: OperationLimiter,
+    events: List[Dict[str, Any]],
+    resolve_entities: bool,
+) -> List[Dict[str, Any]]:
+    """Enrich one page of events: details and (optionally) affected entities"""
+    by_arn: Dict[str, List[Dict[str, Any]]] = {}
+    for event in events:
+        by_arn.setdefault(event["arn"], []).append(event)
+
+    details = gather_or_cancel(
+        fetch_details_batch_async(client, limiter, batch)
+        for batch in chunked(by_arn, DETAILS_BATCH_SIZE)
+    )
+    if resolve_entities:
+        for event in events:
+            event[ENTITIES_KEY] = ()
+        entities = gather_or_cancel(
+            resolve_entities_batch_async(client, limiter, batch)
+            for batch in chunked(by_arn, ENTITIES_BATCH_SIZE)
+        )
+        detail_results, entity_results = await gather_or_cancel([details, entities])
+    else:
+        detail_results, entity_results = await details, []
+
+    for descriptions in detail_results:
+        for arn, description in descriptions.items():
+            for event in by_arn.get(arn, []):
+                event["description"] = description
+    for batch, values in entity_results:
+        if values is None:
+            for arn in batch:
+                for event in by_arn[arn]:
+                    event[ENTITIES_KEY] = None
+            continue
+        for arn, entity_values in values.items():
+            compact = tuple(entity_values)
+            for event in by_arn.get(arn, []):
+                event[ENTITIES_KEY] = compact
+    return events
+
+
+async def fetch_events_async(
+    client: Any,
+    event_filter: Dict[str, Any],
+    resolve_entities: bool = False,
+    limiter: Optional[OperationLimiter] = None,
+    page_size: int = 100,
+) -> List[Dict[str, Any]]:
+    """
+    Paginate describe_events and enrich each page as soon as it arrives, so
+    enrichment of page N overlaps the request for page N+1. Returns events in
+    API order with the same fields as the threaded pipeline.
+    """
+    limiter = limiter or OperationLimiter()
+    page_tasks: List["asyncio.Future[List[Dict[str, Any]]]"] = []
+    request: Dict[str, Any] = {"filter": event_filter, "maxResults": page_size}
+    try:
+        while True:
+            response = await limiter.call(client, "describe_events", **request)
+            events = response.get("events", [])
+            if events:
+                page_tasks.append(
+                    asyncio.ensure_future(
+                        process_page_async(client, limiter, events, resolve_entities)
+                    )
+                )
+
+            next_token = response.get("nextToken")
+            if not next_token:
+                break
+            request["nextToken"] = next_token
+    except BaseException:
+        for task in page_tasks:
+            task.cancel()
+        await asyncio.gather(*page_tasks, return_exceptions=True)
+        raise
+
+    pages = await gather_or_cancel(page_tasks)
+    return [event for page in pages for event in page]
+
+
+async def _fetch_with_aiobotocore(
+    event_filter: Dict[str, Any],
+    resolve_entities: bool,
+    region: str,
+    limits: Optional[Dict[str, int]],
+) -> List[Dict[str, Any]]:
+    from aiobotocore.session import get_session
+
+    from clients import default_client_config, get_client_factory
+
+    session = get_session()
+    async with session.create_client(
+        "health", region_name=region, config=default_client_config()
+    ) as client:
+        # Paced by the same limiter as the threaded clients, and counted in its
+        # stats and the tracer's per-stage API counters like them
+        get_client_factory().rate_limiter().attach_async(client)
+        tracer.attach(client)
+        return await fetch_events_async(
+            client, event_filter, resolve_entities, OperationLimiter(limits)
+        )
+
+
+def fetch_health_events_async(
+    event_filter: Dict[str, Any],
+    resolve_entities: bool = False,
+    region: str = "us-east-1",
+    limits: Optional[Dict[str, int]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Run the async pipeline to completion from synchronous code.
+    Raises ImportError with an install hint when aiobotocore is missing.
+    """
+    try:
+        import aiobotocore  # noqa: F401
+    except ImportError as e:
+        raise ImportError(INSTALL_HINT) from e
+
+    return asyncio.run(
+        _fetch_with_aiobotocore(event_filter, resolve_entities, region, limits)
+    )
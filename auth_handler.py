@@ -5,24 +5,16 @@ Provides intelligent credential detection and setup wizard
 """
 
 import os
-import sys
-import json
 import subprocess
 from pathlib import Path
-from typing import Optional, Dict, Any, Tuple
-import boto3
-from botocore.exceptions import ClientError, NoCredentialsError, PartialCredentialsError
-from rich.console import Console
-from rich.panel import Panel
-from rich.prompt import Confirm, Prompt
-from rich import box
-
-# Fix for Windows encoding issues with emojis
-if sys.platform == "win32":
-    os.environ["PYTHONIOENCODING"] = "utf-8"
-    console = Console(force_terminal=True, legacy_windows=False)
-else:
-    console = Console()
+from typing import TYPE_CHECKING, Optional, Dict, Any, Tuple
+
+# boto3, botocore and rich are imported where used to keep CLI startup fast
+from clients import ClientFactory, get_client_factory, reset_client_factory
+from terminal import console
+
+if TYPE_CHECKING:
+    import boto3
 
 
 class AuthMethod:
@@ -31,82 +23,84 @@ class AuthMethod:
     ENV_VARS = "Environment Variables"
     AWS_CREDENTIALS_FILE = "~/.aws/credentials"
     AWS_SSO = "AWS SSO"
+    ASSUME_ROLE = "Assumed Role (profile)"
+    CREDENTIAL_PROCESS = "Credential Process"
     MANUAL_SETUP = "Manual Setup"
     UNKNOWN = "Unknown"
 
 
+# botocore credential provider names (Credentials.method) mapped to auth methods
+CREDENTIAL_METHODS = {
+    "env": AuthMethod.ENV_VARS,
+    "shared-credentials-file": AuthMethod.AWS_CREDENTIALS_FILE,
+    "config-file": AuthMethod.AWS_CREDENTIALS_FILE,
+    "boto-config": AuthMethod.AWS_CREDENTIALS_FILE,
+    "sso": AuthMethod.AWS_SSO,
+    "login": AuthMethod.AWS_SSO,
+    "iam-role": AuthMethod.IAM_ROLE,
+    "container-role": AuthMethod.IAM_ROLE,
+    "ec2-credentials-file": AuthMethod.IAM_ROLE,
+    "assume-role": AuthMethod.ASSUME_ROLE,
+    "assume-role-with-web-identity": AuthMethod.ASSUME_ROLE,
+    "custom-process": AuthMethod.CREDENTIAL_PROCESS,
+}
+
+
 class AWSAuthHandler:
     """Handles AWS authentication with multiple methods and fallbacks"""
 
-    def __init__(self):
+    def __init__(
+        self, factory: Optional[ClientFactory] = None, identity: Optional[Dict[str, Any]] = None
+    ):
         self.console = console
         self.detected_method = None
         self.credentials_location = None
+        # Shares the run's session and clients with the rest of the tool
+        self.factory = factory or get_client_factory()
+        # Caller identity, resolved at most once unless credentials change
+        self.identity = identity
 
-    def get_credentials_priority_order(self) -> list:
-        """Return the order in which boto3 looks for credentials"""
-        return [
-            ("IAM Role", self._check_iam_role),
-            ("Environment Variables", self._check_env_vars),
-            ("AWS Credentials File", self._check_credentials_file),
-            ("AWS SSO", self._check_sso),
-        ]
+    @property
+    def session(self) -> "boto3.Session":
+        return self.factory.session
 
-    def _check_iam_role(self) -> Tuple[bool, Optional[str]]:
-        """Check if running with IAM Role (EC2/ECS/Lambda)"""
-        try:
-            # Try to get metadata from EC2 metadata service
-            import urllib.request
-            urllib.request.urlopen("http://169.254.169.254/latest/meta-data/", timeout=1)
-            return True, AuthMethod.IAM_ROLE
-        except Exception:
-            return False, None
+    def refresh(self) -> None:
+        """Forget cached credentials and identity (after the wizard changes them)"""
+        self.factory = reset_client_factory()
+        self.identity = None
 
-    def _check_env_vars(self) -> Tuple[bool, Optional[str]]:
-        """Check if AWS credentials are in environment variables"""
-        if os.getenv("AWS_ACCESS_KEY_ID") and os.getenv("AWS_SECRET_ACCESS_KEY"):
-            return True, AuthMethod.ENV_VARS
-        return False, None
-
-    def _check_credentials_file(self) -> Tuple[bool, Optional[str]]:
-        """Check if ~/.aws/credentials file exists and has profiles"""
-        creds_file = Path.home() / ".aws" / "credentials"
-        if creds_file.exists():
-            return True, AuthMethod.AWS_CREDENTIALS_FILE
-        return False, None
-
-    def _check_sso(self) -> Tuple[bool, Optional[str]]:
-        """Check if AWS SSO is configured"""
-        config_file = Path.home() / ".aws" / "config"
-        if config_file.exists():
-            try:
-                with open(config_file) as f:
-                    content = f.read()
-                    if "sso_start_url" in content or "sso_account_id" in content:
-                        return True, AuthMethod.AWS_SSO
-            except Exception:
-                pass
-        return False, None
+    def resolve_auth_method(self) -> Optional[str]:
+        """
+        Return the auth method botocore resolved credentials with, or None if
+        there are no credentials. Reads the provider chain result; no probing.
+        """
+        credentials = self.session.get_credentials()
+        if credentials is None:
+            return None
+        return CREDENTIAL_METHODS.get(credentials.method, AuthMethod.UNKNOWN)
+
+    def get_identity(self) -> Dict[str, Any]:
+        """Return the caller identity, calling STS only the first time"""
+        if self.identity is None:
+            self.identity = self.factory.client("sts").get_caller_identity()
+        return self.identity
 
     def detect_credentials(self) -> Tuple[bool, Optional[str]]:
         """
         Try to detect existing AWS credentials
         Returns: (has_credentials, auth_method_used)
         """
-        try:
-            sts = boto3.client("sts", region_name="us-east-1")
-            identity = sts.get_caller_identity()
+        from botocore.exceptions import ClientError, NoCredentialsError, PartialCredentialsError
 
-            # Detect which method was used
-            for method_name, check_func in self.get_credentials_priority_order():
-                has_creds, method = check_func()
-                if has_creds:
-                    self.detected_method = method
-                    return True, method
+        try:
+            method = self.resolve_auth_method()
+            if method is None:
+                return False, None
 
-            # If no specific method detected, credentials exist but method unknown
-            self.detected_method = AuthMethod.UNKNOWN
-            return True, AuthMethod.UNKNOWN
+            # Confirms the credentials actually work
+            self.get_identity()
+            self.detected_method = method
+            return True, method
 
         except (NoCredentialsError, PartialCredentialsError):
             return False, None
@@ -120,6 +114,8 @@ class AWSAuthHandler:
 
     def display_current_auth(self, method: str, identity: Dict[str, Any] = None) -> None:
         """Display current authentication status"""
+        from rich.panel import Panel
+
         auth_info = f"[bold cyan]✓ Authentication Method[/bold cyan]\n{method}"
 
         if identity:
@@ -133,6 +129,9 @@ class AWSAuthHandler:
         Interactive setup wizard for AWS credentials
         Returns: True if setup successful
         """
+        from rich.panel import Panel
+        from rich.prompt import Prompt
+
         self.console.print()
         self.console.print(
             Panel(
@@ -151,11 +150,9 @@ class AWSAuthHandler:
             self.console.print(f"[green]✓ Found credentials using: {method}[/green]")
             self.console.print()
 
-            # Show details
+            # Show details (identity was already resolved by detection)
             try:
-                sts = boto3.client("sts", region_name="us-east-1")
-                identity = sts.get_caller_identity()
-                self.display_current_auth(method, identity)
+                self.display_current_auth(method, self.get_identity())
                 return True
             except Exception as e:
                 self.console.print(f"[yellow]Warning: Could not verify credentials: {e}[/yellow]")
@@ -195,6 +192,9 @@ class AWSAuthHandler:
 
     def _setup_sso(self) -> bool:
         """Setup AWS SSO"""
+        from rich.panel import Panel
+        from rich.prompt import Confirm
+
         self.console.print()
         self.console.print(
             Panel(
@@ -221,6 +221,7 @@ class AWSAuthHandler:
                 self.console.print()
 
                 # Verify credentials
+                self.refresh()
                 has_creds, method = self.detect_credentials()
                 if has_creds:
                     self.console.print(f"[green]✓ Verified: Using {method}[/green]")
@@ -241,6 +242,9 @@ class AWSAuthHandler:
 
     def _setup_manual(self) -> bool:
         """Setup AWS CLI manually"""
+        from rich.panel import Panel
+        from rich.prompt import Confirm
+
         self.console.print()
         self.console.print(
             Panel(
@@ -268,6 +272,7 @@ class AWSAuthHandler:
                 self.console.print()
 
                 # Verify
+                self.refresh()
                 has_creds, method = self.detect_credentials()
                 if has_creds:
                     self.console.print(f"[green]✓ Verified: Using {method}[/green]")
@@ -288,6 +293,9 @@ class AWSAuthHandler:
 
     def _setup_env_file(self) -> bool:
         """Setup environment variables in .env file"""
+        from rich.panel import Panel
+        from rich.prompt import Prompt
+
         self.console.print()
         self.console.print(
             Panel(
@@ -323,6 +331,7 @@ AWS_DEFAULT_REGION={region}
         self.console.print("[dim]Make sure .env is in .gitignore[/dim]")
 
         # Verify
+        self.refresh()
         has_creds, method = self.detect_credentials()
         if has_creds:
             self.console.print(f"[green]✓ Verified: Using {method}[/green]")
@@ -335,8 +344,10 @@ AWS_DEFAULT_REGION={region}
         Verify that credentials have access to AWS Health API
         Returns: (has_access, error_message)
         """
+        from botocore.exceptions import ClientError
+
         try:
-            health = boto3.client("health", region_name="us-east-1")
+            health = self.factory.client("health")
             # Try a simple describe_events call
             health.describe_events(maxResults=1)
             return True, None
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+End-to-End Benchmark
+Runs fetch_health_events and display_results against the synthetic Health
+backend and reports wall time, API calls, peak memory and render time as JSON
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main as hunter  # noqa: E402
+from fake_health import BackendConfig, FakeHealthClient, make_health_events  # noqa: E402
+from rate_limiter import AdaptiveRateLimiter  # noqa: E402
+from sla_rules import evaluate_credits  # noqa: E402
+from terminal import console  # noqa: E402
+
+DEFAULT_SIZES = (100, 10_000, 100_000)
+
+# Allowed slowdown against a baseline before a metric counts as a regression
+DEFAULT_TOLERANCE = 0.25
+
+# Timed runs per size; the fastest is reported, which filters scheduler noise
+DEFAULT_REPEAT = 3
+
+# Metrics compared by --compare (lower is better for all of them) and the
+# absolute change below which a difference is treated as noise
+COMPARED_METRICS = {"fetch_s": 0.05, "peak_memory_mb": 1.0, "render_s": 0.05, "sla_s": 0.05}
+
+
+def best_of(repeat: int, fn: Any) -> Any:
+    """Run `fn` `repeat` times; return (fastest seconds, last result)"""
+    best, result = float("inf"), None
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def fetch(client: FakeHealthClient, resolve_entities: bool, shards: int = 1) -> List[Any]:
+    with patch.object(hunter, "get_client", return_value=client):
+        return hunter.fetch_health_events(resolve_entities=resolve_entities, shards=shards)
+
+
+def run_size(
+    count: int,
+    config: BackendConfig,
+    resolve_entities: bool = True,
+    measure_memory: bool = True,
+    repeat: int = DEFAULT_REPEAT,
+    shards: int = 1,
+) -> Dict[str, Any]:
+    """Benchmark one result-set size"""
+    raw = make_health_events(count, seed=config.seed)
+
+    clients: List[FakeHealthClient] = []
+
+    def new_client() -> FakeHealthClient:
+        # Injected throttles go through the real AIMD limiter; without them
+        # it would only add its pacing to every run
+        limiter = AdaptiveRateLimiter() if config.throttle_rate else None
+        return FakeHealthClient(raw, config, limiter)
+
+    def timed_fetch() -> List[Any]:
+        clients.append(new_client())
+        return fetch(clients[-1], resolve_entities, shards)
+
+    fetch_s, events = best_of(repeat, timed_fetch)
+    client = clients[-1]
+
+    peak_memory_mb = None
+    if measure_memory:
+        # A second, traced run: tracemalloc slows allocation, so it is kept
+        # out of the timed one
+        tracemalloc.start()
+        fetch(new_client(), resolve_entities, shards)
+        peak_memory_mb = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        console.configure(file=devnull, width=160)
+        try:
+            render_s, _ = best_of(repeat, lambda: hunter.display_results(events))
+        finally:
+            console.configure()
+
+    sla_s, _ = best_of(repeat, lambda: evaluate_credits(events))
+
+    rate_limit = None
+    if client.rate_limiter is not None:
+        stats = client.rate_limiter.stats()
+        rate_limit = {
+            "throttles": stats.throttles,
+            "wait_s": round(stats.wait_time, 4),
+            "final_rate": round(stats.rate, 2),
+        }
+
+    return {
+        "events": count,
+        "fetched": len(events),
+        "fetch_s": round(fetch_s, 4),
+        "events_per_s": round(count / fetch_s) if fetch_s else None,
+        "api_calls": client.api_calls,
+        "calls_by_operation": dict(sorted(client.calls.items())),
+        "throttles": client.throttles,
+        "rate_limit": rate_limit,
+        "failed_details": client.failures,
+        "peak_memory_mb": round(peak_memory_mb, 2) if peak_memory_mb is not None else None,
+        "render_s": round(render_s, 4),
+        "sla_s": round(sla_s, 4),
+    }
+
+
+def run_benchmarks(
+    sizes: Sequence[int],
+    config: BackendConfig = BackendConfig(),
+    resolve_entities: bool = True,
+    measure_memory: bool = True,
+    repeat: int = DEFAULT_REPEAT,
+    shards: int = 1,
+) -> Dict[str, Any]:
+    """Benchmark every size and wrap the results with run metadata"""
+    return {
+        "benchmark": "aws-sla-hunter",
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": dict(
+            config._asdict(), resolve_entities=resolve_entities, repeat=repeat, shards=shards
+        ),
+        "results": [
+            run_size(count, config, resolve_entities, measure_memory, repeat, shards)
+            for count in sizes
+        ],
+    }
+
+
+def find_regressions(
+    current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = DEFAULT_TOLERANCE
+) -> List[str]:
+    """Metrics that got worse than the baseline by more than `tolerance`"""
+    previous = {result["events"]: result for result in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        old = previous.get(result["events"])
+        if old is None:
+            continue
+        for metric, noise in COMPARED_METRICS.items():
+            new_value, old_value = result.get(metric), old.get(metric)
+            if new_value is None or not old_value:
+                continue
+            if new_value > old_value * (1 + tolerance) and new_value - old_value > noise:
+                regressions.append(
+                    f"{result['events']} events: {metric} {old_value:g} -> {new_value:g} "
+                    f"(+{new_value / old_value - 1:.0%})"
+                )
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per API call")
+    parser.add_argument("--page-size", type=int, default=BackendConfig().page_size)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--skip-entities", action="store_true")
+    parser.add_argument("--shards", type=int, default=1, help="date-range shards per fetch")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed runs per size")
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced memory run")
+    parser.add_argument("--output", metavar="PATH", help="write the JSON here instead of stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="fail on regressions vs this JSON")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    config = BackendConfig(
+        latency=args.latency,
+        page_size=args.page_size,
+        throttle_rate=args.throttle_rate,
+        failure_rate=args.failure_rate,
+    )
+    report = run_benchmarks(
+        args.sizes,
+        config,
+        not args.skip_entities,
+        measure_memory=not args.no_memory,
+        repeat=args.repeat,
+        shards=args.shards,
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = find_regressions(report, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Normalization Microbenchmark
+Legacy per-row service/event-type formatting vs the memoized catalog lookup
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from normalization import clear_caches, get_catalog, normalize_event_type, normalize_service  # noqa: E402
+
+DEFAULT_EVENTS = 1_000_000
+
+
+def legacy_format_service(event: Dict[str, Any]) -> str:
+    """format_service as it was before the catalog: map rebuilt per call"""
+    service = event.get("service", "Unknown")
+    service_map = {
+        "EC2": "EC2",
+        "RDS": "RDS",
+        "ELASTICLOADBALANCING": "ELB",
+        "S3": "S3",
+        "DYNAMODB": "DynamoDB",
+        "LAMBDA": "Lambda",
+        "CLOUDFRONT": "CloudFront",
+    }
+    for key, value in service_map.items():
+        if key in service.upper():
+            return value
+    return service[:15] if service else "Unknown"
+
+
+def legacy_format_event_type(event: Dict[str, Any]) -> str:
+    event_type = event.get("eventTypeCode", "Unknown")
+    return event_type.replace("_", " ").title()[:25]
+
+
+def make_events(count: int, seed: int = 7) -> List[Dict[str, str]]:
+    """Synthetic events drawn from the catalog's service codes"""
+    rng = random.Random(seed)
+    services = sorted(get_catalog().services)
+    codes = ["OPERATIONAL_ISSUE", "API_ISSUE", "MAINTENANCE_SCHEDULED", "CONNECTIVITY_ISSUE"]
+    pool = [
+        (service, sys.intern(f"AWS_{service}_{code}")) for service in services for code in codes
+    ]
+    return [
+        {"service": service, "eventTypeCode": event_type}
+        for service, event_type in (rng.choice(pool) for _ in range(count))
+    ]
+
+
+def run(label: str, fn: Callable[[Dict[str, str]], Tuple[str, str]], events: List[Dict[str, str]]) -> float:
+    started = time.perf_counter()
+    for event in events:
+        fn(event)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<8} {elapsed:8.3f} s  {len(events) / elapsed / 1e6:6.2f} M events/s")
+    return elapsed
+
+
+def main(argv: Any = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=DEFAULT_EVENTS)
+    args = parser.parse_args(argv)
+
+    events = make_events(args.events)
+    clear_caches()
+    legacy = run(
+        "legacy",
+        lambda e: (legacy_format_service(e), legacy_format_event_type(e)),
+        events,
+    )
+    indexed = run(
+        "indexed",
+        lambda e: (normalize_service(e["service"]), normalize_event_type(e["eventTypeCode"])),
+        events,
+    )
+    print(f"speedup  {legacy / indexed:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Shared AWS Client Factory
+One boto3 Session per run, with memoized clients per (service, region, account)
+"""
+
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from health_endpoint import HealthEndpointSelector
+from instrumentation import tracer
+from rate_limiter import AdaptiveRateLimiter, RateLimitStats, combine_stats
+
+# boto3/botocore are imported on first client creation to keep startup fast
+if TYPE_CHECKING:
+    import boto3
+    from botocore.config import Config
+
+# Region for global services; Health clients without a region go through
+# HealthEndpointSelector instead
+DEFAULT_REGION = "us-east-1"
+
+# Enough pooled connections for every worker thread sharing one client
+MAX_POOL_CONNECTIONS = 50
+
+# Services whose clients are paced by a shared AdaptiveRateLimiter
+RATE_LIMITED_SERVICES = frozenset({"health"})
+
+# botocore Config options applied to every client. Standard (not adaptive)
+# retries: pacing is done by our own limiter, shared across all Health clients
+CLIENT_CONFIG_OPTIONS: Dict[str, Any] = {
+    "max_pool_connections": MAX_POOL_CONNECTIONS,
+    "retries": {"mode": "standard", "max_attempts": 5},
+    "connect_timeout": 5,
+    "read_timeout": 30,
+}
+
+ClientKey = Tuple[str, str, Optional[str]]
+
+
+def default_client_config() -> "Config":
+    """Build the tuned botocore Config shared by all clients"""
+    from botocore.config import Config
+
+    return Config(**CLIENT_CONFIG_OPTIONS)
+
+
+class ClientFactory:
+    """Owns the run's boto3 Session(s) and hands out shared, thread-safe clients"""
+
+    def __init__(
+        self, session: Optional["boto3.Session"] = None, config: Optional["Config"] = None
+    ):
+        self._config = config
+        self._session = session
+        self._account_sessions: Dict[str, "boto3.Session"] = {}
+        self._clients: Dict[ClientKey, Any] = {}
+        # One limiter per account: throttling quotas are per account
+        self._limiters: Dict[Optional[str], AdaptiveRateLimiter] = {}
+        self.health_endpoint = HealthEndpointSelector()
+        # boto3 Sessions are not thread-safe; client creation is serialized
+        self._lock = threading.RLock()
+
+    @property
+    def session(self) -> "boto3.Session":
+        """The default-credentials session, created on first use"""
+        with self._lock:
+            if self._session is None:
+                import boto3
+
+                self._session = boto3.Session()
+            return self._session
+
+    @property
+    def config(self) -> "Config":
+        with self._lock:
+            if self._config is None:
+                self._config = default_client_config()
+            return self._config
+
+    def client(
+        self, service: str, region: Optional[str] = None, account_id: Optional[str] = None
+    ) -> Any:
+        """
+        Return the client for (service, region, account), creating it once.
+        `account_id` selects a session registered with add_account_session or
+        assume_role; None uses the default credentials. Without a region,
+        Health clients use the endpoint picked by health_region().
+        """
+        if region is None:
+            region = self.health_region(account_id) if service == "health" else DEFAULT_REGION
+        key = (service, region, account_id)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                if account_id is None:
+                    session = self.session
+                else:
+                    session = self._account_sessions[account_id]
+                client = session.client(service, region_name=region, config=self.config)
+                if service in RATE_LIMITED_SERVICES:
+                    self.rate_limiter(account_id).attach(client)
+                tracer.attach(client)
+                self._clients[key] = client
+            return client
+
+    def health_region(self, account_id: Optional[str] = None) -> str:
+        """The Health region for this run, hedging the first request across endpoints"""
+        # Probed outside self._lock: the probe creates clients on other threads
+        return self.health_endpoint.select(
+            lambda region: self.client("health", region, account_id)
+        )
+
+    def rate_limiter(self, account_id: Optional[str] = None) -> AdaptiveRateLimiter:
+        """The limiter shared by every rate-limited client of an account"""
+        with self._lock:
+            limiter = self._limiters.get(account_id)
+            if limiter is None:
+                limiter = self._limiters[account_id] = AdaptiveRateLimiter()
+            return limiter
+
+    def rate_limit_stats(self) -> RateLimitStats:
+        """Combined limiter counters for the run summary"""
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return combine_stats(limiters)
+
+    def add_account_session(self, account_id: str, session: "boto3.Session") -> None:
+        """Register credentials for an account, sharing the loaded service models"""
+        with self._lock:
+            loader = self.session._session.get_component("data_loader")
+            session._session.register_component("data_loader", loader)
+            self._account_sessions[account_id] = session
+            # Drop clients built from earlier credentials for this account
+            for key in [k for k in self._clients if k[2] == account_id]:
+                del self._clients[key]
+
+    def assume_role(self, account_id: str, role_arn: str, session_name: str) -> None:
+        """Assume `role_arn` and register its temporary credentials for the account"""
+        import boto3
+
+        sts = self.client("sts")
+        credentials = sts.assume_role(RoleArn=role_arn, RoleSessionName=session_name)[
+            "Credentials"
+        ]
+        self.add_account_session(
+            account_id,
+            boto3.Session(
+                aws_access_key_id=credentials["AccessKeyId"],
+                aws_secret_access_key=credentials["SecretAccessKey"],
+                aws_session_token=credentials["SessionToken"],
+            ),
+        )
+
+
+_factory: Optional[ClientFactory] = None
+_factory_lock = threading.Lock()
+
+
+def get_client_factory() -> ClientFactory:
+    """Return the process-wide client factory"""
+    global _factory
+    with _factory_lock:
+        if _factory is None:
+            _factory = ClientFactory()
+        return _factory
+
+
+def reset_client_factory(factory: Optional[ClientFactory] = None) -> ClientFactory:
+    """Replace the process-wide factory, e.g. after credentials change"""
+    global _factory
+    with _factory_lock:
+        _factory = factory or ClientFactory()
+        return _factory
+
+
+def get_client(
+    service: str, region: Optional[str] = None, account_id: Optional[str] = None
+) -> Any:
+    """Shortcut for get_client_factory().client(...)"""
+    return get_client_factory().client(service, region, account_id)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Incident Correlation
+Groups events of one service and event type with overlapping time intervals
+into incidents, by sort-and-sweep in O(n log n)
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from event_cache import to_timestamp
+from health_event import HealthEvent
+
+# Events this close together still count as one incident; regional reports
+# of one outage rarely start at exactly the same moment
+DEFAULT_CORRELATION_SLACK = timedelta(minutes=15)
+
+IncidentKey = Tuple[Optional[str], Optional[str]]
+
+
+class Incident:
+    """Related events plus the distinct accounts, regions and entities they touch"""
+
+    __slots__ = (
+        "service",
+        "event_type_code",
+        "start_time",
+        "end_time",
+        "events",
+        "accounts",
+        "regions",
+        "entities",
+        "open_events",
+    )
+
+    def __init__(self, service: Optional[str], event_type_code: Optional[str]):
+        self.service = service
+        self.event_type_code = event_type_code
+        self.start_time: Optional[datetime] = None
+        # None while any event is still open
+        self.end_time: Optional[datetime] = None
+        self.events: List[HealthEvent] = []
+        self.accounts: Set[str] = set()
+        self.regions: Set[str] = set()
+        self.entities: Set[str] = set()
+        self.open_events = 0
+
+    def add(self, event: HealthEvent) -> None:
+        self.events.append(event)
+        if event.account_id:
+            self.accounts.add(event.account_id)
+        self.regions.add(event.region or "global")
+        if event.entities:
+            self.entities.update(event.entities)
+        if event.is_open:
+            self.open_events += 1
+
+    @property
+    def is_open(self) -> bool:
+        return self.open_events > 0
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+
+def correlate_events(
+    events: Iterable[HealthEvent],
+    slack: timedelta = DEFAULT_CORRELATION_SLACK,
+    now: Optional[datetime] = None,
+) -> List[Incident]:
+    """
+    Group events into incidents, newest first. Within each (service, event
+    type), events sorted by start join the current incident while they start
+    before its latest end plus `slack`; open events count as ending `now`.
+    Events without a start time stay on their own.
+    """
+    now_ts = to_timestamp(now or datetime.now(timezone.utc))
+    gap = slack.total_seconds()
+
+    groups: Dict[IncidentKey, List[Tuple[float, float, HealthEvent]]] = {}
+    incidents: List[Incident] = []
+    for event in events:
+        key = (event.service, event.event_type_code)
+        if event.start_time is None:
+            incident = Incident(*key)
+            incident.add(event)
+            incidents.append(incident)
+            continue
+        start = to_timestamp(event.start_time)
+        end = to_timestamp(event.end_time) if event.end_time and not event.is_open else now_ts
+        groups.setdefault(key, []).append((start, max(start, end), event))
+
+    for key, intervals in groups.items():
+        intervals.sort(key=lambda interval: interval[0])
+        current: Optional[Incident] = None
+        current_end = latest_end = 0.0
+        for start, end, event in intervals:
+            if current is None or start > current_end + gap:
+                current = Incident(*key)
+                current.start_time = event.start_time
+                incidents.append(current)
+                current_end, latest_end = end, 0.0
+            current_end = max(current_end, end)
+            current.add(event)
+            if not event.is_open and event.end_time is not None and end > latest_end:
+                current.end_time, latest_end = event.end_time, end
+    # An incident with open events has no end yet
+    for incident in incidents:
+        if incident.open_events:
+            incident.end_time = None
+
+    incidents.sort(
+        key=lambda incident: (
+            incident.start_time is not None,
+            to_timestamp(incident.start_time) if incident.start_time else 0.0,
+        ),
+        reverse=True,
+    )
+    return incidents
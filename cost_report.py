@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Cost and Usage Report Reader
+Streams local CUR exports into monthly spend and prices the eligible SLA credits
+"""
+
+import csv
+import gzip
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from normalization import normalize_product_code
+from sla_rules import MonthlyCredit
+
+# Accepted header names per column: legacy CUR CSV, then CUR 2.0 / Parquet
+USAGE_START_COLUMNS = ("lineItem/UsageStartDate", "line_item_usage_start_date")
+COST_COLUMNS = ("lineItem/UnblendedCost", "line_item_unblended_cost")
+ACCOUNT_COLUMNS = ("lineItem/UsageAccountId", "line_item_usage_account_id")
+PRODUCT_COLUMNS = ("lineItem/ProductCode", "line_item_product_code")
+REGION_COLUMNS = (
+    "product/region",
+    "product/regionCode",
+    "product_region",
+    "product_region_code",
+)
+
+# Rows per Parquet record batch; bounds memory regardless of file size
+PARQUET_BATCH_SIZE = 65536
+
+INSTALL_HINT = "Reading Parquet CUR files needs pyarrow: pip install 'aws-sla-hunter[cur]'"
+
+# (account ID, service display name, region, YYYY-MM)
+SpendKey = Tuple[str, str, str, str]
+
+# (event ARN, account ID); the same public event ARN recurs across accounts
+EventKey = Tuple[str, Optional[str]]
+
+
+class CreditEstimate(NamedTuple):
+    """An eligible service-month priced against its CUR spend"""
+
+    credit: MonthlyCredit
+    spend: float
+    amount: float
+
+    @property
+    def per_event(self) -> float:
+        """Estimated amount attributed to each event in the service-month"""
+        return self.amount / max(1, len(self.credit.event_arns))
+
+
+def _pick_column(names: List[str], candidates: Tuple[str, ...], required: bool = True) -> Optional[str]:
+    for candidate in candidates:
+        if candidate in names:
+            return candidate
+    if required:
+        raise ValueError(f"CUR file has no {candidates[0]} column")
+    return None
+
+
+def _open_text(path: Path) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, encoding="utf-8", newline="")
+
+
+def _add_spend(
+    spend: Dict[SpendKey, float],
+    account: Any,
+    product: Any,
+    region: Any,
+    month: str,
+    cost: float,
+) -> None:
+    key = (str(account or ""), normalize_product_code(product), region or "global", month)
+    spend[key] = spend.get(key, 0.0) + cost
+
+
+def aggregate_csv(path: Path, spend: Optional[Dict[SpendKey, float]] = None) -> Dict[SpendKey, float]:
+    """
+    Sum unblended cost per account/service/region/month from a CSV (or
+    .csv.gz) CUR file, one row at a time and only touching the needed columns
+    """
+    spend = {} if spend is None else spend
+    with _open_text(path) as fh:
+        reader = csv.reader(fh)
+        header = next(reader, None)
+        if header is None:
+            return spend
+        columns = [
+            _pick_column(header, USAGE_START_COLUMNS),
+            _pick_column(header, COST_COLUMNS),
+            _pick_column(header, ACCOUNT_COLUMNS),
+            _pick_column(header, PRODUCT_COLUMNS),
+            _pick_column(header, REGION_COLUMNS, required=False),
+        ]
+        start_i, cost_i, account_i, product_i, region_i = [
+            header.index(name) if name else None for name in columns
+        ]
+        for row in reader:
+            if not row:
+                continue
+            cost = row[cost_i]
+            if not cost:
+                continue
+            _add_spend(
+                spend,
+                row[account_i],
+                row[product_i],
+                row[region_i] if region_i is not None else None,
+                row[start_i][:7],
+                float(cost),
+            )
+    return spend
+
+
+def _iter_parquet_batches(path: Path) -> Iterator[Any]:
+    """Yield pruned record batches with month and cost already computed"""
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(INSTALL_HINT) from e
+
+    parquet = pq.ParquetFile(str(path))
+    names = parquet.schema_arrow.names
+    start = _pick_column(names, USAGE_START_COLUMNS)
+    cost = _pick_column(names, COST_COLUMNS)
+    account = _pick_column(names, ACCOUNT_COLUMNS)
+    product = _pick_column(names, PRODUCT_COLUMNS)
+    region = _pick_column(names, REGION_COLUMNS, required=False)
+    columns = [c for c in (start, cost, account, product, region) if c]
+
+    for batch in parquet.iter_batches(batch_size=PARQUET_BATCH_SIZE, columns=columns):
+        table = pa.Table.from_batches([batch])
+        usage_start = table.column(start)
+        if pa.types.is_timestamp(usage_start.type):
+            month = pc.strftime(usage_start, format="%Y-%m")
+        else:
+            month = pc.utf8_slice_codeunits(pc.cast(usage_start, pa.string()), 0, 7)
+        region_column = (
+            table.column(region) if region else pa.nulls(table.num_rows, pa.string())
+        )
+        grouped = pa.table(
+            {
+                "account": pc.cast(table.column(account), pa.string()),
+                "product": table.column(product),
+                "region": region_column,
+                "month": month,
+                "cost": pc.cast(table.column(cost), pa.float64()),
+            }
+        ).group_by(["account", "product", "region", "month"]).aggregate([("cost", "sum")])
+        yield grouped
+
+
+def aggregate_parquet(
+    path: Path, spend: Optional[Dict[SpendKey, float]] = None
+) -> Dict[SpendKey, float]:
+    """
+    Sum unblended cost from a Parquet CUR file, reading only the needed
+    columns in record batches and grouping each batch with pyarrow
+    """
+    spend = {} if spend is None else spend
+    for grouped in _iter_parquet_batches(path):
+        rows = grouped.to_pydict()
+        for account, product, region, month, cost in zip(
+            rows["account"], rows["product"], rows["region"], rows["month"], rows["cost_sum"]
+        ):
+            if cost:
+                _add_spend(spend, account, product, region, month, cost)
+    return spend
+
+
+def load_monthly_spend(paths: Iterable[str]) -> Dict[SpendKey, float]:
+    """Aggregate every CUR file given (CSV, CSV.GZ or Parquet) into one spend table"""
+    spend: Dict[SpendKey, float] = {}
+    for value in paths:
+        path = Path(value)
+        if path.is_dir():
+            files = sorted(
+                p
+                for p in path.rglob("*")
+                if p.name.endswith((".csv", ".csv.gz", ".parquet"))
+            )
+        else:
+            files = [path]
+        for file in files:
+            if file.suffix == ".parquet":
+                aggregate_parquet(file, spend)
+            else:
+                aggregate_csv(file, spend)
+    return spend
+
+
+def spend_for(
+    spend: Dict[SpendKey, float], credit: MonthlyCredit, account: Optional[str] = None
+) -> float:
+    """
+    CUR spend matching a service-month. Single-account scans do not tag
+    events with an account, so their spend is read for `account` (the
+    caller), or summed across every account when the caller is unknown.
+    """
+    account_id = credit.account_id or account
+    if account_id:
+        return spend.get((account_id, credit.service, credit.region, credit.month), 0.0)
+    return sum(
+        cost
+        for (_, service, region, month), cost in spend.items()
+        if (service, region, month) == (credit.service, credit.region, credit.month)
+    )
+
+
+def estimate_credits(
+    credits: Iterable[MonthlyCredit],
+    spend: Dict[SpendKey, float],
+    account: Optional[str] = None,
+) -> List[CreditEstimate]:
+    """Price each eligible service-month, largest estimate first"""
+    estimates = [
+        CreditEstimate(credit, cost, cost * credit.credit_percent / 100.0)
+        for credit in credits
+        if credit.credit_percent > 0
+        for cost in (spend_for(spend, credit, account),)
+    ]
+    estimates.sort(key=lambda estimate: estimate.amount, reverse=True)
+    return estimates
+
+
+def event_estimates(estimates: Iterable[CreditEstimate]) -> Dict[EventKey, float]:
+    """Estimated recoverable credit per (event ARN, account ID)"""
+    per_event: Dict[EventKey, float] = {}
+    for estimate in estimates:
+        share = estimate.per_event
+        for arn in estimate.credit.event_arns:
+            key = (arn, estimate.credit.account_id)
+            per_event[key] = per_event.get(key, 0.0) + share
+    return per_event
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Event Detail Enrichment
+Fetches AWS Health event descriptions in API-sized batches over a thread pool
+"""
+
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from instrumentation import SPAN_KIND_CLIENT, tracer
+
+# describe_event_details accepts at most 10 event ARNs per request
+DETAILS_BATCH_SIZE = 10
+
+# Concurrent describe_event_details requests sharing one client
+DEFAULT_MAX_WORKERS = 8
+
+# Attempts for ARNs reported in failedSet before giving up on them
+MAX_DETAIL_ATTEMPTS = 3
+
+# Base delay (seconds) between failedSet retries, doubled each attempt
+RETRY_BACKOFF = 0.2
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split an iterable into lists of at most `size` items"""
+    batch: List[Any] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def fetch_details_batch(
+    health: Any,
+    event_arns: List[str],
+    max_attempts: int = MAX_DETAIL_ATTEMPTS,
+    backoff: float = RETRY_BACKOFF,
+) -> Tuple[Dict[str, str], List[Dict[str, Any]]]:
+    """
+    Fetch descriptions for up to 10 event ARNs, retrying failedSet entries
+    Returns: (descriptions by ARN, failedSet items left after the last attempt)
+    """
+    descriptions: Dict[str, str] = {}
+    pending = list(event_arns)
+    failed: List[Dict[str, Any]] = []
+
+    for attempt in range(max_attempts):
+        if attempt:
+            time.sleep(backoff * (2 ** (attempt - 1)))
+
+        with tracer.span(
+            "describe_event_details", SPAN_KIND_CLIENT, arns=len(pending), attempt=attempt + 1
+        ):
+            response = health.describe_event_details(eventArns=pending)
+        for detail in response.get("successfulSet", []):
+            description = detail.get("eventDescription", {})
+            descriptions[detail["event"]["arn"]] = description.get(
+                "latestDescription", ""
+            )
+
+        failed = response.get("failedSet", [])
+        pending = [item["eventArn"] for item in failed]
+        if not pending:
+            break
+
+    return descriptions, failed
+
+
+def enrich_events(
+    health: Any,
+    events: List[Dict[str, Any]],
+    executor: Optional[Executor] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> List[Dict[str, Any]]:
+    """
+    Attach a `description` to each event, merging batches as they complete.
+    Events whose details could not be fetched are left without a description.
+    Pass a shared `executor` to reuse one pool across many pages.
+    """
+    if not events:
+        return events
+
+    by_arn: Dict[str, List[Dict[str, Any]]] = {}
+    for event in events:
+        by_arn.setdefault(event["arn"], []).append(event)
+
+    own_executor = executor is None
+    pool = executor or ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="health-details"
+    )
+    try:
+        futures = [
+            pool.submit(fetch_details_batch, health, batch)
+            for batch in chunked(by_arn, DETAILS_BATCH_SIZE)
+        ]
+        for future in as_completed(futures):
+            descriptions, _ = future.result()
+            for arn, description in descriptions.items():
+                for event in by_arn.get(arn, []):
+                    event["description"] = description
+    finally:
+        if own_executor:
+            pool.shutdown(wait=True)
+
+    return events
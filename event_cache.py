@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Persistent AWS Health Event Cache
+SQLite store keyed by event ARN so warm runs only sync what changed
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    import sqlite3
+
+# Event fields stored as datetimes by boto3
+DATETIME_FIELDS = ("startTime", "endTime", "lastUpdatedTime")
+
+DEFAULT_SCOPE = "default"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    scope TEXT NOT NULL,
+    arn TEXT NOT NULL,
+    status TEXT,
+    start_time REAL,
+    last_updated REAL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (scope, arn)
+);
+CREATE INDEX IF NOT EXISTS idx_events_scope_start ON events (scope, start_time);
+CREATE TABLE IF NOT EXISTS sync_state (
+    scope TEXT PRIMARY KEY,
+    watermark REAL NOT NULL,
+    window_start REAL NOT NULL
+);
+"""
+
+
+def default_cache_path() -> Path:
+    """Return the cache file location (override with AWS_SLA_HUNTER_CACHE_DIR)"""
+    base = os.getenv("AWS_SLA_HUNTER_CACHE_DIR")
+    if base:
+        return Path(base) / "events.db"
+    return Path.home() / ".cache" / "aws-sla-hunter" / "events.db"
+
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = _EPOCH.replace(tzinfo=timezone.utc)
+
+
+def to_timestamp(value: datetime) -> float:
+    """POSIX timestamp of a datetime; naive datetimes from the API and cache are UTC"""
+    return (value - (_EPOCH if value.tzinfo is None else _EPOCH_UTC)).total_seconds()
+
+
+def _to_timestamp(value: Any) -> Optional[float]:
+    """Convert a datetime or ISO string to a POSIX timestamp, passing None through"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return to_timestamp(value)
+
+
+def _from_timestamp(value: float) -> datetime:
+    return datetime.fromtimestamp(value, tz=timezone.utc)
+
+
+def _encode_event(event: Dict[str, Any]) -> str:
+    record = dict(event)
+    for field in DATETIME_FIELDS:
+        if isinstance(record.get(field), datetime):
+            record[field] = record[field].isoformat()
+    return json.dumps(record, default=str)
+
+
+def _decode_event(data: str) -> Dict[str, Any]:
+    event = json.loads(data)
+    for field in DATETIME_FIELDS:
+        if isinstance(event.get(field), str):
+            event[field] = datetime.fromisoformat(event[field])
+    return event
+
+
+def event_status(event: Dict[str, Any]) -> str:
+    """Return the lowercase status of an API or cached event"""
+    return str(event.get("statusCode") or event.get("eventStatus") or "closed").lower()
+
+
+class EventCache:
+    """Local store of Health events plus a per-scope sync watermark"""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else default_cache_path()
+        self._conn: Optional["sqlite3.Connection"] = None
+        # Events served from the cache vs fetched from the API, across syncs
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def conn(self) -> "sqlite3.Connection":
+        # Opened lazily so constructing a cache never touches the disk
+        if self._conn is None:
+            import sqlite3
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path))
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def get_watermark(
+        self, window_start: datetime, scope: str = DEFAULT_SCOPE
+    ) -> Optional[datetime]:
+        """
+        Return the last sync time for a scope, or None when a full sync is
+        needed (never synced, or the requested window starts earlier)
+        """
+        row = self.conn.execute(
+            "SELECT watermark, window_start FROM sync_state WHERE scope = ?", (scope,)
+        ).fetchone()
+        if row is None or _to_timestamp(window_start) < row[1]:
+            return None
+        return _from_timestamp(row[0])
+
+    def set_watermark(
+        self, watermark: datetime, window_start: datetime, scope: str = DEFAULT_SCOPE
+    ) -> None:
+        """Record a completed sync; the covered window only ever grows"""
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO sync_state (scope, watermark, window_start) VALUES (?, ?, ?) "
+                "ON CONFLICT(scope) DO UPDATE SET watermark = excluded.watermark, "
+                "window_start = MIN(window_start, excluded.window_start)",
+                (scope, _to_timestamp(watermark), _to_timestamp(window_start)),
+            )
+
+    def upsert(self, events: Iterable[Dict[str, Any]], scope: str = DEFAULT_SCOPE) -> int:
+        """Insert or replace events; returns the number written"""
+        rows = [
+            (
+                scope,
+                event["arn"],
+                event_status(event),
+                _to_timestamp(event.get("startTime")),
+                _to_timestamp(event.get("lastUpdatedTime")),
+                _encode_event(event),
+            )
+            for event in events
+        ]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO events "
+                "(scope, arn, status, start_time, last_updated, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def load(
+        self, start_time: datetime, end_time: datetime, scope: str = DEFAULT_SCOPE
+    ) -> List[Dict[str, Any]]:
+        """Return cached events that started inside the window, newest first"""
+        rows = self.conn.execute(
+            "SELECT data FROM events WHERE scope = ? AND start_time BETWEEN ? AND ? "
+            "ORDER BY start_time DESC",
+            (scope, _to_timestamp(start_time), _to_timestamp(end_time)),
+        )
+        return [_decode_event(data) for (data,) in rows]
+
+    def get(self, arns: Iterable[str], scope: str = DEFAULT_SCOPE) -> Dict[str, Dict[str, Any]]:
+        """Return cached events by ARN for the ARNs that are present"""
+        found: Dict[str, Dict[str, Any]] = {}
+        for arn in arns:
+            row = self.conn.execute(
+                "SELECT data FROM events WHERE scope = ? AND arn = ?", (scope, arn)
+            ).fetchone()
+            if row:
+                found[arn] = _decode_event(row[0])
+        return found
+
+    def open_arns(self, scope: str = DEFAULT_SCOPE) -> List[str]:
+        """ARNs of cached events still marked open"""
+        rows = self.conn.execute(
+            "SELECT arn FROM events WHERE scope = ? AND status = 'open'", (scope,)
+        )
+        return [arn for (arn,) in rows]
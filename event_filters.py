@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Event Filters
+Pushes --service/--region/--event-type/--status into the Health API filter
+and applies whatever the API cannot express as a streaming client-side stage
+"""
+
+import re
+from collections import Counter
+from fnmatch import fnmatchcase
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from event_cache import DEFAULT_SCOPE
+from health_event import HealthEvent
+
+# Most values the Health API accepts in one filter list
+MAX_FILTER_VALUES = 10
+
+# Characters that make a value a shell-style pattern, matched client-side
+GLOB_CHARS = frozenset("*?[")
+
+# "us-east-1a" is an availability zone of "us-east-1"
+AVAILABILITY_ZONE = re.compile(r"^([a-z]{2}(?:-[a-z]+)+-\d+)[a-z]$")
+
+EVENT_STATUSES = ("open", "closed")
+
+# Labels of the client-side predicates, as reported in the filter summary
+SERVICE = "service"
+REGION = "region"
+EVENT_TYPE = "event type"
+STATUS = "status"
+
+Predicate = Tuple[str, Callable[[HealthEvent], bool]]
+
+
+def _is_pattern(values: Sequence[str]) -> bool:
+    return any(GLOB_CHARS.intersection(value) for value in values)
+
+
+def _pushable(values: Sequence[str]) -> bool:
+    return 0 < len(values) <= MAX_FILTER_VALUES and not _is_pattern(values)
+
+
+def _matcher(values: Sequence[str], attribute: str) -> Callable[[HealthEvent], bool]:
+    """Case-insensitive exact or shell-style match on one HealthEvent attribute"""
+    patterns = [value.upper() for value in values]
+
+    def matches(event: HealthEvent) -> bool:
+        value = (getattr(event, attribute) or "").upper()
+        return any(fnmatchcase(value, pattern) for pattern in patterns)
+
+    return matches
+
+
+class FilterPlan:
+    """
+    Filter fields sent with every describe_events call, plus the predicates
+    the API cannot express. `apply` runs the predicates page by page and
+    counts what it drops.
+    """
+
+    def __init__(self, api_fields: Dict[str, List[str]], predicates: Sequence[Predicate] = ()):
+        self.api_fields = api_fields
+        self.predicates = tuple(predicates)
+        self.received = 0
+        self.dropped: Counter = Counter()
+
+    def __bool__(self) -> bool:
+        return bool(self.api_fields or self.predicates)
+
+    @property
+    def kept(self) -> int:
+        return self.received - sum(self.dropped.values())
+
+    @property
+    def cache_scope(self) -> str:
+        """
+        Cache scope holding exactly the events this filter syncs, so a
+        filtered sync never leaves gaps in the unfiltered one
+        """
+        if not self.api_fields:
+            return DEFAULT_SCOPE
+        fields = ";".join(
+            f"{name}={','.join(sorted(values))}" for name, values in sorted(self.api_fields.items())
+        )
+        return f"{DEFAULT_SCOPE}?{fields}"
+
+    def accepts(self, event: HealthEvent) -> bool:
+        """Check one event without counting it"""
+        return all(accepts(event) for _, accepts in self.predicates)
+
+    def apply(self, events: Iterable[HealthEvent]) -> List[HealthEvent]:
+        """Keep the events every predicate accepts, counting the rest by predicate"""
+        kept = []
+        for event in events:
+            self.received += 1
+            for label, accepts in self.predicates:
+                if not accepts(event):
+                    self.dropped[label] += 1
+                    break
+            else:
+                kept.append(event)
+        return kept
+
+
+class EventFilter:
+    """What the user asked for with --service/--region/--event-type/--status"""
+
+    def __init__(
+        self,
+        services: Optional[Sequence[str]] = None,
+        regions: Optional[Sequence[str]] = None,
+        event_types: Optional[Sequence[str]] = None,
+        statuses: Optional[Sequence[str]] = None,
+    ):
+        self.services = [value.upper() for value in services or ()]
+        self.event_types = [value.upper() for value in event_types or ()]
+        self.statuses = sorted(set(statuses or ()))
+        self.regions: List[str] = []
+        self.zones: List[str] = []
+        for value in regions or ():
+            value = value.lower()
+            (self.zones if AVAILABILITY_ZONE.match(value) else self.regions).append(value)
+
+    def plan(self, organization: bool = False) -> FilterPlan:
+        """
+        Split the filter into API fields and client-side predicates. Lists
+        with patterns or more than MAX_FILTER_VALUES entries stay client-side;
+        so do availability zones the API cannot combine with regions.
+        """
+        fields: Dict[str, List[str]] = {}
+        predicates: List[Predicate] = []
+
+        for values, field, label, attribute in (
+            (self.services, "services", SERVICE, "service"),
+            (self.event_types, "eventTypeCodes", EVENT_TYPE, "event_type_code"),
+        ):
+            if _pushable(values):
+                fields[field] = list(dict.fromkeys(values))
+            elif values:
+                predicates.append((label, _matcher(values, attribute)))
+
+        if self.zones and not self.regions and not organization and _pushable(self.zones):
+            fields["availabilityZones"] = list(dict.fromkeys(self.zones))
+        elif self.regions or self.zones:
+            # The API ANDs regions with zones (and organization filters have
+            # no zones), so zones push their region and are checked here
+            regions = list(
+                dict.fromkeys(
+                    self.regions + [AVAILABILITY_ZONE.match(z).group(1) for z in self.zones]
+                )
+            )
+            if _pushable(regions):
+                fields["regions"] = regions
+            if self.zones or not _pushable(regions):
+                predicates.append((REGION, self._region_predicate()))
+
+        if self.statuses and set(self.statuses) != set(EVENT_STATUSES):
+            fields["eventStatusCodes"] = list(self.statuses)
+            # Cached events may have changed status since they were stored
+            statuses = set(self.statuses)
+            predicates.append((STATUS, lambda event: event.status in statuses))
+
+        return FilterPlan(fields, predicates)
+
+    def _region_predicate(self) -> Callable[[HealthEvent], bool]:
+        in_region = _matcher(self.regions, "region")
+        zones = set(self.zones)
+
+        def accepts(event: HealthEvent) -> bool:
+            return in_region(event) or (event.availability_zone or "").lower() in zones
+
+        return accepts
+
+
+def describe_plan(plan: FilterPlan) -> str:
+    """One-line summary of where each filter ran and what it removed"""
+    pushed = ", ".join(plan.api_fields) or "nothing"
+    text = f"Filters: {pushed} sent to the Health API; {plan.received:,} events received"
+    if plan.dropped:
+        reasons = ", ".join(f"{count:,} by {label}" for label, count in plan.dropped.most_common())
+        text += f", {sum(plan.dropped.values()):,} dropped client-side ({reasons})"
+    return text + f", {plan.kept:,} kept"
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Synthetic Health API
+An in-memory stand-in for the boto3 Health client with configurable latency,
+page size, throttling and failures, plus the event factories shared by the
+tests and the benchmarks
+"""
+
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional
+
+from botocore.exceptions import ClientError
+
+if TYPE_CHECKING:
+    from health_event import HealthEvent
+    from rate_limiter import AdaptiveRateLimiter
+
+SERVICES = ("EC2", "RDS", "ELASTICLOADBALANCING", "S3", "DYNAMODB", "LAMBDA", "CLOUDFRONT")
+REGIONS = ("us-east-1", "us-east-2", "us-west-2", "eu-west-1", "sa-east-1", "ap-southeast-1")
+ISSUE_TYPES = ("OPERATIONAL_ISSUE", "API_ISSUE", "CONNECTIVITY_ISSUE", "INSTANCE_ISSUE")
+
+# Start of event 0 from make_api_event; event n starts n minutes later
+EVENT_EPOCH = datetime(2024, 1, 1)
+
+# describe_events / describe_affected_entities page limit of the real API
+MAX_PAGE_SIZE = 100
+
+# describe_events filter lists and the event field each one matches
+LIST_FILTERS = {
+    "services": "service",
+    "regions": "region",
+    "eventTypeCodes": "eventTypeCode",
+    "eventStatusCodes": "statusCode",
+    "availabilityZones": "availabilityZone",
+}
+
+
+class BackendConfig(NamedTuple):
+    """How the fake backend behaves"""
+
+    # Seconds added to every call
+    latency: float = 0.0
+    # Largest page returned, whatever maxResults asks for
+    page_size: int = MAX_PAGE_SIZE
+    # Share of attempts answered with ThrottlingException
+    throttle_rate: float = 0.0
+    # Seconds before a throttled attempt is retried (the SDK's backoff)
+    throttle_delay: float = 0.05
+    # Attempts per call, as in the clients' retry config; a call throttled
+    # on every attempt raises ClientError(ThrottlingException)
+    max_attempts: int = 5
+    # Share of describe_event_details ARNs reported in failedSet
+    failure_rate: float = 0.0
+    entities_per_event: int = 2
+    seed: int = 7
+
+
+def make_health_events(
+    count: int, seed: int = 7, open_ratio: float = 0.1, now: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """API-shaped issue events spread over the last 90 days"""
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    window = 90 * 24 * 3600
+    events = []
+    for n in range(count):
+        service = rng.choice(SERVICES)
+        event_type = f"AWS_{service}_{rng.choice(ISSUE_TYPES)}"
+        region = rng.choice(REGIONS)
+        start = now - timedelta(seconds=rng.randrange(window))
+        is_open = rng.random() < open_ratio
+        event = {
+            "arn": f"arn:aws:health:{region}::event/{service}/{event_type}/{event_type}_{n}",
+            "service": service,
+            "eventTypeCode": event_type,
+            "eventTypeCategory": "issue",
+            "region": region,
+            "startTime": start,
+            "lastUpdatedTime": start + timedelta(minutes=rng.randrange(30, 600)),
+            "statusCode": "open" if is_open else "closed",
+        }
+        if not is_open:
+            event["endTime"] = start + timedelta(minutes=rng.randrange(5, 24 * 60))
+        events.append(event)
+    return events
+
+
+def make_api_event(
+    n: int,
+    service: str = "EC2",
+    region: str = "us-east-1",
+    status: str = "closed",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    event_type: Optional[str] = None,
+    **fields: Any,
+) -> Dict[str, Any]:
+    """
+    One API-shaped issue event with a unique ARN per `n`, for tests. It
+    starts n minutes after EVENT_EPOCH unless `start` is given; `fields` add
+    or override raw keys such as awsAccountId or lastUpdatedTime.
+    """
+    event_type = event_type or f"AWS_{service}_OPERATIONAL_ISSUE"
+    start = EVENT_EPOCH + timedelta(minutes=n) if start is None else start
+    event = {
+        "arn": f"arn:aws:health:{region}::event/{service}/{event_type}/{event_type}_{n}",
+        "service": service,
+        "eventTypeCode": event_type,
+        "eventTypeCategory": "issue",
+        "region": region,
+        "startTime": start,
+        "lastUpdatedTime": start,
+        "statusCode": status,
+    }
+    if end is not None:
+        event["endTime"] = end
+    event.update(fields)
+    return event
+
+
+def make_api_events(count: int, first: int = 0, **kwargs: Any) -> List[Dict[str, Any]]:
+    """make_api_event for n in first .. first + count - 1"""
+    return [make_api_event(n, **kwargs) for n in range(first, first + count)]
+
+
+def make_event(
+    n: int,
+    service: str = "EC2",
+    region: str = "us-east-1",
+    status: str = "closed",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    event_type: Optional[str] = None,
+    **attributes: Any,
+) -> "HealthEvent":
+    """make_api_event as a HealthEvent; `attributes` override HealthEvent fields"""
+    from health_event import HealthEvent
+
+    event = HealthEvent.from_api(
+        make_api_event(n, service, region, status, start, end, event_type)
+    )
+    for name, value in attributes.items():
+        setattr(event, name, value)
+    return event
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class FakeHealthClient:
+    """
+    Thread-safe Health client over a fixed event list. Every response is a
+    fresh copy, like a real client, so callers may mutate what they receive.
+    The describe_events filter is honoured for eventArns, startTimes,
+    lastUpdatedTimes and the LIST_FILTERS fields; naive filter datetimes are
+    taken as UTC. With a `rate_limiter`, every attempt is paced by it and
+    reports its outcome to it, as the hooks on a real client do.
+    """
+
+    def __init__(
+        self,
+        events: List[Dict[str, Any]],
+        config: BackendConfig = BackendConfig(),
+        rate_limiter: Optional["AdaptiveRateLimiter"] = None,
+    ):
+        self.events = events
+        self.config = config
+        self.rate_limiter = rate_limiter
+        self._by_arn = {event["arn"]: event for event in events}
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self.calls: Counter = Counter()
+        self.throttles = 0
+        self.failures = 0
+
+    @property
+    def api_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def _call(self, operation: str) -> None:
+        """One API call: throttled attempts are retried like the SDK does"""
+        with self._lock:
+            self.calls[operation] += 1
+        for attempt in range(self.config.max_attempts):
+            if attempt:
+                time.sleep(self.config.throttle_delay)
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            with self._lock:
+                throttled = self._rng.random() < self.config.throttle_rate
+                if throttled:
+                    self.throttles += 1
+            if self.config.latency:
+                time.sleep(self.config.latency)
+            if not throttled:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.on_success()
+                return
+            if self.rate_limiter is not None:
+                self.rate_limiter.on_throttle()
+        raise ClientError(
+            {
+                "Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"},
+                "ResponseMetadata": {"HTTPStatusCode": 400},
+            },
+            operation,
+        )
+
+    def _page(self, items: List[Any], max_results: int, next_token: Optional[str]) -> Dict[str, Any]:
+        offset = int(next_token or 0)
+        end = offset + min(max_results, self.config.page_size)
+        response: Dict[str, Any] = {"items": items[offset:end]}
+        if end < len(items):
+            response["nextToken"] = str(end)
+        return response
+
+    def describe_events(
+        self,
+        filter: Optional[Dict[str, Any]] = None,
+        maxResults: int = MAX_PAGE_SIZE,
+        nextToken: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        self._call("DescribeEvents")
+        event_filter = filter or {}
+        events = self.events
+        if "eventArns" in event_filter:
+            events = [self._by_arn[arn] for arn in event_filter["eventArns"] if arn in self._by_arn]
+        for started in event_filter.get("startTimes", []):
+            low, high = _utc(started.get("from")), _utc(started.get("to"))
+            events = [
+                event
+                for event in events
+                if (low is None or event["startTime"] >= low)
+                and (high is None or event["startTime"] <= high)
+            ]
+        for updated in event_filter.get("lastUpdatedTimes", []):
+            since = _utc(updated["from"])
+            events = [event for event in events if event["lastUpdatedTime"] >= since]
+        for name, key in LIST_FILTERS.items():
+            if name in event_filter:
+                allowed = set(event_filter[name])
+                events = [event for event in events if event.get(key) in allowed]
+        response = self._page(events, maxResults, nextToken)
+        response["events"] = [dict(event) for event in response.pop("items")]
+        return response
+
+    def describe_event_details(self, eventArns: List[str]) -> Dict[str, Any]:
+        self._call("DescribeEventDetails")
+        successful, failed = [], []
+        for arn in eventArns:
+            with self._lock:
+                fail = self._rng.random() < self.config.failure_rate
+                if fail:
+                    self.failures += 1
+            if fail:
+                failed.append(
+                    {"eventArn": arn, "errorName": "InternalFailure", "errorMessage": "injected"}
+                )
+            else:
+                successful.append(
+                    {
+                        "event": {"arn": arn},
+                        "eventDescription": {"latestDescription": f"Synthetic description {arn}"},
+                    }
+                )
+        return {"successfulSet": successful, "failedSet": failed}
+
+    def describe_affected_entities(
+        self,
+        filter: Dict[str, Any],
+        maxResults: int = MAX_PAGE_SIZE,
+        nextToken: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        self._call("DescribeAffectedEntities")
+        entities = [
+            {"eventArn": arn, "entityValue": f"resource-{index}-{arn.rsplit('_', 1)[-1]}"}
+            for arn in filter["eventArns"]
+            for index in range(self.config.entities_per_event)
+        ]
+        response = self._page(entities, maxResults, nextToken)
+        response["entities"] = response.pop("items")
+        return response
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Health Endpoint Selection
+Hedges the first Health request across the primary and failover regions and
+sticks with whichever endpoint answers first
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional, Sequence
+
+# The Health global endpoint is served from us-east-1 and fails over to us-east-2
+HEALTH_REGIONS = ("us-east-1", "us-east-2")
+
+# Seconds to wait on one endpoint before also trying the next
+DEFAULT_HEDGE_DELAY = 1.0
+
+# Error codes meaning the endpoint itself is unhealthy, not the request
+ENDPOINT_ERROR_CODES = frozenset(
+    {"InternalFailure", "InternalServerError", "ServiceUnavailable", "ServiceUnavailableException"}
+)
+
+
+def is_endpoint_failure(error: Exception) -> bool:
+    """
+    True when an error says nothing about the request itself: connection
+    failures, timeouts and 5xx responses. Any other API error (AccessDenied,
+    SubscriptionRequiredException, ...) proves the endpoint is answering.
+    """
+    from botocore.exceptions import BotoCoreError, ClientError
+
+    if isinstance(error, ClientError):
+        status = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode") or 0
+        return status >= 500 or error.response["Error"]["Code"] in ENDPOINT_ERROR_CODES
+    return isinstance(error, BotoCoreError)
+
+
+class HealthEndpointSelector:
+    """
+    Picks the Health region for the run. The first select() sends a one-event
+    DescribeEvents to the primary region, adds the next region if no answer
+    arrives within `hedge_delay` (or immediately when the primary fails), and
+    keeps the first region that answers. Later calls return it without probing.
+    """
+
+    def __init__(
+        self,
+        regions: Sequence[str] = HEALTH_REGIONS,
+        hedge_delay: float = DEFAULT_HEDGE_DELAY,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.regions = tuple(regions)
+        self.hedge_delay = hedge_delay
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.region: Optional[str] = None
+        # Probe latency (seconds) of each region that answered, and the
+        # errors of those that failed
+        self.latencies: Dict[str, float] = {}
+        self.errors: Dict[str, Exception] = {}
+
+    @property
+    def failed_over(self) -> bool:
+        return self.region is not None and self.region != self.regions[0]
+
+    def select(self, client_for: Callable[[str], Any]) -> str:
+        """Return the chosen region, probing with `client_for(region)` on first use"""
+        with self._lock:
+            if self.region is None:
+                self.region = self._probe(client_for)
+            return self.region
+
+    def _attempt(self, client_for: Callable[[str], Any], region: str) -> float:
+        started = self._clock()
+        try:
+            client_for(region).describe_events(maxResults=1)
+        except Exception as e:
+            if is_endpoint_failure(e):
+                raise
+        return self._clock() - started
+
+    def _probe(self, client_for: Callable[[str], Any]) -> str:
+        if len(self.regions) == 1:
+            return self.regions[0]
+
+        remaining = list(self.regions)
+        pending: Dict[Future, str] = {}
+        executor = ThreadPoolExecutor(
+            max_workers=len(self.regions), thread_name_prefix="health-endpoint"
+        )
+
+        def launch() -> None:
+            region = remaining.pop(0)
+            pending[executor.submit(self._attempt, client_for, region)] = region
+
+        try:
+            launch()
+            while pending:
+                done, _ = wait(
+                    list(pending),
+                    timeout=self.hedge_delay if remaining else None,
+                    return_when=FIRST_COMPLETED,
+                )
+                if not done:
+                    # Slow answer: hedge with the next region
+                    launch()
+                    continue
+                for future in done:
+                    region = pending.pop(future)
+                    try:
+                        self.latencies[region] = future.result()
+                        return region
+                    except Exception as e:
+                        self.errors[region] = e
+                if remaining and not pending:
+                    launch()
+            # Every endpoint failed; report the primary's error
+            raise self.errors.get(self.regions[0]) or next(iter(self.errors.values()))
+        finally:
+            # A slower request still in flight is left to finish on its own
+            executor.shutdown(wait=False)
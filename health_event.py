@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Health Event Model
+Compact, normalized record built once from the raw AWS Health API shape
+"""
+
+import sys
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from affected_entities import ENTITIES_KEY
+from event_cache import event_status
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    # Service, region, type and status repeat across thousands of rows
+    return sys.intern(value) if value else None
+
+
+def parse_datetime(value: Any) -> Optional[datetime]:
+    """Accept the datetimes boto3 returns as well as ISO-8601 strings"""
+    if value is None or isinstance(value, datetime):
+        return value
+    text = str(value)
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    return datetime.fromisoformat(text)
+
+
+class HealthEvent:
+    """One Health event (or one account's view of an organization event)"""
+
+    __slots__ = (
+        "arn",
+        "service",
+        "event_type_code",
+        "event_type_category",
+        "region",
+        "availability_zone",
+        "status",
+        "start_time",
+        "end_time",
+        "last_updated",
+        "description",
+        "account_id",
+        "entities",
+    )
+
+    def __init__(
+        self,
+        arn: str,
+        service: Optional[str] = None,
+        event_type_code: Optional[str] = None,
+        event_type_category: Optional[str] = None,
+        region: Optional[str] = None,
+        availability_zone: Optional[str] = None,
+        status: str = "closed",
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        last_updated: Optional[datetime] = None,
+        description: str = "",
+        account_id: Optional[str] = None,
+        entities: Optional[Tuple[str, ...]] = None,
+    ):
+        self.arn = arn
+        self.service = _intern(service)
+        self.event_type_code = _intern(event_type_code)
+        self.event_type_category = _intern(event_type_category)
+        self.region = _intern(region)
+        self.availability_zone = _intern(availability_zone)
+        self.status = sys.intern(status)
+        self.start_time = start_time
+        self.end_time = end_time
+        self.last_updated = last_updated
+        self.description = description
+        self.account_id = account_id
+        # None means entities were not looked up; () means none were affected
+        self.entities = entities
+
+    @classmethod
+    def from_api(cls, raw: Dict[str, Any]) -> "HealthEvent":
+        """Build from a describe_events(-for_organization) or cached event dict"""
+        entities = raw.get(ENTITIES_KEY)
+        return cls(
+            arn=raw["arn"],
+            service=raw.get("service"),
+            event_type_code=raw.get("eventTypeCode"),
+            event_type_category=raw.get("eventTypeCategory"),
+            region=raw.get("region"),
+            availability_zone=raw.get("availabilityZone"),
+            status=event_status(raw),
+            start_time=parse_datetime(raw.get("startTime")),
+            end_time=parse_datetime(raw.get("endTime")),
+            last_updated=parse_datetime(raw.get("lastUpdatedTime")),
+            description=raw.get("description") or "",
+            account_id=raw.get("awsAccountId"),
+            entities=None if entities is None else tuple(entities),
+        )
+
+    @property
+    def is_open(self) -> bool:
+        return self.status == "open"
+
+    @property
+    def entity_count(self) -> Optional[int]:
+        """Number of affected entities, or None if they were not resolved"""
+        return None if self.entities is None else len(self.entities)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Field name to value, e.g. for serialization"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, HealthEvent):
+            return NotImplemented
+        return all(getattr(self, n) == getattr(other, n) for n in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"HealthEvent(arn={self.arn!r}, status={self.status!r})"
+
+
+def to_health_events(raws: Iterable[Dict[str, Any]]) -> List[HealthEvent]:
+    """Convert raw API events, e.g. one page at a time as it is fetched"""
+    return [HealthEvent.from_api(raw) for raw in raws]
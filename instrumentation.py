@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+Pipeline Instrumentation
+Per-stage wall time, API call/retry/byte counters and spans, exportable as
+JSON or OpenTelemetry (OTLP/JSON) trace files
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+if TYPE_CHECKING:
+    import cProfile
+
+TRACE_FORMATS = ("json", "otlp")
+
+# Spans kept per run; later ones are counted as dropped so a 100k-event run
+# cannot grow the trace without bound
+MAX_SPANS = 10000
+
+# Label for API calls made outside any stage
+NO_STAGE = "other"
+
+# Upper bounds (seconds) of the API latency histogram buckets
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Request-context key holding the start of an API call
+_STARTED_KEY = "aws_sla_hunter_started"
+
+# OTLP span kinds
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+
+
+class Span:
+    """A timed operation; times are Unix epoch nanoseconds"""
+
+    __slots__ = ("name", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "kind")
+
+    def __init__(
+        self,
+        name: str,
+        parent_id: Optional[str],
+        start_ns: int,
+        attributes: Dict[str, Any],
+        kind: int = SPAN_KIND_INTERNAL,
+    ):
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.start_ns = start_ns
+        self.end_ns = start_ns
+        self.attributes = attributes
+        self.kind = kind
+
+    @property
+    def duration(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+
+class OperationStats:
+    """Counters for one API operation within one stage"""
+
+    __slots__ = ("calls", "attempts", "errors", "bytes_received")
+
+    def __init__(self):
+        self.calls = 0
+        self.attempts = 0
+        self.errors = 0
+        self.bytes_received = 0
+
+    @property
+    def retries(self) -> int:
+        return max(0, self.attempts - self.calls)
+
+
+class Histogram:
+    """Fixed-bucket histogram; counts are per bucket, not cumulative"""
+
+    __slots__ = ("buckets", "counts", "count", "total")
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def copy(self) -> "Histogram":
+        other = Histogram(self.buckets)
+        other.counts = list(self.counts)
+        other.count = self.count
+        other.total = self.total
+        return other
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """(upper bound, observations at or below it), ending with +Inf"""
+        running = 0
+        result = []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            running += count
+            result.append((bound, running))
+        return result
+
+
+class StageSummary(NamedTuple):
+    """One row of the --timings breakdown"""
+
+    name: str
+    seconds: float
+    calls: int
+    retries: int
+    errors: int
+    bytes_received: int
+
+
+class Tracer:
+    """
+    Collects spans and API counters for one run. Stages are the top-level
+    steps of main and run one at a time; spans opened on worker threads with
+    no span of their own are parented to the current stage, and API calls are
+    counted against it.
+    """
+
+    def __init__(self, max_spans: int = MAX_SPANS):
+        self.max_spans = max_spans
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.trace_id = os.urandom(16).hex()
+            self.spans: List[Span] = []
+            self.stages: List[Span] = []
+            self.dropped = 0
+            self.operations: Dict[Tuple[str, str], OperationStats] = {}
+            # API call latency per operation, across stages and retries
+            self.latencies: Dict[str, Histogram] = {}
+            self._stage: Optional[Span] = None
+            # Epoch time anchored once; durations come from the monotonic clock
+            self._epoch_ns = time.time_ns()
+            self._perf_ns = time.perf_counter_ns()
+
+    def _now_ns(self) -> int:
+        return self._epoch_ns + time.perf_counter_ns() - self._perf_ns
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def stage(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Time a top-level pipeline step"""
+        span = Span(name, None, self._now_ns(), attributes)
+        with self._lock:
+            previous, self._stage = self._stage, span
+            self.stages.append(span)
+            self.spans.append(span)
+        try:
+            yield span
+        finally:
+            span.end_ns = self._now_ns()
+            with self._lock:
+                self._stage = previous
+
+    @contextmanager
+    def span(
+        self, name: str, kind: int = SPAN_KIND_INTERNAL, **attributes: Any
+    ) -> Iterator[Span]:
+        """Time a step inside the current stage (pages, batches, ...)"""
+        stack = self._stack()
+        if stack:
+            parent: Optional[Span] = stack[-1]
+        else:
+            parent = self._stage
+        span = Span(name, parent.span_id if parent else None, self._now_ns(), attributes, kind)
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            stack.pop()
+            span.end_ns = self._now_ns()
+            with self._lock:
+                if len(self.spans) < self.max_spans:
+                    self.spans.append(span)
+                else:
+                    self.dropped += 1
+
+    def _operation(self, event_name: str) -> OperationStats:
+        # Event names look like "before-call.health.DescribeEvents"
+        _, service, operation = event_name.split(".", 2)
+        stage = self._stage.name if self._stage is not None else NO_STAGE
+        key = (stage, f"{service}:{operation}")
+        stats = self.operations.get(key)
+        if stats is None:
+            stats = self.operations[key] = OperationStats()
+        return stats
+
+    def attach(self, client: Any) -> Any:
+        """Count calls, attempts and response bytes of a boto3/botocore client"""
+        service_id = client.meta.service_model.service_id.hyphenize()
+        client.meta.events.register(f"before-call.{service_id}", self._before_call)
+        client.meta.events.register(f"needs-retry.{service_id}", self._after_attempt)
+        client.meta.events.register(f"after-call.{service_id}", self._after_call)
+        client.meta.events.register(f"after-call-error.{service_id}", self._after_call)
+        return client
+
+    def _before_call(
+        self, event_name: str = "", context: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> None:
+        if context is not None:
+            context[_STARTED_KEY] = time.perf_counter()
+        with self._lock:
+            self._operation(event_name).calls += 1
+
+    def _after_call(
+        self, event_name: str = "", context: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> None:
+        started = (context or {}).get(_STARTED_KEY)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        # "after-call.health.DescribeEvents" and "after-call-error.health...."
+        _, service, operation = event_name.split(".", 2)
+        name = f"{service}:{operation}"
+        with self._lock:
+            histogram = self.latencies.get(name)
+            if histogram is None:
+                histogram = self.latencies[name] = Histogram()
+            histogram.observe(elapsed)
+
+    def _after_attempt(
+        self,
+        event_name: str = "",
+        response: Optional[tuple] = None,
+        caught_exception: Any = None,
+        **kwargs: Any,
+    ) -> None:
+        # Observe only: returning None leaves the retry decision to botocore
+        received = 0
+        failed = caught_exception is not None
+        if response is not None:
+            http_response = response[0]
+            # The header, not .content, so streaming bodies are never read here
+            received = int(http_response.headers.get("content-length") or 0)
+            failed = http_response.status_code >= 400
+        with self._lock:
+            stats = self._operation(event_name)
+            stats.attempts += 1
+            stats.bytes_received += received
+            if failed:
+                stats.errors += 1
+
+    def stage_summary(self) -> List[StageSummary]:
+        """Wall time and API counters per stage, in run order"""
+        with self._lock:
+            stages = list(self.stages)
+            operations = list(self.operations.items())
+        rows = []
+        names = [stage.name for stage in stages]
+        if any(stage == NO_STAGE for (stage, _), _ in operations) and NO_STAGE not in names:
+            names.append(NO_STAGE)
+        durations: Dict[str, float] = {}
+        for stage in stages:
+            durations[stage.name] = durations.get(stage.name, 0.0) + stage.duration
+        for name in dict.fromkeys(names):
+            counters = [stats for (stage, _), stats in operations if stage == name]
+            rows.append(
+                StageSummary(
+                    name,
+                    durations.get(name, 0.0),
+                    sum(s.calls for s in counters),
+                    sum(s.retries for s in counters),
+                    sum(s.errors for s in counters),
+                    sum(s.bytes_received for s in counters),
+                )
+            )
+        return rows
+
+    def operation_totals(self) -> Dict[str, OperationStats]:
+        """API counters per operation, summed across stages"""
+        totals: Dict[str, OperationStats] = {}
+        with self._lock:
+            for (_, operation), stats in self.operations.items():
+                total = totals.get(operation)
+                if total is None:
+                    total = totals[operation] = OperationStats()
+                total.calls += stats.calls
+                total.attempts += stats.attempts
+                total.errors += stats.errors
+                total.bytes_received += stats.bytes_received
+        return totals
+
+    def latency_histograms(self) -> Dict[str, Histogram]:
+        """A consistent copy of the per-operation latency histograms"""
+        with self._lock:
+            return {name: histogram.copy() for name, histogram in self.latencies.items()}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain JSON report: stages, per-operation counters and spans"""
+        with self._lock:
+            spans = list(self.spans)
+            operations = sorted(self.operations.items())
+            dropped = self.dropped
+        return {
+            "trace_id": self.trace_id,
+            "stages": [row._asdict() for row in self.stage_summary()],
+            "operations": [
+                {
+                    "stage": stage,
+                    "operation": operation,
+                    "calls": stats.calls,
+                    "retries": stats.retries,
+                    "errors": stats.errors,
+                    "bytes_received": stats.bytes_received,
+                }
+                for (stage, operation), stats in operations
+            ],
+            "spans": [
+                {
+                    "name": span.name,
+                    "span_id": span.span_id,
+                    "parent_id": span.parent_id,
+                    "start_ns": span.start_ns,
+                    "duration_s": span.duration,
+                    "attributes": span.attributes,
+                }
+                for span in spans
+            ],
+            "dropped_spans": dropped,
+        }
+
+    def to_otlp(self, service_name: str = "aws-sla-hunter") -> Dict[str, Any]:
+        """OTLP/JSON export request, loadable by OpenTelemetry collectors"""
+        with self._lock:
+            spans = list(self.spans)
+            operations = dict(self.operations)
+        otlp_spans = []
+        for span in spans:
+            attributes = dict(span.attributes)
+            if span.parent_id is None:
+                # Stage spans carry their API counters
+                counters = [s for (stage, _), s in operations.items() if stage == span.name]
+                attributes["aws.api.calls"] = sum(s.calls for s in counters)
+                attributes["aws.api.retries"] = sum(s.retries for s in counters)
+                attributes["aws.api.bytes_received"] = sum(s.bytes_received for s in counters)
+            item = {
+                "traceId": self.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": span.kind,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": [otlp_attribute(k, v) for k, v in attributes.items()],
+            }
+            if span.parent_id:
+                item["parentSpanId"] = span.parent_id
+            otlp_spans.append(item)
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": [otlp_attribute("service.name", service_name)]},
+                    "scopeSpans": [{"scope": {"name": "aws-sla-hunter"}, "spans": otlp_spans}],
+                }
+            ]
+        }
+
+    def write(self, path: str, trace_format: str = "json") -> None:
+        """Write the trace as plain JSON or OTLP/JSON"""
+        data = self.to_otlp() if trace_format == "otlp" else self.to_dict()
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, indent=2, default=str)
+            fh.write("\n")
+
+
+class RunProfiler:
+    """
+    cProfile over the calling thread and every thread started while it runs
+    (page prefetch, shards, enrichment pools), merged into one stats file.
+    Before Python 3.12 a profiler only sees the thread that enabled it, so
+    each new thread gets its own; from 3.12 one profiler sees every thread.
+    """
+
+    def __init__(self):
+        import cProfile
+
+        self._new_profiler = cProfile.Profile
+        self.profilers: List["cProfile.Profile"] = [cProfile.Profile()]
+        self._per_thread = sys.version_info < (3, 12)
+        self._lock = threading.Lock()
+        self._running = False
+
+    def _thread_started(self, frame: Any, event: str, arg: Any) -> None:
+        # First profile event of a new thread: hand over to a profiler of its own
+        sys.setprofile(None)
+        with self._lock:
+            if not self._running:
+                return
+            profiler = self._new_profiler()
+            self.profilers.append(profiler)
+        profiler.enable()
+
+    def start(self) -> None:
+        self._running = True
+        if self._per_thread:
+            threading.setprofile(self._thread_started)
+        self.profilers[0].enable()
+
+    def stop(self, path: str) -> None:
+        """Stop profiling and write the merged stats to `path`"""
+        import pstats
+
+        self.profilers[0].disable()
+        with self._lock:
+            self._running = False
+        if self._per_thread:
+            threading.setprofile(None)
+        stats = pstats.Stats(self.profilers[0])
+        for profiler in self.profilers[1:]:
+            stats.add(profiler)
+        stats.dump_stats(path)
+
+
+def otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    """Encode one attribute as an OTLP AnyValue"""
+    if isinstance(value, bool):
+        encoded: Dict[str, Any] = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+# The process-wide tracer; clients from clients.ClientFactory report to it
+tracer = Tracer()
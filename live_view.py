@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Incremental Results View
+Running counters and a row-capped table that update as pages of events arrive
+"""
+
+import heapq
+import time
+from collections import Counter
+from typing import Any, Callable, Iterable, List, Set, Tuple
+
+from event_cache import to_timestamp
+from health_event import HealthEvent
+from normalization import normalize_service
+
+# Rows shown in the events table before the rest are summarized
+DEFAULT_MAX_ROWS = 100
+
+
+def _sort_key(event: HealthEvent) -> float:
+    # Events without a start sort oldest
+    start = event.start_time
+    return float("-inf") if start is None else to_timestamp(start)
+
+
+class EventSummary:
+    """Counters maintained in one pass as events are added"""
+
+    def __init__(self):
+        self.total = 0
+        self.open = 0
+        self.services: Counter = Counter()
+        self.accounts: Set[str] = set()
+
+    @property
+    def closed(self) -> int:
+        return self.total - self.open
+
+    def add(self, events: Iterable[HealthEvent]) -> None:
+        for event in events:
+            self.total += 1
+            if event.is_open:
+                self.open += 1
+            self.services[normalize_service(event.service)] += 1
+            if event.account_id:
+                self.accounts.add(event.account_id)
+
+    def markup(self) -> str:
+        """Rich markup for the summary panel"""
+        text = (
+            f"Found [bold yellow]{self.total:,}[/bold yellow] AWS Health events "
+            "with SLA potential\n"
+            f"[bold red]● {self.open:,} Open[/bold red] | [dim]⚪ {self.closed:,} Resolved[/dim]"
+        )
+        if self.accounts:
+            text += f" | {len(self.accounts):,} accounts"
+        if self.services:
+            top = ", ".join(f"{name} {count:,}" for name, count in self.services.most_common(3))
+            text += f"\n[dim]Top services: {top}[/dim]"
+        return text
+
+
+class NewestEvents:
+    """Keeps the `limit` most recent events seen so far (bounded min-heap)"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._heap: List[Tuple[float, int, HealthEvent]] = []
+        self._seq = 0
+
+    def add(self, events: Iterable[HealthEvent]) -> None:
+        for event in events:
+            self._seq += 1
+            item = (_sort_key(event), self._seq, event)
+            if len(self._heap) < self.limit:
+                heapq.heappush(self._heap, item)
+            elif item > self._heap[0]:
+                heapq.heapreplace(self._heap, item)
+
+    def rows(self) -> List[HealthEvent]:
+        """Newest first"""
+        return [event for _, _, event in sorted(self._heap, reverse=True)]
+
+
+def visible_rows(events: List[HealthEvent], max_rows: int) -> List[HealthEvent]:
+    """All events when they fit (in their given order), else the newest `max_rows`"""
+    if not max_rows or len(events) <= max_rows:
+        return events
+    newest = NewestEvents(max_rows)
+    newest.add(events)
+    return newest.rows()
+
+
+class LiveResultsView:
+    """
+    State behind the rich Live display: counters and capped rows are updated
+    per page, so each refresh costs O(max_rows) regardless of the total
+    """
+
+    def __init__(
+        self,
+        build_table: Callable[[List[HealthEvent], int], Any],
+        max_rows: int = DEFAULT_MAX_ROWS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.build_table = build_table
+        self.summary = EventSummary()
+        self.newest = NewestEvents(max_rows or DEFAULT_MAX_ROWS)
+        self.pages = 0
+        self._clock = clock
+        self._started = clock()
+
+    def add_page(self, events: List[HealthEvent]) -> None:
+        self.pages += 1
+        self.summary.add(events)
+        self.newest.add(events)
+
+    def progress_markup(self, done: bool = False) -> str:
+        elapsed = max(self._clock() - self._started, 1e-9)
+        state = "[green]✓ done[/green]" if done else "[cyan]fetching…[/cyan]"
+        return (
+            f"{state} {self.pages:,} pages | {self.summary.total:,} events | "
+            f"{self.summary.total / elapsed:,.0f} events/s"
+        )
+
+    def render(self, done: bool = False) -> Any:
+        from rich.console import Group
+        from rich.panel import Panel
+        from rich.text import Text
+
+        parts: List[Any] = []
+        if self.summary.total:
+            parts.append(self.build_table(self.newest.rows(), self.summary.total))
+        parts.append(Panel(self.summary.markup(), border_style="cyan", padding=(0, 2)))
+        parts.append(Text.from_markup(self.progress_markup(done)))
+        return Group(*parts)
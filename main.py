@@ -5,16 +5,75 @@ Detects AWS Health events with potential SLA credit eligibility
 """
 
 import sys
-import os
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
-import boto3
-from botocore.exceptions import ClientError, NoCredentialsError, PartialCredentialsError
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.text import Text
-from rich import box
+import argparse
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from datetime import datetime, timedelta, timezone
+from typing import (
+    TYPE_CHECKING,
+    List,
+    Dict,
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Set,
+    Tuple,
+)
+
+# boto3, botocore and rich are imported inside the functions that use them,
+# so paths like --help and --setup don't pay their import cost up front
+from terminal import console
+from enrichment import DEFAULT_MAX_WORKERS, DETAILS_BATCH_SIZE, chunked, enrich_events
+from clients import MAX_POOL_CONNECTIONS, get_client, get_client_factory
+from instrumentation import SPAN_KIND_CLIENT, TRACE_FORMATS, RunProfiler, tracer
+from affected_entities import ENTITIES_KEY, attach_affected_entities
+from event_cache import DEFAULT_SCOPE, EventCache
+from health_event import HealthEvent, to_health_events
+from normalization import normalize_event_type, normalize_service
+from sla_rules import SLA_RULES, MonthlyCredit, eligible_credits, evaluate_credits
+from cost_report import (
+    CreditEstimate,
+    EventKey,
+    SpendKey,
+    estimate_credits,
+    event_estimates,
+    load_monthly_spend,
+)
+from output_writers import OUTPUT_FORMATS, detach_stdout, open_writer
+from live_view import DEFAULT_MAX_ROWS, EventSummary, LiveResultsView, visible_rows
+from watch import CLOSED, MIN_WATCH_INTERVAL, NEW, REOPENED, EventChange, EventTracker, Watcher
+from metrics_exporter import (
+    DEFAULT_METRICS_HOST,
+    DEFAULT_METRICS_INTERVAL,
+    MetricsPublisher,
+    MetricsServer,
+    MetricsState,
+)
+from organization import iter_organization_events
+from correlation import Incident, correlate_events
+from event_filters import EVENT_STATUSES, EventFilter, FilterPlan, describe_plan
+from sharding import (
+    DEFAULT_SHARDS,
+    HEALTH_RETENTION,
+    MAX_SHARDS,
+    iter_sharded_pages,
+    parse_time_bound,
+    split_window,
+)
+from multi_account import (
+    DEFAULT_ACCOUNT_TIMEOUT,
+    DEFAULT_ACCOUNT_WORKERS,
+    DEFAULT_ROLE_NAME,
+    AccountResult,
+    AccountTarget,
+    iter_account_results,
+    load_account_targets,
+)
 
 # Import authentication handler
 try:
@@ -24,24 +83,49 @@ except ImportError:
     AWSAuthHandler = None
     AuthMethod = None
 
-# Fix for Windows encoding issues with emojis
-if sys.platform == "win32":
-    os.environ["PYTHONIOENCODING"] = "utf-8"
-    console = Console(force_terminal=True, legacy_windows=False)
-else:
-    console = Console()
+if TYPE_CHECKING:
+    from rich.console import Group
+    from rich.table import Table
+    from rich.text import Text
+
+
+# Caller identity resolved by get_credentials, shared for the rest of the run
+caller_identity: Optional[Dict[str, Any]] = None
+
+# Seconds spent in each startup step, shown with --timings
+startup_timings: Dict[str, float] = {}
+
+
+def caller_account() -> Optional[str]:
+    """Account ID of the signed-in caller, once get_credentials has resolved it"""
+    return (caller_identity or {}).get("Account")
+
+
+def record_timing(step: str, started: float) -> float:
+    """Record the time since `started` under `step` and return a new start"""
+    now = time.perf_counter()
+    startup_timings[step] = now - started
+    return now
 
 
 def get_credentials() -> bool:
     """Verify AWS credentials are available and display authentication info"""
+    from botocore.exceptions import ClientError, NoCredentialsError, PartialCredentialsError
+
+    global caller_identity
     try:
-        sts = boto3.client("sts", region_name="us-east-1")
+        started = time.perf_counter()
+        sts = get_client("sts")
+        started = record_timing("sts client", started)
         identity = sts.get_caller_identity()
+        started = record_timing("sts:GetCallerIdentity", started)
+        caller_identity = identity
 
         # Try to detect authentication method if handler available
         if AWSAuthHandler:
-            auth_handler = AWSAuthHandler()
-            _, method = auth_handler.detect_credentials()
+            auth_handler = AWSAuthHandler(identity=identity)
+            method = auth_handler.resolve_auth_method()
+            record_timing("credential method", started)
             if method:
                 console.print(f"[dim]({method})[/dim]", end=" ")
 
@@ -80,6 +164,8 @@ def get_credentials() -> bool:
 
 def display_free_tier_guidance() -> None:
     """Display guidance for free tier AWS customers"""
+    from rich.panel import Panel
+
     guidance_text = (
         "[bold cyan]📋 You're on a Free/Basic Support Plan[/bold cyan]\n\n"
         "[bold]Good news:[/bold] You have SLA credit rights!\n"
@@ -104,41 +190,338 @@ def display_free_tier_guidance() -> None:
     console.print(Panel(guidance_text, border_style="yellow", padding=(1, 2)))
 
 
-def fetch_health_events() -> List[Dict[str, Any]]:
-    """Fetch AWS Health events from last 90 days"""
-    try:
-        health = boto3.client("health", region_name="us-east-1")
-
-        # Calculate date range (last 90 days)
-        end_time = datetime.utcnow()
-        start_time = end_time - timedelta(days=90)
-
-        # Query AWS Health API
-        response = health.describe_events(
-            filter={
-                "startTimes": [{"from": start_time, "to": end_time}],
-                "eventTypeCategories": ["issue"],
-                "eventStatusCodes": ["open", "closed"],
-            },
-            maxResults=100,
-        )
+# describe_events accepts at most 100 results per page
+HEALTH_EVENTS_PAGE_SIZE = 100
+
+# Pages buffered ahead of the consumer by prefetch_pages
+PREFETCH_DEPTH = 2
+
+# Seconds a blocked prefetch producer waits before re-checking for cancellation
+PREFETCH_PUT_TIMEOUT = 0.1
+
+# Overlap applied to the cache watermark to absorb Health API propagation delay
+SYNC_WATERMARK_SKEW = timedelta(minutes=5)
+
+
+def build_event_filter(
+    start_time: datetime,
+    end_time: datetime,
+    updated_since: Optional[datetime] = None,
+    fields: Optional[Dict[str, List[str]]] = None,
+) -> Dict[str, Any]:
+    """
+    Build the describe_events filter for SLA-relevant issues in a time window,
+    narrowed by pushed-down `fields` (services, regions, ...) if given
+    """
+    event_filter: Dict[str, Any] = {
+        "startTimes": [{"from": start_time, "to": end_time}],
+        "eventTypeCategories": ["issue"],
+        "eventStatusCodes": ["open", "closed"],
+    }
+    if updated_since is not None:
+        event_filter["lastUpdatedTimes"] = [{"from": updated_since}]
+    if fields:
+        event_filter.update(fields)
+    return event_filter
 
-        events = response.get("events", [])
 
-        # Fetch detailed information for each event
+def iter_health_event_pages(
+    health: Any,
+    event_filter: Dict[str, Any],
+    page_size: int = HEALTH_EVENTS_PAGE_SIZE,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield pages of AWS Health events, following nextToken until exhausted.
+    Only one page is held at a time, so memory stays bounded for any window.
+    """
+    request: Dict[str, Any] = {"filter": event_filter, "maxResults": page_size}
+    page = 0
+    while True:
+        page += 1
+        with tracer.span("describe_events", SPAN_KIND_CLIENT, page=page) as span:
+            response = health.describe_events(**request)
+            events = response.get("events", [])
+            span.attributes["events"] = len(events)
         if events:
-            event_arns = [event["arn"] for event in events]
-            details_response = health.describe_event_details(eventArns=event_arns)
-            details_map = {
-                d["event"]["arn"]: d["eventDescription"]
-                for d in details_response.get("successfulSet", [])
-            }
-
-            # Enrich events with details
-            for event in events:
-                if event["arn"] in details_map:
-                    event["description"] = details_map[event["arn"]]
+            yield events
+
+        next_token = response.get("nextToken")
+        if not next_token:
+            return
+        request["nextToken"] = next_token
+
+
+def prefetch_pages(
+    pages: Iterable[List[Dict[str, Any]]], depth: int = PREFETCH_DEPTH
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Pull pages from a background thread so the next request is in flight
+    while the caller processes the current page. At most `depth` pages are
+    buffered; errors raised by the producer are re-raised to the caller.
+    """
+    buffer: "queue.Queue" = queue.Queue(maxsize=max(1, depth))
+    done = object()
+    stop = threading.Event()
+
+    def put(item: Any) -> None:
+        # Never block for good: the consumer may have stopped reading
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=PREFETCH_PUT_TIMEOUT)
+                return
+            except queue.Full:
+                continue
+
+    def produce() -> None:
+        try:
+            source = iter(pages)
+            # Checked before each pull, so a stopped consumer costs no extra request
+            while not stop.is_set():
+                page = next(source, done)
+                put(page)
+                if page is done:
+                    return
+        except BaseException as e:  # propagate to consumer thread
+            put(e)
+
+    producer = threading.Thread(target=produce, name="health-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+def iter_health_events(
+    health: Any,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    updated_since: Optional[datetime] = None,
+    resolve_entities: bool = False,
+    shards: int = 1,
+    fields: Optional[Dict[str, List[str]]] = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield enriched pages of AWS Health events (default: last 90 days).
+    With `resolve_entities`, each event also gets its affected entities.
+    With `shards`, the window is split into sub-ranges paginated in parallel.
+    `fields` are added to the describe_events filter.
+    """
+    end_time = end_time or datetime.utcnow()
+    start_time = start_time or end_time - HEALTH_RETENTION
+
+    # Incremental syncs and polls return a few events; one chain is cheaper
+    windows = split_window(start_time, end_time, 1 if updated_since else shards)
+
+    def enriched(pages: Iterable[List[Dict[str, Any]]]) -> Iterator[List[Dict[str, Any]]]:
+        for page in pages:
+            with tracer.span("enrich_page", events=len(page)):
+                enrich_events(health, page, executor=executor)
+                if resolve_entities:
+                    attach_affected_entities(health, page, executor=executor)
+            yield page
+
+    # Every shard is a full pipeline of its own, so the details pool grows with them
+    with ThreadPoolExecutor(
+        max_workers=min(DEFAULT_MAX_WORKERS * len(windows), MAX_POOL_CONNECTIONS),
+        thread_name_prefix="health-details",
+    ) as executor:
+        if len(windows) > 1:
+            yield from iter_sharded_pages(
+                [
+                    enriched(
+                        iter_health_event_pages(
+                            health, build_event_filter(start, end, fields=fields)
+                        )
+                    )
+                    for start, end in windows
+                ]
+            )
+        else:
+            event_filter = build_event_filter(start_time, end_time, updated_since, fields)
+            yield from enriched(prefetch_pages(iter_health_event_pages(health, event_filter)))
+
+
+def sync_health_events(
+    health: Any,
+    cache: EventCache,
+    start_time: datetime,
+    end_time: datetime,
+    scope: str = DEFAULT_SCOPE,
+    resolve_entities: bool = False,
+    on_page: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    shards: int = 1,
+    window: Optional[Tuple[datetime, datetime]] = None,
+    fields: Optional[Dict[str, List[str]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Bring the cache up to date and return `window` (default: the synced
+    range) from it. Cold runs fetch the whole range; warm runs only fetch
+    events updated since the last watermark and re-check cached events that
+    are still open. `on_page` receives each page fetched from the API as it
+    is stored. `fields` narrow the describe_events filter; give each set of
+    fields its own `scope`.
+    """
+    sync_started = datetime.utcnow()
+    watermark = cache.get_watermark(start_time, scope)
+    updated_since = watermark - SYNC_WATERMARK_SKEW if watermark else None
+
+    seen = set()
+    for page in iter_health_events(
+        health, start_time, end_time, updated_since, resolve_entities, shards, fields
+    ):
+        cache.upsert(page, scope)
+        seen.update(event["arn"] for event in page)
+        if on_page is not None:
+            on_page(page)
 
+    if watermark is not None:
+        stale_open = [arn for arn in cache.open_arns(scope) if arn not in seen]
+        cached = cache.get(stale_open, scope)
+        for batch in chunked(stale_open, DETAILS_BATCH_SIZE):
+            for page in iter_health_event_pages(health, {"eventArns": batch}):
+                for event in page:
+                    # Unchanged since the watermark, so enrichment still holds
+                    previous = cached.get(event["arn"], {})
+                    for key in ("description", ENTITIES_KEY):
+                        if key in previous:
+                            event[key] = previous[key]
+                cache.upsert(page, scope)
+                seen.update(event["arn"] for event in page)
+                if on_page is not None:
+                    on_page(page)
+
+    cache.set_watermark(sync_started, start_time, scope)
+    events = cache.load(*(window or (start_time, end_time)), scope)
+    cache.misses += len(seen)
+    cache.hits += sum(1 for event in events if event["arn"] not in seen)
+    return events
+
+
+def fetch_health_events(
+    cache: Optional[EventCache] = None,
+    organization: bool = False,
+    resolve_entities: bool = False,
+    use_async: bool = False,
+    on_page: Optional[Callable[[List[HealthEvent]], None]] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    shards: int = 1,
+    filter_plan: Optional[FilterPlan] = None,
+    account: Optional[str] = None,
+) -> List[HealthEvent]:
+    """
+    Fetch AWS Health events that started between `start_time` and `end_time`
+    (default: the last 90 days), syncing through `cache` if given.
+    With `organization`, events for every member account are fetched through
+    the organizational view and tagged with `awsAccountId`. With
+    `resolve_entities`, each event also lists its affected resources.
+    With `use_async`, the single-account pipeline runs on the asyncio engine.
+    With `shards`, the window is split into sub-ranges fetched in parallel.
+    `filter_plan` fields go into the API filter and its predicates run on
+    every page; filtered cached syncs get a scope of their own. `account`
+    is the caller's account ID: event ARNs do not name the account, so
+    each account's cached events and watermark are kept under its own scope.
+    `on_page` receives every event exactly once, page by page as it arrives.
+    """
+    from botocore.exceptions import ClientError
+
+    events: List[HealthEvent] = []
+    streamed: Set[Tuple[str, Optional[str]]] = set()
+    now = datetime.utcnow()
+    end_time = end_time or now
+    start_time = start_time or end_time - HEALTH_RETENTION
+    plan = filter_plan or FilterPlan({})
+    fields = plan.api_fields or None
+    scope = f"{account}:{plan.cache_scope}" if account else plan.cache_scope
+
+    def emit(page: List[HealthEvent]) -> None:
+        if on_page is not None and page:
+            streamed.update((event.arn, event.account_id) for event in page)
+            on_page(page)
+
+    def finish(final: List[HealthEvent]) -> List[HealthEvent]:
+        # Stream whatever the final result holds that was not emitted yet
+        if on_page is not None:
+            emit([e for e in final if (e.arn, e.account_id) not in streamed])
+        return final
+
+    try:
+        if use_async:
+            from async_engine import fetch_health_events_async
+
+            return finish(
+                plan.apply(
+                    to_health_events(
+                        fetch_health_events_async(
+                            build_event_filter(start_time, end_time, fields=fields),
+                            resolve_entities,
+                            region=get_client_factory().health_region(),
+                        )
+                    )
+                )
+            )
+
+        if cache is not None and not organization and end_time < now - HEALTH_RETENTION:
+            # Entirely older than the API keeps: only the cache has these
+            return finish(plan.apply(to_health_events(cache.load(start_time, end_time, scope))))
+
+        health = get_client("health")
+        if organization:
+            pages = iter_organization_events(
+                health,
+                start_time,
+                end_time,
+                resolve_entities=resolve_entities,
+                shards=shards,
+                fields=fields,
+            )
+        elif cache is not None:
+            # The sync always covers the whole retention period up to now:
+            # the scope has a single watermark, so a narrower --since sync
+            # would advance it past updates to older events. The requested
+            # window is then read from the cache
+            sync_start = now - HEALTH_RETENTION
+            # Synced pages are only streamed when none can fall outside the window
+            stream = on_page is not None and start_time <= sync_start and end_time >= now
+
+            def stream_page(page: List[Dict[str, Any]]) -> None:
+                # Counted once, on the final result below
+                emit([event for event in to_health_events(page) if plan.accepts(event)])
+
+            synced = sync_health_events(
+                health,
+                cache,
+                sync_start,
+                now,
+                scope=scope,
+                resolve_entities=resolve_entities,
+                on_page=stream_page if stream else None,
+                shards=shards,
+                window=(start_time, end_time),
+                fields=fields,
+            )
+            return finish(plan.apply(to_health_events(synced)))
+        else:
+            pages = iter_health_events(
+                health,
+                start_time,
+                end_time,
+                resolve_entities=resolve_entities,
+                shards=shards,
+                fields=fields,
+            )
+        # Normalize and filter page by page so raw response dicts are released early
+        for page in pages:
+            converted = plan.apply(to_health_events(page))
+            events.extend(converted)
+            emit(converted)
         return events
 
     except ClientError as e:
@@ -147,124 +530,647 @@ def fetch_health_events() -> List[Dict[str, Any]]:
             display_free_tier_guidance()
         else:
             console.print(f"[red]❌ Error fetching events: {e}[/red]")
-        return []
+            if organization:
+                console.print(
+                    "[dim]Organization scans must run from the management or delegated "
+                    "administrator account with the Health organizational view enabled:\n"
+                    "aws health enable-health-service-access-for-organization[/dim]"
+                )
+        if cache is not None and not organization:
+            # Fall back to the last successful sync
+            return finish(plan.apply(to_health_events(cache.load(start_time, end_time, scope))))
+        # Keep whatever pages arrived before the failure
+        return events
 
+    except ImportError as e:
+        # Optional async dependencies are missing
+        console.print(f"[red]❌ {e}[/red]")
+        return events
 
-def format_event_date(event: Dict[str, Any]) -> str:
-    """Format event date from event data"""
-    if "startTime" in event:
-        dt = event["startTime"]
-        if isinstance(dt, str):
-            return dt[:10]  # YYYY-MM-DD
+
+def poll_health_events(
+    updated_since: datetime,
+    organization: bool = False,
+    resolve_entities: bool = False,
+    start_time: Optional[datetime] = None,
+    filter_plan: Optional[FilterPlan] = None,
+) -> List[HealthEvent]:
+    """
+    Fetch only the events started since `start_time` (default: the last 90
+    days) and updated since `updated_since`, narrowed by `filter_plan`
+    """
+    end_time = datetime.utcnow()
+    start_time = start_time or end_time - HEALTH_RETENTION
+    plan = filter_plan or FilterPlan({})
+    fields = plan.api_fields or None
+    health = get_client("health")
+    if organization:
+        pages = iter_organization_events(
+            health,
+            start_time,
+            end_time,
+            resolve_entities=resolve_entities,
+            updated_since=updated_since,
+            fields=fields,
+        )
+    else:
+        pages = iter_health_events(
+            health, start_time, end_time, updated_since, resolve_entities, fields=fields
+        )
+    events: List[HealthEvent] = []
+    for page in pages:
+        events.extend(plan.apply(to_health_events(page)))
+    return events
+
+
+def fetch_account_events(
+    health: Any,
+    resolve_entities: bool = False,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    fields: Optional[Dict[str, List[str]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch a window of events (default: the last 90 days) with an
+    already-authorized Health client, narrowed by pushed-down `fields`
+    """
+    events: List[Dict[str, Any]] = []
+    for page in iter_health_events(
+        health, start_time, end_time, resolve_entities=resolve_entities, fields=fields
+    ):
+        events.extend(page)
+    return events
+
+
+def render_account_progress(results: List[AccountResult], total: int) -> "Group":
+    """Build the per-account progress table and running summary"""
+    from rich import box
+    from rich.console import Group
+    from rich.table import Table
+    from rich.text import Text
+
+    table = Table(box=box.SIMPLE, header_style="bold magenta", padding=(0, 1))
+    table.add_column("Account", style="white", no_wrap=True)
+    table.add_column("Events", justify="right")
+    table.add_column("Open", justify="right", style="red")
+    table.add_column("Time", justify="right", style="dim")
+    table.add_column("Status")
+
+    event_count = open_count = failed = 0
+    for result in results:
+        opened = sum(1 for e in result.events if e.is_open)
+        event_count += len(result.events)
+        open_count += opened
+        if result.error:
+            failed += 1
+            status = Text(f"✗ {result.error}"[:60], style="red")
         else:
-            return dt.strftime("%Y-%m-%d")
-    return "N/A"
+            status = Text("✓", style="green")
+        table.add_row(
+            result.account_id,
+            str(len(result.events)),
+            str(opened),
+            f"{result.elapsed:.1f}s",
+            status,
+        )
+
+    summary = (
+        f"[bold]{len(results)}/{total}[/bold] accounts scanned | "
+        f"[bold yellow]{event_count}[/bold yellow] events | "
+        f"[bold red]{open_count} open[/bold red]"
+    )
+    if failed:
+        summary += f" | [red]{failed} failed[/red]"
+    return Group(table, Text.from_markup(summary))
 
 
-def format_service(event: Dict[str, Any]) -> str:
+def scan_accounts(
+    targets: List[AccountTarget],
+    max_workers: int = DEFAULT_ACCOUNT_WORKERS,
+    timeout: Optional[float] = DEFAULT_ACCOUNT_TIMEOUT,
+    resolve_entities: bool = False,
+    on_page: Optional[Callable[[List[HealthEvent]], None]] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    filter_plan: Optional[FilterPlan] = None,
+) -> List[HealthEvent]:
+    """
+    Scan every target account concurrently, updating a live progress view as
+    each one finishes. Returns the merged, account-tagged events; `on_page`
+    receives each account's events as soon as that account is done. Accounts
+    already run in parallel, so their windows are not sharded.
+    """
+    from rich.live import Live
+
+    plan = filter_plan or FilterPlan({})
+
+    results: List[AccountResult] = []
+    events: List[HealthEvent] = []
+    with Live(
+        render_account_progress(results, len(targets)),
+        console=console.get(),
+        refresh_per_second=4,
+    ) as live:
+        fetch = partial(
+            fetch_account_events,
+            resolve_entities=resolve_entities,
+            start_time=start_time,
+            end_time=end_time,
+            fields=plan.api_fields or None,
+        )
+        for result in iter_account_results(
+            targets, fetch, max_workers=max_workers, timeout=timeout
+        ):
+            result = result._replace(events=plan.apply(to_health_events(result.events)))
+            results.append(result)
+            events.extend(result.events)
+            if on_page is not None and result.events:
+                on_page(result.events)
+            live.update(render_account_progress(results, len(targets)))
+    return events
+
+
+def format_event_date(event: HealthEvent) -> str:
+    """Format event date from event data"""
+    if event.start_time is None:
+        return "N/A"
+    return event.start_time.strftime("%Y-%m-%d")
+
+
+def format_service(event: HealthEvent) -> str:
     """Extract service name from event"""
-    service = event.get("service", "Unknown")
-    # Clean up service names
-    service_map = {
-        "EC2": "EC2",
-        "RDS": "RDS",
-        "ELASTICLOADBALANCING": "ELB",
-        "S3": "S3",
-        "DYNAMODB": "DynamoDB",
-        "LAMBDA": "Lambda",
-        "CLOUDFRONT": "CloudFront",
-    }
-    for key, value in service_map.items():
-        if key in service.upper():
-            return value
-    return service[:15] if service else "Unknown"
+    return normalize_service(event.service)
 
 
-def format_region(event: Dict[str, Any]) -> str:
+def format_account(event: HealthEvent) -> str:
+    """Extract the affected account ID from an organization event"""
+    return event.account_id or "All"
+
+
+def format_entities(event: HealthEvent) -> str:
+    """Format the number of affected entities"""
+    count = event.entity_count
+    return "-" if count is None else f"{count:,}"
+
+
+def format_region(event: HealthEvent) -> str:
     """Extract region from event"""
-    region = event.get("region", "Global")
-    return region if region else "Global"
+    return event.region or "Global"
 
 
-def format_status(event: Dict[str, Any]) -> Text:
+def format_status(event: HealthEvent) -> "Text":
     """Format status with color"""
-    status = event.get("eventStatus", "CLOSED")
-    if status == "open":
-        return Text("🔴 Open", style="bold red")
-    elif status == "OPEN":
+    from rich.text import Text
+
+    if event.is_open:
         return Text("🔴 Open", style="bold red")
-    else:
-        return Text("⚪ Closed", style="dim")
+    return Text("⚪ Closed", style="dim")
 
 
-def format_event_type(event: Dict[str, Any]) -> str:
+def format_event_type(event: HealthEvent) -> str:
     """Extract and format event type"""
-    event_type = event.get("eventTypeCode", "Unknown")
-    # Clean up event type
-    event_type = event_type.replace("_", " ").title()[:25]
-    return event_type
+    return normalize_event_type(event.event_type_code)
 
 
-def display_results(events: List[Dict[str, Any]]) -> None:
-    """Display events in a rich table"""
-    if not events:
-        console.print(
-            Panel(
-                "[yellow]ℹ️  No SLA-eligible events found in the last 90 days.[/yellow]\n"
-                "Your AWS services are running smoothly! "
-                "Monitor regularly with [bold]aws-sla-hunter[/bold].",
-                border_style="yellow",
-                title="✓ All Good",
-            )
-        )
+def display_startup_timings() -> None:
+    """Print the startup cost breakdown recorded by record_timing"""
+    total = sum(startup_timings.values())
+    lines = [f"  {step:<24} {seconds * 1000:8.1f} ms" for step, seconds in startup_timings.items()]
+    lines.append(f"  {'total':<24} {total * 1000:8.1f} ms")
+    console.print("[dim]Startup timings:\n" + "\n".join(lines) + "[/dim]")
+    console.print()
+
+
+def format_bytes(count: int) -> str:
+    """Human-readable byte count"""
+    size = float(count)
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def display_stage_timings() -> None:
+    """Print wall time and API counters per pipeline stage"""
+    rows = tracer.stage_summary()
+    if not rows:
+        return
+    lines = [
+        f"  {row.name:<24} {row.seconds * 1000:9.1f} ms {row.calls:6} calls "
+        f"{row.retries:4} retries {format_bytes(row.bytes_received):>10}"
+        for row in rows
+    ]
+    if tracer.dropped:
+        lines.append(f"  ({tracer.dropped} spans over the {tracer.max_spans} limit not kept)")
+    console.print("[dim]Stage timings:\n" + "\n".join(lines) + "[/dim]")
+    console.print()
+
+
+def display_rate_limit_stats() -> None:
+    """Print Health API pacing counters so worker counts can be tuned"""
+    stats = get_client_factory().rate_limit_stats()
+    if not stats.calls:
+        return
+    console.print(
+        f"[dim]Health API: {stats.calls} calls, {stats.throttles} throttled, "
+        f"{stats.wait_time:.1f}s waiting for rate limit, "
+        f"sustained rate {stats.rate:.1f} req/s[/dim]"
+    )
+    console.print()
+
+
+def display_health_endpoint() -> None:
+    """Note when the run had to fail over from the primary Health endpoint"""
+    selector = get_client_factory().health_endpoint
+    if not selector.failed_over:
         return
+    from rich.markup import escape
+
+    primary = selector.regions[0]
+    reason = selector.errors.get(primary)
+    console.print(
+        f"[yellow]Health endpoint {primary} "
+        f"{'failed' if reason else 'was slow'}; used {selector.region}[/yellow]"
+        + (f" [dim]({escape(str(reason))})[/dim]" if reason else "")
+    )
+
 
-    # Create table
+def build_events_table(
+    rows: List[HealthEvent], total: int, estimates: Optional[Dict[EventKey, float]] = None
+) -> "Table":
+    """
+    Build the events table for `rows`, noting when `total` has more; with
+    `estimates` (from --cur), each event shows its share of the credit
+    """
+    from rich import box
+    from rich.table import Table
+
+    caption = None
+    if total > len(rows):
+        caption = (
+            f"Showing the {len(rows):,} newest of {total:,} events "
+            "(--max-rows 0 shows all, --output writes every event)"
+        )
     table = Table(
-        title=f"[bold cyan]AWS Health Events - Last 90 Days ({len(events)} found)[/bold cyan]",
+        title=f"[bold cyan]AWS Health Events - Last 90 Days ({total:,} found)[/bold cyan]",
+        caption=caption,
         box=box.ROUNDED,
         show_header=True,
         header_style="bold magenta",
         padding=(0, 1),
     )
 
+    # Organization scans tag each row with the affected account
+    show_account = any(event.account_id for event in rows)
+    show_entities = any(event.entities is not None for event in rows)
+
     table.add_column("Date", style="cyan", no_wrap=True)
+    if show_account:
+        table.add_column("Account", style="white", no_wrap=True)
     table.add_column("Service", style="green", no_wrap=True)
     table.add_column("Region", style="blue", no_wrap=True)
     table.add_column("Status", justify="center")
     table.add_column("Event Type", style="yellow")
+    if show_entities:
+        table.add_column("Entities", justify="right")
+    if estimates is not None:
+        table.add_column("Est. Credit", justify="right", style="bold green")
 
-    for event in events:
-        table.add_row(
-            format_event_date(event),
+    for event in rows:
+        cells = [format_event_date(event)]
+        if show_account:
+            cells.append(format_account(event))
+        cells += [
             format_service(event),
             format_region(event),
             format_status(event),
             format_event_type(event),
+        ]
+        if show_entities:
+            cells.append(format_entities(event))
+        if estimates is not None:
+            amount = estimates.get((event.arn, event.account_id))
+            cells.append("-" if amount is None else f"${amount:,.2f}")
+        table.add_row(*cells)
+    return table
+
+
+def format_utc_minute(value: datetime) -> str:
+    """Format a datetime to the minute in UTC; naive datetimes are already UTC"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y-%m-%d %H:%M")
+
+
+def format_incident_window(incident: Incident) -> str:
+    """Format an incident's first start and last end, or "ongoing" while open"""
+    if incident.start_time is None:
+        return "N/A"
+    start = format_utc_minute(incident.start_time)
+    if incident.is_open:
+        return f"{start} → ongoing"
+    if incident.end_time is None:
+        return start
+    return f"{start} → {format_utc_minute(incident.end_time)}"
+
+
+def format_incident_status(incident: Incident) -> "Text":
+    """Format how many of an incident's events are still open"""
+    from rich.text import Text
+
+    if incident.is_open:
+        return Text(f"🔴 {incident.open_events:,} open", style="bold red")
+    return Text("⚪ Closed", style="dim")
+
+
+def build_incidents_table(incidents: List[Incident], total: int, events: int) -> "Table":
+    """Build the collapsed view: one row per incident in `incidents` of `total`"""
+    from rich import box
+    from rich.table import Table
+
+    caption = None
+    if total > len(incidents):
+        caption = (
+            f"Showing the {len(incidents):,} newest of {total:,} incidents "
+            "(--max-rows 0 shows all)"
         )
+    table = Table(
+        title=f"[bold cyan]AWS Health Incidents - {total:,} from {events:,} events[/bold cyan]",
+        caption=caption,
+        box=box.ROUNDED,
+        show_header=True,
+        header_style="bold magenta",
+        padding=(0, 1),
+    )
+    show_account = any(incident.accounts for incident in incidents)
+    show_entities = any(incident.entities for incident in incidents)
 
-    console.print(table)
+    table.add_column("Window (UTC)", style="cyan", no_wrap=True)
+    table.add_column("Service", style="green", no_wrap=True)
+    table.add_column("Event Type", style="yellow")
+    table.add_column("Status", justify="center")
+    table.add_column("Events", justify="right")
+    if show_account:
+        table.add_column("Accounts", justify="right")
+    table.add_column("Regions", style="blue")
+    if show_entities:
+        table.add_column("Entities", justify="right")
+
+    for incident in incidents:
+        first = incident.events[0]
+        regions = sorted(incident.regions)
+        region_text = ", ".join(regions[:3]) + (f" +{len(regions) - 3}" if len(regions) > 3 else "")
+        cells = [
+            format_incident_window(incident),
+            format_service(first),
+            format_event_type(first),
+            format_incident_status(incident),
+            f"{len(incident):,}",
+        ]
+        if show_account:
+            cells.append(f"{len(incident.accounts):,}")
+        cells.append(region_text)
+        if show_entities:
+            cells.append(f"{len(incident.entities):,}")
+        table.add_row(*cells)
+    return table
+
+
+def display_no_events() -> None:
+    """Display the all-clear panel"""
+    from rich.panel import Panel
+
+    console.print(
+        Panel(
+            "[yellow]ℹ️  No SLA-eligible events found in the last 90 days.[/yellow]\n"
+            "Your AWS services are running smoothly! "
+            "Monitor regularly with [bold]aws-sla-hunter[/bold].",
+            border_style="yellow",
+            title="✓ All Good",
+        )
+    )
+
+
+def display_results(
+    events: List[HealthEvent],
+    max_rows: int = DEFAULT_MAX_ROWS,
+    collapse: bool = False,
+    estimates: Optional[Dict[EventKey, float]] = None,
+) -> None:
+    """
+    Display events in a rich table, capped at `max_rows` (0 = no cap). With
+    `collapse`, related events are grouped into one row per incident;
+    `estimates` add each event's estimated credit.
+    """
+    from rich.panel import Panel
+
+    if not events:
+        display_no_events()
+        return
+
+    if collapse:
+        with tracer.stage("correlate"):
+            incidents = correlate_events(events)
+        rows = incidents[:max_rows] if max_rows else incidents
+        console.print(build_incidents_table(rows, len(incidents), len(events)))
+    else:
+        console.print(
+            build_events_table(visible_rows(events, max_rows), len(events), estimates)
+        )
     console.print()
 
     # Display summary
-    open_events = [e for e in events if e.get("eventStatus", "CLOSED").upper() == "OPEN"]
-    closed_events = [
-        e
-        for e in events
-        if e.get("eventStatus", "CLOSED").upper() in ["CLOSED", "UPCOMING"]
-    ]
+    summary = EventSummary()
+    summary.add(events)
+    console.print(Panel(summary.markup(), border_style="cyan", padding=(1, 2)))
+    console.print()
+
+
+def fetch_with_live_view(
+    max_rows: int = DEFAULT_MAX_ROWS, **fetch_kwargs: Any
+) -> List[HealthEvent]:
+    """
+    Run fetch_health_events under a rich Live view that shows the newest rows
+    and running totals as each page arrives
+    """
+    from rich.live import Live
+
+    view = LiveResultsView(build_events_table, max_rows)
+    with Live(view.render(), console=console.get(), refresh_per_second=4) as live:
+
+        def on_page(page: List[HealthEvent]) -> None:
+            view.add_page(page)
+            live.update(view.render())
+
+        events = fetch_health_events(on_page=on_page, **fetch_kwargs)
+        live.update(view.render(done=True))
+    return events
+
+
+# Label style for each kind of change reported by --watch
+CHANGE_STYLES = {NEW: "bold yellow", CLOSED: "green", REOPENED: "bold red"}
+
+
+def display_changes(changes: List[EventChange]) -> None:
+    """Print one line per new or changed event"""
+    for change in changes:
+        event = change.event
+        style = CHANGE_STYLES.get(change.kind, "dim")
+        line = (
+            f"[dim]{change.detected:%Y-%m-%d %H:%M:%S}[/dim] "
+            f"[{style}]{change.kind.upper():<8}[/{style}] "
+            f"{format_service(event)} {format_region(event)} {format_event_type(event)}"
+        )
+        if event.account_id:
+            line += f" [dim]{event.account_id}[/dim]"
+        console.print(line)
+
+
+def watch_health_events(
+    interval: float,
+    baseline: List[HealthEvent],
+    since: datetime,
+    organization: bool = False,
+    resolve_entities: bool = False,
+    on_page: Optional[Callable[[List[HealthEvent]], None]] = None,
+    on_poll: Optional[Callable[[Watcher, List[EventChange]], None]] = None,
+    start_time: Optional[datetime] = None,
+    filter_plan: Optional[FilterPlan] = None,
+) -> Watcher:
+    """
+    Poll every `interval` seconds for events updated after `since` until
+    interrupted, reporting events that are new or changed relative to
+    `baseline`. With `on_page`, changed events go there instead of the console.
+    `on_poll` receives the watcher and the changes after every poll.
+    `start_time` moves the start of the polled window (default: 90 days ago)
+    and `filter_plan` narrows every poll like the initial scan.
+    """
+    tracker = EventTracker()
+    tracker.prime(baseline)
+    watcher = Watcher(
+        partial(
+            poll_health_events,
+            organization=organization,
+            resolve_entities=resolve_entities,
+            start_time=start_time,
+            filter_plan=filter_plan,
+        ),
+        interval,
+        since,
+        tracker,
+    )
+
+    def on_changes(changes: List[EventChange]) -> None:
+        if on_page is not None:
+            on_page([change.event for change in changes])
+        else:
+            display_changes(changes)
+
+    def on_error(error: Exception) -> None:
+        console.print(f"[red]❌ Poll failed, retrying in {interval:g}s: {error}[/red]")
+
+    console.print(
+        f"[cyan]→[/cyan] Watching for new and changed events every {interval:g}s "
+        "(Ctrl-C to stop)..."
+    )
+    try:
+        watcher.run(on_changes, on_error, partial(on_poll, watcher) if on_poll else None)
+    except KeyboardInterrupt:
+        watcher.stop()
+    console.print()
+
+    counts = ", ".join(f"{count} {kind}" for kind, count in sorted(tracker.counts.items()))
+    console.print(
+        f"[green]✓[/green] Stopped after {watcher.polls} polls: {counts or 'no changes'}"
+        + (f" [red]({watcher.failures} failed)[/red]" if watcher.failures else "")
+    )
+    return watcher
+
+
+def format_downtime(seconds: float) -> str:
+    """Format a downtime duration as hours and minutes"""
+    minutes = int(round(seconds / 60))
+    return f"{minutes // 60}h {minutes % 60:02d}m"
+
+
+def display_sla_credits(
+    credits: List[MonthlyCredit],
+    spend: Optional[Dict[SpendKey, float]] = None,
+    account: Optional[str] = None,
+) -> None:
+    """
+    Display the months whose downtime fell below a service's SLA; with CUR
+    `spend`, each row is priced (single-account rows against `account`)
+    and ranked by estimated credit
+    """
+    from rich import box
+    from rich.table import Table
+
+    eligible = eligible_credits(credits)
+    if not eligible:
+        console.print(
+            "[dim]No service dropped below its monthly SLA commitment "
+            f"({', '.join(SLA_RULES)}).[/dim]"
+        )
+        console.print()
+        return
 
-    summary_text = f"Found [bold yellow]{len(events)}[/bold yellow] AWS Health events with SLA potential\n"
-    summary_text += (
-        f"[bold red]● {len(open_events)} Open[/bold red] | [dim]⚪ {len(closed_events)} Resolved[/dim]"
+    show_account = any(credit.account_id for credit in eligible)
+    table = Table(
+        title=f"[bold cyan]SLA Credit Eligibility ({len(eligible)} service-months)[/bold cyan]",
+        box=box.ROUNDED,
+        header_style="bold magenta",
+        padding=(0, 1),
     )
+    table.add_column("Month", style="cyan", no_wrap=True)
+    if show_account:
+        table.add_column("Account", style="white", no_wrap=True)
+    table.add_column("Service", style="green", no_wrap=True)
+    table.add_column("Region", style="blue", no_wrap=True)
+    table.add_column("Downtime", justify="right")
+    table.add_column("Uptime", justify="right")
+    table.add_column("Credit", justify="right", style="bold yellow")
+    table.add_column("Events", justify="right")
+
+    amounts: Dict[MonthlyCredit, CreditEstimate] = {}
+    if spend is not None:
+        table.add_column("Spend", justify="right")
+        table.add_column("Est. Credit", justify="right", style="bold green")
+        estimates = estimate_credits(eligible, spend, account)
+        amounts = {estimate.credit: estimate for estimate in estimates}
+        eligible = [estimate.credit for estimate in estimates]
 
-    console.print(Panel(summary_text, border_style="cyan", padding=(1, 2)))
+    for credit in eligible:
+        cells = [credit.month]
+        if show_account:
+            cells.append(credit.account_id or "All")
+        cells += [
+            credit.service,
+            credit.region,
+            format_downtime(credit.downtime_seconds),
+            f"{credit.uptime_percent:.3f}%",
+            f"{credit.credit_percent:g}%",
+            str(len(credit.event_arns)),
+        ]
+        if spend is not None:
+            estimate = amounts[credit]
+            cells += [f"${estimate.spend:,.2f}", f"${estimate.amount:,.2f}"]
+        table.add_row(*cells)
+
+    console.print(table)
+    if spend is not None:
+        total = sum(estimate.amount for estimate in amounts.values())
+        console.print(
+            f"Estimated recoverable credits: [bold green]${total:,.2f}[/bold green]"
+        )
     console.print()
 
 
 def display_cta() -> None:
     """Display call-to-action panel"""
+    from rich.panel import Panel
+
     cta_text = (
         "[bold cyan]💰 CLAIM YOUR MISSING SLA CREDITS[/bold cyan]\n\n"
         "aws-sla-hunter found events with [bold yellow]SLA credit potential[/bold yellow],\n"
@@ -284,10 +1190,253 @@ def display_cta() -> None:
     console.print(Panel(cta_text, border_style="bright_yellow", padding=(1, 2), width=70))
 
 
-def main() -> int:
-    """Main entry point"""
+def time_bound_arg(value: str) -> datetime:
+    """argparse type for --since/--until"""
+    try:
+        return parse_time_bound(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def describe_window(since: Optional[datetime], until: Optional[datetime]) -> str:
+    """Human-readable scan window for progress messages"""
+    if since is None and until is None:
+        return "last 90 days"
+    end = until.strftime("%Y-%m-%d %H:%M") if until else "now"
+    start = since or until - HEALTH_RETENTION
+    return f"{start:%Y-%m-%d %H:%M} to {end}"
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(
+        prog="aws-sla-hunter",
+        description="Find missed SLA credits in your AWS account",
+    )
+    parser.add_argument(
+        "--setup", action="store_true", help="run the interactive authentication wizard"
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="show how long each startup step and pipeline stage took, "
+        "with API calls, retries and bytes received",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="PATH",
+        help="write stage and API spans of the run to PATH",
+    )
+    parser.add_argument(
+        "--trace-format",
+        choices=TRACE_FORMATS,
+        default="json",
+        help="json for a plain report, otlp for OpenTelemetry OTLP/JSON (default: json)",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="run under cProfile, worker threads included, and write the merged "
+        "stats file to PATH",
+    )
+    parser.add_argument(
+        "--skip-entities",
+        action="store_true",
+        help="do not look up the resources affected by each event",
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="run the fetch pipeline on the asyncio engine (needs aiobotocore)",
+    )
+    parser.add_argument(
+        "--output",
+        choices=OUTPUT_FORMATS,
+        default="table",
+        help="table for the terminal view, or a machine-readable format streamed "
+        "as events are fetched (default: table)",
+    )
+    parser.add_argument(
+        "--output-file",
+        metavar="PATH",
+        help="write --output to this file instead of stdout",
+    )
+    parser.add_argument(
+        "--live",
+        action="store_true",
+        help="update the results table and totals while pages are still arriving",
+    )
+    parser.add_argument(
+        "--collapse",
+        action="store_true",
+        help="group related events of one service and event type with overlapping "
+        "times into incidents, one table row each",
+    )
+    parser.add_argument(
+        "--max-rows",
+        type=int,
+        default=DEFAULT_MAX_ROWS,
+        metavar="N",
+        help=f"show at most the N newest events in the table, 0 for all "
+        f"(default: {DEFAULT_MAX_ROWS})",
+    )
+    parser.add_argument(
+        "--cur",
+        nargs="+",
+        metavar="PATH",
+        help="Cost and Usage Report files or directories (CSV, CSV.GZ, Parquet) "
+        "used to price eligible credits",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="skip the local event cache and fetch the full window from the API",
+    )
+    parser.add_argument(
+        "--since",
+        type=time_bound_arg,
+        metavar="WHEN",
+        help="scan events that started at or after WHEN: YYYY-MM-DD, an ISO-8601 "
+        "datetime or a relative 30d/12h/45m (default: 90 days before --until)",
+    )
+    parser.add_argument(
+        "--until",
+        type=time_bound_arg,
+        metavar="WHEN",
+        help="scan events that started at or before WHEN (default: now)",
+    )
+    parser.add_argument(
+        "--service",
+        nargs="+",
+        metavar="CODE",
+        help="only these Health service codes (e.g. EC2 RDS); shell patterns like "
+        "'ELASTIC*' are matched client-side",
+    )
+    parser.add_argument(
+        "--region",
+        nargs="+",
+        metavar="REGION",
+        help="only these regions or availability zones (e.g. us-east-1 eu-west-1a)",
+    )
+    parser.add_argument(
+        "--event-type",
+        nargs="+",
+        metavar="CODE",
+        help="only these event type codes (e.g. AWS_EC2_OPERATIONAL_ISSUE); shell "
+        "patterns are matched client-side",
+    )
+    parser.add_argument(
+        "--status",
+        nargs="+",
+        choices=EVENT_STATUSES,
+        help="only open or only closed events",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=DEFAULT_SHARDS,
+        metavar="N",
+        help="split the window into N date ranges paginated in parallel; 1 disables "
+        f"(default: {DEFAULT_SHARDS})",
+    )
+    scope = parser.add_mutually_exclusive_group()
+    scope.add_argument(
+        "--organization",
+        action="store_true",
+        help="scan every member account through the AWS Health organizational view",
+    )
+    scope.add_argument(
+        "--accounts",
+        nargs="+",
+        metavar="ID_OR_ROLE_ARN",
+        help="scan these accounts by assuming a role in each",
+    )
+    parser.add_argument(
+        "--accounts-file",
+        metavar="PATH",
+        help="file with one account ID or role ARN per line",
+    )
+    parser.add_argument(
+        "--role-name",
+        default=DEFAULT_ROLE_NAME,
+        help=f"role assumed in accounts given by ID (default: {DEFAULT_ROLE_NAME})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_ACCOUNT_WORKERS,
+        help=f"accounts scanned in parallel (default: {DEFAULT_ACCOUNT_WORKERS})",
+    )
+    parser.add_argument(
+        "--account-timeout",
+        type=float,
+        default=DEFAULT_ACCOUNT_TIMEOUT,
+        metavar="SECONDS",
+        help=f"give up on an account after this long (default: {DEFAULT_ACCOUNT_TIMEOUT:g})",
+    )
+    parser.add_argument(
+        "--watch",
+        type=float,
+        metavar="SECONDS",
+        help="after the first scan, keep polling every SECONDS for new and changed "
+        "events until interrupted",
+    )
+    parser.add_argument(
+        "--serve-metrics",
+        type=int,
+        metavar="PORT",
+        help="serve Prometheus metrics on PORT while watching "
+        f"(polls every {DEFAULT_METRICS_INTERVAL:g}s unless --watch is given)",
+    )
+    parser.add_argument(
+        "--metrics-host",
+        default=DEFAULT_METRICS_HOST,
+        metavar="HOST",
+        help=f"address --serve-metrics binds to (default: {DEFAULT_METRICS_HOST})",
+    )
+    args = parser.parse_args(argv)
+    if args.organization and args.accounts_file:
+        parser.error("--accounts-file cannot be combined with --organization")
+    if args.use_async and (args.organization or args.accounts or args.accounts_file):
+        parser.error("--async only supports single-account scans")
+    if args.output == "parquet" and not args.output_file:
+        parser.error("--output parquet needs --output-file")
+    if args.live and args.output != "table":
+        parser.error("--live only applies to --output table")
+    if args.collapse and (args.live or args.output != "table"):
+        parser.error("--collapse only applies to --output table without --live")
+    if args.max_rows < 0:
+        parser.error("--max-rows must be 0 or more")
+    if not 1 <= args.shards <= MAX_SHARDS:
+        parser.error(f"--shards must be between 1 and {MAX_SHARDS}")
+    if args.since and args.until and args.since >= args.until:
+        parser.error("--since must be earlier than --until")
+    if args.serve_metrics is not None:
+        if not 0 <= args.serve_metrics <= 65535:
+            parser.error("--serve-metrics needs a port between 0 and 65535")
+        if args.watch is None:
+            args.watch = DEFAULT_METRICS_INTERVAL
+    if args.watch is not None:
+        if args.watch < MIN_WATCH_INTERVAL:
+            parser.error(f"--watch must be at least {MIN_WATCH_INTERVAL:g} seconds")
+        if args.accounts or args.accounts_file or args.use_async:
+            parser.error(
+                "--watch and --serve-metrics support single-account and --organization scans"
+            )
+        if args.until:
+            parser.error("--watch and --serve-metrics follow new events; drop --until")
+    return args
+
+
+def run(args: argparse.Namespace) -> int:
+    """Run the scan for parsed command-line options"""
+    if args.output != "table" and not args.output_file:
+        # Keep stdout clean for the machine-readable stream
+        console.configure(stderr=True)
+
     # Handle --setup flag for authentication wizard
-    if "--setup" in sys.argv:
+    if args.setup:
         if AWSAuthHandler:
             auth_handler = AWSAuthHandler()
             success = auth_handler.setup_wizard()
@@ -296,6 +1445,8 @@ def main() -> int:
             console.print("[red]Error: auth_handler module not available[/red]")
             return 1
 
+    from rich.panel import Panel
+
     console.print(
         Panel(
             "[bold cyan]🔍 AWS SLA Hunter[/bold cyan]\n"
@@ -308,20 +1459,175 @@ def main() -> int:
 
     # Step 1: Verify credentials
     console.print("[cyan]→[/cyan] Verifying AWS credentials...", end=" ")
-    if not get_credentials():
+    with tracer.stage("credentials"):
+        has_credentials = get_credentials()
+    if not has_credentials:
         console.print()
         return 1
     console.print("[green]✓[/green]")
     console.print()
+    if args.timings:
+        display_startup_timings()
+
+    spend = None
+    if args.cur:
+        console.print("[cyan]→[/cyan] Reading Cost and Usage Report...", end=" ")
+        try:
+            with tracer.stage("cost report"):
+                spend = load_monthly_spend(args.cur)
+        except (OSError, ValueError, ImportError) as e:
+            console.print()
+            console.print(f"[red]❌ Could not read CUR data: {e}[/red]")
+            return 1
+        console.print("[green]✓[/green]")
+        console.print()
 
     # Step 2: Fetch events
-    console.print("[cyan]→[/cyan] Fetching AWS Health events (last 90 days)...", end=" ")
-    events = fetch_health_events()
-    console.print("[green]✓[/green]")
-    console.print()
+    try:
+        targets = load_account_targets(
+            args.accounts or [], args.accounts_file, args.role_name
+        )
+    except (OSError, ValueError) as e:
+        console.print(f"[red]❌ Invalid account list: {e}[/red]")
+        return 1
 
-    # Step 3: Display results
-    display_results(events)
+    writer = None
+    if args.output != "table":
+        try:
+            writer = open_writer(args.output, args.output_file)
+        except (OSError, ValueError, ImportError) as e:
+            console.print(f"[red]❌ Cannot write {args.output} output: {e}[/red]")
+            return 1
+    on_page = writer.write_page if writer is not None else None
+
+    metrics_server = None
+    if args.serve_metrics is not None:
+        # Bound before the scan so a busy port fails fast; until the scan
+        # finishes, scrapes get an empty exposition
+        try:
+            metrics_server = MetricsServer(
+                MetricsState(), args.serve_metrics, args.metrics_host
+            ).start()
+        except OSError as e:
+            console.print(f"[red]❌ Cannot serve metrics on port {args.serve_metrics}: {e}[/red]")
+            return 1
+        console.print(f"[cyan]→[/cyan] Serving metrics at {metrics_server.address}")
+        console.print()
+
+    cache = None
+    window = describe_window(args.since, args.until)
+    filter_plan = EventFilter(args.service, args.region, args.event_type, args.status).plan(
+        args.organization
+    )
+    fetch_started = datetime.utcnow()
+    if targets:
+        console.print(
+            f"[cyan]→[/cyan] Fetching AWS Health events from {len(targets)} accounts "
+            f"({window})..."
+        )
+        with tracer.stage("fetch", accounts=len(targets)):
+            events = scan_accounts(
+                targets,
+                args.workers,
+                args.account_timeout,
+                resolve_entities=not args.skip_entities,
+                on_page=on_page,
+                start_time=args.since,
+                end_time=args.until,
+                filter_plan=filter_plan,
+            )
+        console.print()
+    else:
+        scope = "for the organization " if args.organization else ""
+        # The cache is keyed per event ARN, so organization rows bypass it;
+        # the async engine always fetches the full window
+        use_cache = not (args.no_cache or args.organization or args.use_async)
+        cache = EventCache() if use_cache else None
+        fetch_kwargs: Dict[str, Any] = dict(
+            cache=cache,
+            organization=args.organization,
+            resolve_entities=not args.skip_entities,
+            use_async=args.use_async,
+            start_time=args.since,
+            end_time=args.until,
+            shards=args.shards,
+            filter_plan=filter_plan,
+            account=caller_account(),
+        )
+        if args.live:
+            console.print(f"[cyan]→[/cyan] Fetching AWS Health events {scope}({window})...")
+            with tracer.stage("fetch"):
+                events = fetch_with_live_view(args.max_rows, **fetch_kwargs)
+        else:
+            console.print(
+                f"[cyan]→[/cyan] Fetching AWS Health events {scope}({window})...", end=" "
+            )
+            with tracer.stage("fetch"):
+                events = fetch_health_events(on_page=on_page, **fetch_kwargs)
+            console.print("[green]✓[/green]")
+        console.print()
+    if filter_plan:
+        console.print(f"[dim]{describe_plan(filter_plan)}[/dim]")
+        console.print()
+
+    publisher = None
+    if metrics_server is not None:
+        publisher = MetricsPublisher(metrics_server.state, spend, cache, caller_account())
+        publisher.record_fetch(
+            events, (datetime.utcnow() - fetch_started).total_seconds(), fetch_started
+        )
+
+    def watch(on_page: Optional[Callable[[List[HealthEvent]], None]] = None) -> None:
+        try:
+            with tracer.stage("watch"):
+                watch_health_events(
+                    args.watch,
+                    events,
+                    fetch_started,
+                    organization=args.organization,
+                    resolve_entities=not args.skip_entities,
+                    on_page=on_page,
+                    on_poll=publisher.record_poll if publisher is not None else None,
+                    start_time=args.since,
+                    filter_plan=filter_plan,
+                )
+        finally:
+            if metrics_server is not None:
+                metrics_server.stop()
+
+    if writer is not None:
+        if args.watch:
+            watch(writer.write_page)
+        writer.close()
+        destination = args.output_file or "stdout"
+        console.print(
+            f"[green]✓[/green] Wrote {writer.count} events as {args.output} to {destination}"
+        )
+        display_health_endpoint()
+        display_rate_limit_stats()
+        return 0
+
+    # Step 3: Display results (the live view has already shown the table)
+    credits: List[MonthlyCredit] = []
+    estimates = None
+    if events:
+        with tracer.stage("sla credits"):
+            credits = evaluate_credits(events)
+            if spend is not None:
+                estimates = event_estimates(
+                    estimate_credits(eligible_credits(credits), spend, caller_account())
+                )
+    with tracer.stage("render"):
+        if not args.live or targets:
+            display_results(events, args.max_rows, args.collapse, estimates)
+        elif not events:
+            display_no_events()
+        if events:
+            display_sla_credits(credits, spend, caller_account())
+    if args.watch:
+        watch()
+    display_health_endpoint()
+    display_rate_limit_stats()
 
     # Step 4: Call to action
     display_cta()
@@ -329,5 +1635,34 @@ def main() -> int:
     return 0
 
 
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point"""
+    args = parse_args(argv)
+    tracer.reset()
+    profiler = None
+    if args.profile:
+        profiler = RunProfiler()
+        profiler.start()
+    try:
+        return run(args)
+    except BrokenPipeError:
+        # The reader of a streamed --output closed the pipe early; that ends
+        # the run but is not an error
+        detach_stdout()
+        return 0
+    finally:
+        if profiler is not None:
+            profiler.stop(args.profile)
+            console.print(
+                f"[dim]cProfile stats written to {args.profile} "
+                f"(python -m pstats {args.profile})[/dim]"
+            )
+        if args.timings:
+            display_stage_timings()
+        if args.trace:
+            tracer.write(args.trace, args.trace_format)
+            console.print(f"[dim]Trace ({args.trace_format}) written to {args.trace}[/dim]")
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Metrics Exporter
+Serves event counts, SLA credit estimates and the hunter's own performance
+counters to Prometheus-compatible scrapers, using only the standard library
+"""
+
+import math
+import threading
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from clients import get_client_factory
+from cost_report import CreditEstimate, SpendKey, estimate_credits
+from event_cache import EventCache, to_timestamp
+from health_event import HealthEvent
+from instrumentation import Histogram, OperationStats, tracer
+from rate_limiter import RateLimitStats
+from sla_rules import MonthlyCredit, eligible_credits, evaluate_credits
+from watch import MAX_TRACKED_EVENTS, EventChange, Watcher
+
+# http.server pulls in email and html; it is imported when a server starts
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+# Prefix of every exported metric name
+NAMESPACE = "aws_sla_hunter"
+
+# Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+METRICS_PATH = "/metrics"
+
+# Loopback by default; pass --metrics-host 0.0.0.0 to accept remote scrapes
+DEFAULT_METRICS_HOST = "127.0.0.1"
+
+# Poll interval of --serve-metrics when --watch is not given
+DEFAULT_METRICS_INTERVAL = 60.0
+
+# Events older than the scan window drop out of the gauges
+SCAN_WINDOW = timedelta(days=90)
+
+# Labels for events without a service or region
+UNKNOWN = "unknown"
+
+
+class EventIndex:
+    """
+    Latest version of each event in the scan window, keyed like the watch
+    tracker and bounded the same way, least recently updated first out
+    """
+
+    def __init__(self, max_events: int = MAX_TRACKED_EVENTS, window: timedelta = SCAN_WINDOW):
+        self.max_events = max_events
+        self.window = window
+        self._events: "OrderedDict[Tuple[str, Optional[str]], HealthEvent]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def __iter__(self) -> Iterator[HealthEvent]:
+        return iter(self._events.values())
+
+    def update(self, events: Iterable[HealthEvent]) -> None:
+        for event in events:
+            key = (event.arn, event.account_id)
+            self._events.pop(key, None)
+            self._events[key] = event
+        while len(self._events) > self.max_events:
+            self._events.popitem(last=False)
+
+    def prune(self, now: datetime) -> int:
+        """Forget events that started before the window; returns how many"""
+        cutoff = to_timestamp(now) - self.window.total_seconds()
+        expired = [
+            key
+            for key, event in self._events.items()
+            if event.start_time is not None and to_timestamp(event.start_time) < cutoff
+        ]
+        for key in expired:
+            del self._events[key]
+        return len(expired)
+
+
+class MetricsSnapshot(NamedTuple):
+    """Everything one exposition is rendered from, gathered off the scrape path"""
+
+    events: List[HealthEvent]
+    credits: List[MonthlyCredit]
+    # None without CUR spend to price the credits
+    estimates: Optional[List[CreditEstimate]]
+    operations: Dict[str, OperationStats]
+    latencies: Dict[str, Histogram]
+    rate_limits: RateLimitStats
+    cache_hits: int
+    cache_misses: int
+    # Wall time of the latest fetch or poll
+    fetch_seconds: Optional[float]
+    polls: int
+    poll_failures: int
+    last_success: Optional[datetime]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class _Exposition:
+    """Builds the text format one metric family at a time"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def family(self, name: str, kind: str, help_text: str) -> None:
+        self.lines.append(f"# HELP {NAMESPACE}_{name} {help_text}")
+        self.lines.append(f"# TYPE {NAMESPACE}_{name} {kind}")
+
+    def sample(self, name: str, value: float, **labels: str) -> None:
+        if labels:
+            rendered = ",".join(f'{key}="{_escape(str(v))}"' for key, v in labels.items())
+            self.lines.append(f"{NAMESPACE}_{name}{{{rendered}}} {_format_value(value)}")
+        else:
+            self.lines.append(f"{NAMESPACE}_{name} {_format_value(value)}")
+
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def _credit_labels(credit: MonthlyCredit) -> Dict[str, str]:
+    # Organization scans price each account separately; "" drops the label
+    return {
+        "account": credit.account_id or "",
+        "service": credit.service,
+        "region": credit.region,
+        "month": credit.month,
+    }
+
+
+def render_metrics(snapshot: MetricsSnapshot) -> str:
+    """Render a snapshot in the Prometheus text exposition format"""
+    out = _Exposition()
+
+    counts: Counter = Counter(
+        (event.service or UNKNOWN, event.region or UNKNOWN, event.status)
+        for event in snapshot.events
+    )
+    out.family("events", "gauge", "Health events in the scan window")
+    for (service, region, status), count in sorted(counts.items()):
+        out.sample("events", count, service=service, region=region, status=status)
+
+    eligible = eligible_credits(snapshot.credits)
+    out.family("sla_credit_percent", "gauge", "SLA credit earned per service-month")
+    for credit in eligible:
+        out.sample("sla_credit_percent", credit.credit_percent, **_credit_labels(credit))
+    out.family("sla_downtime_seconds", "gauge", "Downtime per eligible service-month")
+    for credit in eligible:
+        out.sample("sla_downtime_seconds", credit.downtime_seconds, **_credit_labels(credit))
+    if snapshot.estimates is not None:
+        out.family(
+            "estimated_credit_usd", "gauge", "Estimated credit priced against CUR spend"
+        )
+        for estimate in snapshot.estimates:
+            out.sample("estimated_credit_usd", estimate.amount, **_credit_labels(estimate.credit))
+
+    operations = sorted(snapshot.operations.items())
+    for name, attribute, help_text in (
+        ("api_calls_total", "calls", "AWS API calls"),
+        ("api_retries_total", "retries", "Retried AWS API attempts"),
+        ("api_errors_total", "errors", "Failed AWS API attempts"),
+        ("api_received_bytes_total", "bytes_received", "AWS API response bytes"),
+    ):
+        out.family(name, "counter", help_text)
+        for operation, stats in operations:
+            out.sample(name, getattr(stats, attribute), operation=operation)
+
+    out.family("api_request_duration_seconds", "histogram", "AWS API call latency")
+    for operation, histogram in sorted(snapshot.latencies.items()):
+        for bound, count in histogram.cumulative():
+            out.sample(
+                "api_request_duration_seconds_bucket",
+                count,
+                operation=operation,
+                le=_format_value(bound),
+            )
+        out.sample("api_request_duration_seconds_sum", histogram.total, operation=operation)
+        out.sample("api_request_duration_seconds_count", histogram.count, operation=operation)
+
+    limits = snapshot.rate_limits
+    out.family("health_throttles_total", "counter", "Throttled Health API calls")
+    out.sample("health_throttles_total", limits.throttles)
+    out.family("rate_limit_wait_seconds_total", "counter", "Time spent waiting for a token")
+    out.sample("rate_limit_wait_seconds_total", limits.wait_time)
+    out.family("rate_limit_requests_per_second", "gauge", "Current Health API pacing rate")
+    out.sample("rate_limit_requests_per_second", limits.rate)
+
+    out.family("cache_hits_total", "counter", "Events served from the local cache")
+    out.sample("cache_hits_total", snapshot.cache_hits)
+    out.family("cache_misses_total", "counter", "Events fetched from the API during a sync")
+    out.sample("cache_misses_total", snapshot.cache_misses)
+    lookups = snapshot.cache_hits + snapshot.cache_misses
+    if lookups:
+        out.family("cache_hit_ratio", "gauge", "Share of synced events served from cache")
+        out.sample("cache_hit_ratio", snapshot.cache_hits / lookups)
+
+    if snapshot.fetch_seconds is not None:
+        out.family("fetch_duration_seconds", "gauge", "Wall time of the latest fetch or poll")
+        out.sample("fetch_duration_seconds", snapshot.fetch_seconds)
+    out.family("polls_total", "counter", "Watch polls completed")
+    out.sample("polls_total", snapshot.polls)
+    out.family("poll_failures_total", "counter", "Watch polls that failed")
+    out.sample("poll_failures_total", snapshot.poll_failures)
+    if snapshot.last_success is not None:
+        out.family(
+            "last_success_timestamp_seconds", "gauge", "Start of the latest successful fetch"
+        )
+        out.sample("last_success_timestamp_seconds", to_timestamp(snapshot.last_success))
+
+    return out.text()
+
+
+class MetricsState:
+    """The latest rendered exposition; scrapes only ever read it"""
+
+    def __init__(self, body: str = ""):
+        self._lock = threading.Lock()
+        self._body = body.encode("utf-8")
+
+    def publish(self, body: str) -> None:
+        encoded = body.encode("utf-8")
+        with self._lock:
+            self._body = encoded
+
+    def body(self) -> bytes:
+        with self._lock:
+            return self._body
+
+
+class MetricsPublisher:
+    """
+    Tracks the current events and run counters, and re-renders the
+    exposition after every fetch and poll, so a scrape never waits on, or
+    triggers, an API call
+    """
+
+    def __init__(
+        self,
+        state: MetricsState,
+        spend: Optional[Dict[SpendKey, float]] = None,
+        cache: Optional[EventCache] = None,
+        account: Optional[str] = None,
+    ):
+        self.state = state
+        self.spend = spend
+        self.cache = cache
+        # Caller account that single-account credits are priced against
+        self.account = account
+        self.index = EventIndex()
+        self.fetch_seconds: Optional[float] = None
+        self.last_success: Optional[datetime] = None
+        self.polls = 0
+        self.poll_failures = 0
+
+    def record_fetch(
+        self, events: Iterable[HealthEvent], seconds: float, started: datetime
+    ) -> None:
+        """The initial scan finished"""
+        self.index.update(events)
+        self.fetch_seconds = seconds
+        self.last_success = started
+        self.publish()
+
+    def record_poll(self, watcher: Watcher, changes: List[EventChange]) -> None:
+        """A watch poll finished; failed polls only move the counters"""
+        self.index.update(change.event for change in changes)
+        if watcher.last_success is not None:
+            self.fetch_seconds = watcher.last_duration
+            self.last_success = watcher.last_success
+        self.polls = watcher.polls
+        self.poll_failures = watcher.failures
+        self.publish()
+
+    def snapshot(self, now: Optional[datetime] = None) -> MetricsSnapshot:
+        now = now or datetime.now(timezone.utc)
+        self.index.prune(now)
+        events = list(self.index)
+        credits = evaluate_credits(events, now)
+        return MetricsSnapshot(
+            events,
+            credits,
+            estimate_credits(credits, self.spend, self.account) if self.spend is not None else None,
+            tracer.operation_totals(),
+            tracer.latency_histograms(),
+            get_client_factory().rate_limit_stats(),
+            self.cache.hits if self.cache is not None else 0,
+            self.cache.misses if self.cache is not None else 0,
+            self.fetch_seconds,
+            self.polls,
+            self.poll_failures,
+            self.last_success,
+        )
+
+    def publish(self, now: Optional[datetime] = None) -> None:
+        self.state.publish(render_metrics(self.snapshot(now)))
+
+
+class MetricsServer:
+    """Serves a MetricsState over HTTP from a daemon thread"""
+
+    def __init__(self, state: MetricsState, port: int, host: str = DEFAULT_METRICS_HOST):
+        self.state = state
+        self.host = host
+        self.port = port
+        self._server: Optional["ThreadingHTTPServer"] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> str:
+        return f"http://{self.host}:{self.port}{METRICS_PATH}"
+
+    def start(self) -> "MetricsServer":
+        """Bind and start serving; with port 0 the bound port is filled in"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        state = self.state
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] != METRICS_PATH:
+                    self.send_error(404)
+                    return
+                body = state.body()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                # Scrapes every few seconds would drown the watch output
+                pass
+
+        server = ThreadingHTTPServer((self.host, self.port), Handler)
+        server.daemon_threads = True
+        self._server = server
+        self.port = server.server_address[1]
+        self._thread = threading.Thread(
+            target=server.serve_forever, name="metrics-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
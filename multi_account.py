@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Multi-Account Scanner
+Assumes a role in each target account and scans them concurrently
+"""
+
+import queue
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from clients import ClientFactory, get_client_factory
+
+# Role assumed in accounts given as bare 12-digit IDs
+DEFAULT_ROLE_NAME = "OrganizationAccountAccessRole"
+
+DEFAULT_ACCOUNT_WORKERS = 16
+
+# Seconds an account scan may run before it is reported as timed out
+DEFAULT_ACCOUNT_TIMEOUT = 300.0
+
+ROLE_SESSION_NAME = "aws-sla-hunter"
+
+ACCOUNT_ID_PATTERN = re.compile(r"^\d{12}$")
+ROLE_ARN_PATTERN = re.compile(r"^arn:aws[\w-]*:iam::(\d{12}):role/.+$")
+
+
+class AccountTarget(NamedTuple):
+    """An account to scan and the role used to reach it"""
+
+    account_id: str
+    role_arn: str
+
+
+class AccountResult(NamedTuple):
+    """Outcome of scanning one account"""
+
+    account_id: str
+    events: List[Dict[str, Any]]
+    error: Optional[str]
+    elapsed: float
+
+
+def parse_account_target(value: str, role_name: str = DEFAULT_ROLE_NAME) -> AccountTarget:
+    """Turn an account ID or role ARN into an AccountTarget"""
+    value = value.strip()
+    match = ROLE_ARN_PATTERN.match(value)
+    if match:
+        return AccountTarget(match.group(1), value)
+    if ACCOUNT_ID_PATTERN.match(value):
+        return AccountTarget(value, f"arn:aws:iam::{value}:role/{role_name}")
+    raise ValueError(f"Not an account ID or IAM role ARN: {value!r}")
+
+
+def load_account_targets(
+    values: Iterable[str] = (),
+    accounts_file: Optional[str] = None,
+    role_name: str = DEFAULT_ROLE_NAME,
+) -> List[AccountTarget]:
+    """
+    Collect targets from CLI values and an optional file (one per line,
+    `#` starts a comment). Duplicate accounts are scanned once.
+    """
+    raw = list(values)
+    if accounts_file:
+        for line in Path(accounts_file).read_text().splitlines():
+            line = line.split("#", 1)[0].strip()
+            if line:
+                raw.append(line)
+
+    targets: Dict[str, AccountTarget] = {}
+    for value in raw:
+        target = parse_account_target(value, role_name)
+        targets.setdefault(target.account_id, target)
+    return list(targets.values())
+
+
+def scan_account(
+    factory: ClientFactory,
+    target: AccountTarget,
+    fetch: Callable[[Any], List[Dict[str, Any]]],
+) -> List[Dict[str, Any]]:
+    """Assume the target role and fetch its events, tagged with the account ID"""
+    factory.assume_role(target.account_id, target.role_arn, ROLE_SESSION_NAME)
+    health = factory.client("health", account_id=target.account_id)
+    events = fetch(health)
+    for event in events:
+        event["awsAccountId"] = target.account_id
+    return events
+
+
+def iter_account_results(
+    targets: List[AccountTarget],
+    fetch: Callable[[Any], List[Dict[str, Any]]],
+    max_workers: int = DEFAULT_ACCOUNT_WORKERS,
+    timeout: Optional[float] = DEFAULT_ACCOUNT_TIMEOUT,
+    factory: Optional[ClientFactory] = None,
+) -> Iterator[AccountResult]:
+    """
+    Scan accounts on a pool of daemon threads, yielding each result as it
+    finishes. An account still running `timeout` seconds after it started is
+    yielded as timed out; its thread is abandoned, any late result is dropped,
+    and it cannot keep the process alive at exit.
+    """
+    from botocore.exceptions import BotoCoreError, ClientError
+
+    factory = factory or get_client_factory()
+    # Start times by account ID, set when a worker picks the account up
+    started: Dict[str, float] = {}
+    work: "queue.Queue[AccountTarget]" = queue.Queue()
+    for target in targets:
+        work.put(target)
+    finished: "queue.Queue[Tuple[AccountTarget, Any, Optional[BaseException]]]" = queue.Queue()
+    stop = threading.Event()
+
+    def worker() -> None:
+        # Idle workers stop taking accounts once the caller is done
+        while not stop.is_set():
+            try:
+                target = work.get_nowait()
+            except queue.Empty:
+                return
+            started[target.account_id] = time.monotonic()
+            try:
+                finished.put((target, scan_account(factory, target, fetch), None))
+            except Exception as e:
+                finished.put((target, None, e))
+
+    # Daemon threads rather than ThreadPoolExecutor, whose workers are joined at exit
+    for n in range(min(max_workers, len(targets))):
+        threading.Thread(target=worker, name=f"account-{n}", daemon=True).start()
+
+    pending = {target.account_id for target in targets}
+    poll = 1.0 if timeout is None else min(1.0, timeout / 4)
+    try:
+        while pending:
+            try:
+                target, events, error = finished.get(timeout=poll)
+            except queue.Empty:
+                pass
+            else:
+                now = time.monotonic()
+                elapsed = now - started.get(target.account_id, now)
+                if target.account_id in pending:
+                    pending.discard(target.account_id)
+                    if error is None:
+                        yield AccountResult(target.account_id, events, None, elapsed)
+                    elif isinstance(error, (ClientError, BotoCoreError)):
+                        yield AccountResult(target.account_id, [], str(error), elapsed)
+                    else:
+                        yield AccountResult(
+                            target.account_id, [], f"Unexpected error: {error}", elapsed
+                        )
+
+            if timeout is None:
+                continue
+            now = time.monotonic()
+            for account_id in sorted(pending):
+                elapsed = now - started.get(account_id, now)
+                if elapsed > timeout:
+                    pending.discard(account_id)
+                    yield AccountResult(account_id, [], f"Timed out after {timeout:g}s", elapsed)
+    finally:
+        stop.set()
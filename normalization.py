@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Service and Event-Type Normalization
+Display names from the bundled Health catalog, computed once per distinct code
+"""
+
+import json
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from terminal import console
+
+# Health service codes and well-known event types mapped to display names
+CATALOG_PATH = Path(__file__).with_name("service_catalog.json")
+
+# Where setup.py's data_files puts the catalog in an installed copy
+INSTALLED_CATALOG_PATH = Path(sys.prefix) / "share" / "aws-sla-hunter" / "service_catalog.json"
+
+# Used when no catalog file can be found, so SLA rules still match the
+# services they cover
+BUILTIN_SERVICES = {
+    "EC2": "EC2",
+    "RDS": "RDS",
+    "ELASTICLOADBALANCING": "ELB",
+    "S3": "S3",
+    "DYNAMODB": "DynamoDB",
+    "LAMBDA": "Lambda",
+    "CLOUDFRONT": "CloudFront",
+}
+
+# Width of the Service and Event Type columns
+SERVICE_WIDTH = 15
+EVENT_TYPE_WIDTH = 25
+
+# Shortest catalog code used for substring matches against unknown codes;
+# two-letter codes like "ES" would match far too much
+MIN_SUBSTRING_CODE = 3
+
+
+class Catalog(NamedTuple):
+    """Display-name lookups loaded from the catalog file"""
+
+    services: Dict[str, str]
+    event_types: Dict[str, str]
+    # Cost and Usage Report product codes (e.g. "AmazonEC2")
+    product_codes: Dict[str, str]
+    # Service codes longest-first, for the substring fallback
+    substring_codes: Tuple[str, ...]
+
+
+def _build_catalog(data: Dict[str, Any]) -> Catalog:
+    services = {code.upper(): name for code, name in data.get("services", {}).items()}
+    event_types = {code.upper(): name for code, name in data.get("event_types", {}).items()}
+    product_codes = {code.upper(): name for code, name in data.get("product_codes", {}).items()}
+    substring_codes = tuple(
+        sorted((c for c in services if len(c) >= MIN_SUBSTRING_CODE), key=len, reverse=True)
+    )
+    return Catalog(services, event_types, product_codes, substring_codes)
+
+
+def load_catalog(path: Optional[Path] = None) -> Catalog:
+    """
+    Read a catalog file; a missing file yields an empty catalog. Without
+    `path`, the bundled catalog is read from next to this module or from the
+    installed data files, falling back to BUILTIN_SERVICES with a warning.
+    """
+    if path is not None:
+        try:
+            with open(path, encoding="utf-8") as fh:
+                return _build_catalog(json.load(fh))
+        except FileNotFoundError:
+            return _build_catalog({})
+
+    for candidate in (CATALOG_PATH, INSTALLED_CATALOG_PATH):
+        try:
+            with open(candidate, encoding="utf-8") as fh:
+                return _build_catalog(json.load(fh))
+        except FileNotFoundError:
+            continue
+    console.print(
+        f"[yellow]⚠️  {CATALOG_PATH.name} not found; showing built-in names for "
+        f"{len(BUILTIN_SERVICES)} services only. Reinstall aws-sla-hunter to restore it.[/yellow]"
+    )
+    return _build_catalog({"services": BUILTIN_SERVICES})
+
+
+@lru_cache(maxsize=1)
+def get_catalog() -> Catalog:
+    """The bundled catalog, read on first use"""
+    return load_catalog()
+
+
+@lru_cache(maxsize=None)
+def normalize_service(code: Optional[str]) -> str:
+    """Display name for a Health service code"""
+    if not code:
+        return "Unknown"
+    catalog = get_catalog()
+    upper = code.upper()
+    name = catalog.services.get(upper)
+    if name is None:
+        # Codes like "AMAZON_EC2" still resolve to their catalog entry
+        match = next((c for c in catalog.substring_codes if c in upper), None)
+        name = catalog.services[match] if match else code
+    return name[:SERVICE_WIDTH]
+
+
+@lru_cache(maxsize=None)
+def normalize_event_type(code: Optional[str]) -> str:
+    """Display name for a Health event type code"""
+    if not code:
+        return "Unknown"
+    name = get_catalog().event_types.get(code.upper())
+    if name is None:
+        name = code.replace("_", " ").title()
+    return name[:EVENT_TYPE_WIDTH]
+
+
+@lru_cache(maxsize=None)
+def normalize_product_code(code: Optional[str]) -> str:
+    """Service display name for a CUR product code, matching normalize_service"""
+    if not code:
+        return "Unknown"
+    name = get_catalog().product_codes.get(code.upper())
+    if name is not None:
+        return name[:SERVICE_WIDTH]
+    for prefix in ("Amazon", "AWS"):
+        if code.startswith(prefix) and len(code) > len(prefix):
+            code = code[len(prefix):]
+            break
+    return normalize_service(code)
+
+
+def clear_caches() -> None:
+    """Forget memoized names, e.g. after swapping the catalog in tests"""
+    get_catalog.cache_clear()
+    normalize_service.cache_clear()
+    normalize_event_type.cache_clear()
+    normalize_product_code.cache_clear()
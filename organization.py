@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+AWS Organizations Health Scan
+Fetches Health events for every member account through the organizational view
+"""
+
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from affected_entities import attach_affected_entities
+from enrichment import (
+    DEFAULT_MAX_WORKERS,
+    DETAILS_BATCH_SIZE,
+    MAX_DETAIL_ATTEMPTS,
+    RETRY_BACKOFF,
+    chunked,
+)
+from clients import MAX_POOL_CONNECTIONS
+from instrumentation import SPAN_KIND_CLIENT, tracer
+from sharding import iter_sharded_pages, split_window
+
+# describe_events_for_organization accepts at most 100 results per page
+ORG_EVENTS_PAGE_SIZE = 100
+
+# describe_affected_accounts_for_organization accepts 10-100 results per page
+AFFECTED_ACCOUNTS_PAGE_SIZE = 100
+
+
+def build_organization_filter(
+    start_time: datetime,
+    end_time: datetime,
+    updated_since: Optional[datetime] = None,
+    fields: Optional[Dict[str, List[str]]] = None,
+) -> Dict[str, Any]:
+    """
+    Build the describe_events_for_organization filter for a time window,
+    narrowed by pushed-down `fields` (services, regions, ...) if given
+    """
+    org_filter: Dict[str, Any] = {
+        "startTime": {"from": start_time, "to": end_time},
+        "eventTypeCategories": ["issue"],
+        "eventStatusCodes": ["open", "closed"],
+    }
+    if updated_since is not None:
+        org_filter["lastUpdatedTime"] = {"from": updated_since}
+    if fields:
+        org_filter.update(fields)
+    return org_filter
+
+
+def iter_organization_event_pages(
+    health: Any,
+    org_filter: Dict[str, Any],
+    page_size: int = ORG_EVENTS_PAGE_SIZE,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Yield pages of organization events, following nextToken until exhausted"""
+    request: Dict[str, Any] = {"filter": org_filter, "maxResults": page_size}
+    page = 0
+    while True:
+        page += 1
+        with tracer.span("describe_events_for_organization", SPAN_KIND_CLIENT, page=page) as span:
+            response = health.describe_events_for_organization(**request)
+            events = response.get("events", [])
+            span.attributes["events"] = len(events)
+        if events:
+            yield events
+
+        next_token = response.get("nextToken")
+        if not next_token:
+            return
+        request["nextToken"] = next_token
+
+
+def fetch_affected_accounts(health: Any, event_arn: str) -> List[str]:
+    """Return every account ID affected by an organization event"""
+    accounts: List[str] = []
+    request: Dict[str, Any] = {
+        "eventArn": event_arn,
+        "maxResults": AFFECTED_ACCOUNTS_PAGE_SIZE,
+    }
+    while True:
+        response = health.describe_affected_accounts_for_organization(**request)
+        accounts.extend(response.get("affectedAccounts", []))
+
+        next_token = response.get("nextToken")
+        if not next_token:
+            return accounts
+        request["nextToken"] = next_token
+
+
+def fetch_organization_details_batch(
+    health: Any,
+    pairs: List[Tuple[str, Optional[str]]],
+    max_attempts: int = MAX_DETAIL_ATTEMPTS,
+    backoff: float = RETRY_BACKOFF,
+) -> Dict[Tuple[str, Optional[str]], str]:
+    """
+    Fetch descriptions for up to 10 (event ARN, account ID) pairs,
+    retrying failedSet entries. Returns descriptions keyed by pair.
+    """
+    descriptions: Dict[Tuple[str, Optional[str]], str] = {}
+    pending = list(pairs)
+
+    for attempt in range(max_attempts):
+        if attempt:
+            time.sleep(backoff * (2 ** (attempt - 1)))
+
+        filters = []
+        for arn, account_id in pending:
+            item = {"eventArn": arn}
+            if account_id:
+                item["awsAccountId"] = account_id
+            filters.append(item)
+
+        response = health.describe_event_details_for_organization(
+            organizationEventDetailFilters=filters
+        )
+        for detail in response.get("successfulSet", []):
+            key = (detail["event"]["arn"], detail.get("awsAccountId"))
+            descriptions[key] = detail.get("eventDescription", {}).get(
+                "latestDescription", ""
+            )
+
+        pending = [
+            (item["eventArn"], item.get("awsAccountId"))
+            for item in response.get("failedSet", [])
+        ]
+        if not pending:
+            break
+
+    return descriptions
+
+
+def expand_by_account(
+    health: Any, events: List[Dict[str, Any]], executor: Executor
+) -> List[Dict[str, Any]]:
+    """
+    Fan out describe_affected_accounts_for_organization per event and return
+    one row per (event, account), tagged with `awsAccountId`. Events without
+    affected accounts (public events) are kept as a single untagged row.
+    """
+    futures = {
+        executor.submit(fetch_affected_accounts, health, event["arn"]): event
+        for event in events
+    }
+    rows: List[Dict[str, Any]] = []
+    for future in as_completed(futures):
+        event = futures[future]
+        accounts = future.result()
+        if not accounts:
+            rows.append(dict(event, awsAccountId=None))
+        for account_id in accounts:
+            rows.append(dict(event, awsAccountId=account_id))
+    return rows
+
+
+def enrich_organization_events(
+    health: Any, rows: List[Dict[str, Any]], executor: Executor
+) -> List[Dict[str, Any]]:
+    """Attach descriptions to account-tagged rows, merging batches as they complete"""
+    by_pair: Dict[Tuple[str, Optional[str]], List[Dict[str, Any]]] = {}
+    for row in rows:
+        by_pair.setdefault((row["arn"], row.get("awsAccountId")), []).append(row)
+
+    futures = [
+        executor.submit(fetch_organization_details_batch, health, batch)
+        for batch in chunked(by_pair, DETAILS_BATCH_SIZE)
+    ]
+    for future in as_completed(futures):
+        for pair, description in future.result().items():
+            for row in by_pair.get(pair, []):
+                row["description"] = description
+    return rows
+
+
+def iter_organization_events(
+    health: Any,
+    start_time: datetime,
+    end_time: datetime,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    resolve_entities: bool = False,
+    updated_since: Optional[datetime] = None,
+    shards: int = 1,
+    fields: Optional[Dict[str, List[str]]] = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield enriched, account-tagged pages of organization events. With
+    `shards`, the window is split into sub-ranges paginated in parallel;
+    `fields` are added to the describe_events_for_organization filter.
+    """
+    windows = split_window(start_time, end_time, 1 if updated_since else shards)
+
+    def enriched(pages: Iterable[List[Dict[str, Any]]]) -> Iterator[List[Dict[str, Any]]]:
+        for page in pages:
+            rows = expand_by_account(health, page, executor)
+            enrich_organization_events(health, rows, executor)
+            if resolve_entities:
+                attach_affected_entities(health, rows, executor, organization=True)
+            yield rows
+
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers * len(windows), MAX_POOL_CONNECTIONS),
+        thread_name_prefix="health-org",
+    ) as executor:
+        if len(windows) > 1:
+            # Rows are per account, so a boundary event matched by two
+            # shards is recognised by its (ARN, account) pair
+            yield from iter_sharded_pages(
+                [
+                    enriched(
+                        iter_organization_event_pages(
+                            health, build_organization_filter(start, end, fields=fields)
+                        )
+                    )
+                    for start, end in windows
+                ],
+                key=lambda row: (row["arn"], row.get("awsAccountId")),
+            )
+        else:
+            org_filter = build_organization_filter(start_time, end_time, updated_since, fields)
+            yield from enriched(iter_organization_event_pages(health, org_filter))
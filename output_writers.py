@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Machine-Readable Output
+Streaming JSON, JSONL, CSV and Parquet writers for fetched Health events
+"""
+
+import csv
+import json
+import os
+import sys
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import IO, Any, Dict, Iterable, List, Optional
+
+from health_event import HealthEvent
+
+OUTPUT_FORMATS = ("table", "json", "jsonl", "csv", "parquet")
+
+# Stable output schema: column order for CSV/Parquet, key order for JSON
+OUTPUT_FIELDS = (
+    "arn",
+    "account_id",
+    "service",
+    "region",
+    "availability_zone",
+    "event_type_code",
+    "event_type_category",
+    "status",
+    "start_time",
+    "end_time",
+    "last_updated",
+    "description",
+    "entity_count",
+    "entities",
+)
+
+# Separator for the entity list in CSV cells
+CSV_ENTITY_SEPARATOR = " "
+
+INSTALL_HINT = "Parquet output needs pyarrow: pip install 'aws-sla-hunter[parquet]'"
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def event_record(event: HealthEvent) -> Dict[str, Any]:
+    """Flatten an event into the output schema (datetimes as ISO-8601)"""
+    return {
+        "arn": event.arn,
+        "account_id": event.account_id,
+        "service": event.service,
+        "region": event.region,
+        "availability_zone": event.availability_zone,
+        "event_type_code": event.event_type_code,
+        "event_type_category": event.event_type_category,
+        "status": event.status,
+        "start_time": _isoformat(event.start_time),
+        "end_time": _isoformat(event.end_time),
+        "last_updated": _isoformat(event.last_updated),
+        "description": event.description,
+        "entity_count": event.entity_count,
+        "entities": list(event.entities) if event.entities is not None else None,
+    }
+
+
+class EventWriter(ABC):
+    """Writes pages of events as they arrive; call close() once at the end"""
+
+    def __init__(self, stream: IO[str], owns_stream: bool = False):
+        self.stream = stream
+        self.owns_stream = owns_stream
+        self.count = 0
+
+    def write_page(self, events: Iterable[HealthEvent]) -> None:
+        for event in events:
+            self.write_record(event_record(event))
+            self.count += 1
+        # Downstream tools see each page as soon as it is fetched
+        self.stream.flush()
+
+    @abstractmethod
+    def write_record(self, record: Dict[str, Any]) -> None:
+        """Write one event_record to the stream"""
+
+    def close(self) -> None:
+        self.stream.flush()
+        if self.owns_stream:
+            self.stream.close()
+
+    def __enter__(self) -> "EventWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class JsonLinesWriter(EventWriter):
+    """One JSON object per line"""
+
+    def write_record(self, record: Dict[str, Any]) -> None:
+        self.stream.write(json.dumps(record) + "\n")
+
+
+class JsonWriter(EventWriter):
+    """A single JSON array, written element by element"""
+
+    def write_record(self, record: Dict[str, Any]) -> None:
+        self.stream.write(("[\n  " if not self.count else ",\n  ") + json.dumps(record))
+
+    def close(self) -> None:
+        self.stream.write("[]\n" if not self.count else "\n]\n")
+        super().close()
+
+
+class CsvWriter(EventWriter):
+    """CSV with a header row; entities are space separated"""
+
+    def __init__(self, stream: IO[str], owns_stream: bool = False):
+        super().__init__(stream, owns_stream)
+        self._writer = csv.DictWriter(stream, fieldnames=OUTPUT_FIELDS, lineterminator="\n")
+        self._writer.writeheader()
+
+    def write_record(self, record: Dict[str, Any]) -> None:
+        if record["entities"] is not None:
+            record["entities"] = CSV_ENTITY_SEPARATOR.join(record["entities"])
+        self._writer.writerow(record)
+
+
+class ParquetWriter:
+    """One Parquet row group per page, written with pyarrow"""
+
+    def __init__(self, path: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(INSTALL_HINT) from e
+
+        self._pa = pa
+        # Every field is a string except these
+        types = {"entity_count": pa.int64(), "entities": pa.list_(pa.string())}
+        self.schema = pa.schema(
+            [(name, types.get(name, pa.string())) for name in OUTPUT_FIELDS]
+        )
+        self._writer = pq.ParquetWriter(path, self.schema)
+        self.count = 0
+
+    def write_page(self, events: Iterable[HealthEvent]) -> None:
+        records: List[Dict[str, Any]] = [event_record(event) for event in events]
+        if records:
+            self._writer.write_table(self._pa.Table.from_pylist(records, schema=self.schema))
+            self.count += len(records)
+
+    def close(self) -> None:
+        self._writer.close()
+
+    def __enter__(self) -> "ParquetWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def detach_stdout() -> None:
+    """
+    Point stdout at os.devnull once its reader has gone (`--output jsonl |
+    head`), so flushing what is still buffered cannot raise BrokenPipeError
+    again at exit
+    """
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    try:
+        os.dup2(devnull, sys.stdout.fileno())
+    finally:
+        os.close(devnull)
+
+
+TEXT_WRITERS = {"json": JsonWriter, "jsonl": JsonLinesWriter, "csv": CsvWriter}
+
+
+def open_writer(output_format: str, path: Optional[str] = None) -> Any:
+    """
+    Create the writer for a format, targeting `path` or stdout. Parquet
+    needs a file path since it cannot be streamed to a pipe.
+    """
+    if output_format == "parquet":
+        if not path:
+            raise ValueError("parquet output needs --output-file")
+        return ParquetWriter(path)
+    writer_class = TEXT_WRITERS[output_format]
+    if path:
+        return writer_class(open(path, "w", encoding="utf-8", newline=""), owns_stream=True)
+    return writer_class(sys.stdout)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Adaptive Rate Limiter
+Token bucket shared by Health API call sites that learns the sustainable rate
+from throttling responses
+"""
+
+import random
+import threading
+import time
+from typing import Any, Callable, Iterable, NamedTuple, Optional
+
+# Starting request rate (calls/second) before any throttling is observed
+DEFAULT_RATE = 10.0
+MIN_RATE = 0.5
+MAX_RATE = 50.0
+
+# Calls allowed back-to-back when the bucket is full
+DEFAULT_BURST = 10.0
+
+# Additive increase per successful call, multiplicative decrease per throttle
+RATE_INCREASE = 0.1
+RATE_DECREASE = 0.5
+
+# Throttles within this many seconds of a decrease count as the same signal,
+# so a burst of concurrent throttles does not collapse the rate
+DECREASE_COOLDOWN = 1.0
+
+THROTTLE_CODES = frozenset(
+    {
+        "Throttling",
+        "ThrottlingException",
+        "ThrottledException",
+        "TooManyRequestsException",
+        "RequestLimitExceeded",
+        "RequestThrottled",
+        "RequestThrottledException",
+    }
+)
+
+
+class RateLimitStats(NamedTuple):
+    """Counters reported in the run summary"""
+
+    calls: int
+    throttles: int
+    wait_time: float
+    rate: float
+
+
+class AdaptiveRateLimiter:
+    """
+    Thread-safe token bucket with AIMD rate control. Callers reserve a token
+    and sleep outside the lock, so waiting threads are released in order.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: float = DEFAULT_BURST,
+        min_rate: float = MIN_RATE,
+        max_rate: float = MAX_RATE,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = burst
+        self._updated = clock()
+        self._last_decrease = float("-inf")
+        self.calls = 0
+        self.throttles = 0
+        self.wait_time = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take a token without sleeping; returns the seconds to wait before the call"""
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.calls += 1
+            self.wait_time += wait
+        return wait
+
+    def acquire(self) -> float:
+        """Block until a call may be made; returns the seconds waited"""
+        wait = self.reserve()
+        if wait:
+            self._sleep(wait)
+        return wait
+
+    def on_success(self) -> None:
+        """Probe upwards after a call that was not throttled"""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + RATE_INCREASE)
+
+    def on_throttle(self) -> None:
+        """Back off: cut the rate and push the bucket into debt with jitter"""
+        with self._lock:
+            now = self._clock()
+            self.throttles += 1
+            if now - self._last_decrease < DECREASE_COOLDOWN:
+                return
+            self._last_decrease = now
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate * RATE_DECREASE)
+            self._tokens = min(self._tokens, 0.0) - random.uniform(0.0, 1.0)
+
+    def stats(self) -> RateLimitStats:
+        with self._lock:
+            return RateLimitStats(self.calls, self.throttles, self.wait_time, self.rate)
+
+    def attach(self, client: Any) -> Any:
+        """
+        Pace every HTTP attempt of a boto3/botocore client (retries included)
+        and feed throttling responses back into the rate
+        """
+        service_id = client.meta.service_model.service_id.hyphenize()
+        client.meta.events.register(f"before-send.{service_id}", self._before_send)
+        client.meta.events.register(f"needs-retry.{service_id}", self._after_attempt)
+        return client
+
+    def attach_async(self, client: Any) -> Any:
+        """
+        Same as attach for an aiobotocore client, whose event hooks may be
+        coroutines: waiting for a token suspends the task, not the loop
+        """
+        service_id = client.meta.service_model.service_id.hyphenize()
+        client.meta.events.register(f"before-send.{service_id}", self._before_send_async)
+        client.meta.events.register(f"needs-retry.{service_id}", self._after_attempt)
+        return client
+
+    def _before_send(self, **kwargs: Any) -> None:
+        self.acquire()
+
+    async def _before_send_async(self, **kwargs: Any) -> None:
+        import asyncio
+
+        wait = self.reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+    def _after_attempt(
+        self, response: Optional[tuple] = None, caught_exception: Any = None, **kwargs: Any
+    ) -> None:
+        # Observe only: returning None leaves the retry decision to botocore
+        if response is None:
+            return
+        http_response, parsed = response
+        code = (parsed or {}).get("Error", {}).get("Code")
+        if code in THROTTLE_CODES or http_response.status_code == 429:
+            self.on_throttle()
+        elif http_response.status_code < 400:
+            self.on_success()
+
+
+def combine_stats(limiters: Iterable[AdaptiveRateLimiter]) -> RateLimitStats:
+    """Sum counters across limiters (e.g. one per account); rate is the total"""
+    calls = throttles = 0
+    wait_time = rate = 0.0
+    for limiter in limiters:
+        stats = limiter.stats()
+        calls += stats.calls
+        throttles += stats.throttles
+        wait_time += stats.wait_time
+        rate += stats.rate
+    return RateLimitStats(calls, throttles, wait_time, rate)
@@ -12,7 +12,9 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/yourusername/aws-sla-hunter",
-    py_modules=["main"],
+    py_modules=["main", "auth_handler", "enrichment", "event_cache", "organization", "multi_account", "affected_entities", "clients", "terminal", "async_engine", "rate_limiter", "health_event", "normalization", "sla_rules", "cost_report", "output_writers", "live_view", "health_endpoint", "watch", "instrumentation", "metrics_exporter", "sharding", "event_filters", "correlation"],
+    # py_modules cannot carry package_data; normalization.py also looks here
+    data_files=[("share/aws-sla-hunter", ["service_catalog.json"])],
     classifiers=[
         "Development Status :: 4 - Beta",
         "Programming Language :: Python :: 3",
@@ -37,6 +39,15 @@ setup(
         "rich>=13.0.0",
     ],
     extras_require={
+        "async": [
+            "aiobotocore>=2.5.0",
+        ],
+        "cur": [
+            "pyarrow>=10.0",
+        ],
+        "parquet": [
+            "pyarrow>=10.0",
+        ],
         "dev": [
             "pytest>=7.0",
             "pytest-cov>=4.0",
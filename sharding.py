@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Time-Window Sharding
+Splits a scan window into sub-ranges whose pages are fetched concurrently,
+and parses the --since/--until bounds
+"""
+
+import queue
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# How far back the Health API keeps events; older history only exists in the cache
+HEALTH_RETENTION = timedelta(days=90)
+
+# Sub-ranges fetched in parallel by default; every shard is its own
+# nextToken chain, paced by the shared rate limiter
+DEFAULT_SHARDS = 4
+
+MAX_SHARDS = 16
+
+# Narrower shards would mostly return empty pages
+MIN_SHARD_SPAN = timedelta(days=1)
+
+# Pages buffered ahead of the consumer across all shards
+SHARD_PREFETCH_DEPTH = 4
+
+# Seconds a blocked producer waits before re-checking for cancellation
+_PUT_TIMEOUT = 0.1
+
+# "30d", "12h" or "45m" before now
+RELATIVE_BOUND = re.compile(r"^(\d+)([dhm])$")
+RELATIVE_UNITS = {"d": "days", "h": "hours", "m": "minutes"}
+
+Page = List[Dict[str, Any]]
+
+
+def parse_time_bound(value: str, now: Optional[datetime] = None) -> datetime:
+    """
+    Parse a --since/--until value: an ISO-8601 date or datetime, or a
+    relative "30d" / "12h" / "45m". Returns a naive UTC datetime, like the
+    rest of the scan window.
+    """
+    text = value.strip()
+    match = RELATIVE_BOUND.match(text)
+    if match:
+        amount, unit = match.groups()
+        return (now or datetime.utcnow()) - timedelta(**{RELATIVE_UNITS[unit]: int(amount)})
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        raise ValueError(
+            f"invalid time {value!r}: use YYYY-MM-DD, an ISO-8601 datetime or e.g. 30d"
+        ) from None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def split_window(
+    start: datetime, end: datetime, shards: int, min_span: timedelta = MIN_SHARD_SPAN
+) -> List[Tuple[datetime, datetime]]:
+    """
+    Split [start, end] into at most `shards` contiguous, equal sub-ranges of
+    at least `min_span` each. Adjacent ranges share their boundary; callers
+    deduplicate the events that match both.
+    """
+    if end <= start or shards <= 1:
+        return [(start, end)]
+    count = max(1, min(shards, int((end - start) / min_span)))
+    step = (end - start) / count
+    bounds = [start + step * n for n in range(count)] + [end]
+    return list(zip(bounds, bounds[1:]))
+
+
+def iter_sharded_pages(
+    sources: Sequence[Iterable[Page]],
+    depth: int = SHARD_PREFETCH_DEPTH,
+    key: Callable[[Dict[str, Any]], Any] = lambda event: event["arn"],
+) -> Iterator[Page]:
+    """
+    Pull every source on its own thread and yield pages as they arrive,
+    dropping events another shard already yielded. At most `depth` pages
+    are buffered; the first error raised by a source is re-raised here.
+    """
+    buffer: "queue.Queue" = queue.Queue(maxsize=max(1, depth))
+    done = object()
+    stop = threading.Event()
+
+    def put(item: Any) -> None:
+        # Never block for good: the consumer may have stopped reading
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=_PUT_TIMEOUT)
+                return
+            except queue.Full:
+                continue
+
+    def produce(pages: Iterable[Page]) -> None:
+        try:
+            for page in pages:
+                if stop.is_set():
+                    return
+                put(page)
+            put(done)
+        except BaseException as e:  # propagate to consumer thread
+            put(e)
+
+    for n, pages in enumerate(sources):
+        threading.Thread(
+            target=produce, args=(pages,), name=f"health-shard-{n}", daemon=True
+        ).start()
+
+    seen = set()
+    remaining = len(sources)
+    try:
+        while remaining:
+            item = buffer.get()
+            if item is done:
+                remaining -= 1
+                continue
+            if isinstance(item, BaseException):
+                raise item
+            page = []
+            for event in item:
+                event_key = key(event)
+                if event_key not in seen:
+                    seen.add(event_key)
+                    page.append(event)
+            if page:
+                yield page
+    finally:
+        stop.set()
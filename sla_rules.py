@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+SLA Eligibility Engine
+Per-service SLA commitments and the monthly credits implied by Health event downtime
+"""
+
+import calendar
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from event_cache import to_timestamp
+from health_event import HealthEvent
+from normalization import normalize_service
+
+
+class CreditTier(NamedTuple):
+    """Credit owed when monthly uptime falls below `below` percent"""
+
+    below: float
+    credit: float
+
+
+class SlaRule(NamedTuple):
+    """Monthly uptime commitment for a service and its credit tiers"""
+
+    service: str
+    commitment: float
+    # Ordered from the smallest credit to the largest
+    tiers: Tuple[CreditTier, ...]
+
+
+def _tiers(commitment: float, middle: float) -> Tuple[CreditTier, ...]:
+    return (
+        CreditTier(commitment, 10.0),
+        CreditTier(99.0, middle),
+        CreditTier(95.0, 100.0),
+    )
+
+
+# Published region-level SLAs, keyed by the display name from normalize_service
+SLA_RULES: Dict[str, SlaRule] = {
+    rule.service: rule
+    for rule in (
+        SlaRule("EC2", 99.99, _tiers(99.99, 30.0)),
+        SlaRule("RDS", 99.95, _tiers(99.95, 25.0)),
+        SlaRule("ELB", 99.99, _tiers(99.99, 25.0)),
+        SlaRule("S3", 99.9, _tiers(99.9, 25.0)),
+        SlaRule("DynamoDB", 99.99, _tiers(99.99, 25.0)),
+        SlaRule("Lambda", 99.95, _tiers(99.95, 25.0)),
+        SlaRule("CloudFront", 99.9, _tiers(99.9, 25.0)),
+    )
+}
+
+# Downtime is tracked separately per (account, service, region)
+CreditKey = Tuple[Optional[str], str, str]
+
+# (start, end, event ARNs) with POSIX-second bounds
+Interval = Tuple[float, float, Tuple[str, ...]]
+
+
+class MonthlyCredit(NamedTuple):
+    """Downtime and credit for one account/service/region in one month"""
+
+    account_id: Optional[str]
+    service: str
+    region: str
+    month: str
+    downtime_seconds: float
+    uptime_percent: float
+    credit_percent: float
+    event_arns: Tuple[str, ...]
+
+
+def credit_for_uptime(rule: SlaRule, uptime_percent: float) -> float:
+    """Credit percentage owed for a month at the given uptime"""
+    credit = 0.0
+    for tier in rule.tiers:
+        if uptime_percent < tier.below:
+            credit = tier.credit
+    return credit
+
+
+def collect_intervals(
+    events: Iterable[HealthEvent], now: Optional[datetime] = None
+) -> Dict[CreditKey, List[Interval]]:
+    """
+    Group downtime intervals by (account, service, region) for services with
+    an SLA rule. Events still open are counted up to `now`.
+    """
+    now_ts = to_timestamp(now or datetime.now(timezone.utc))
+    grouped: Dict[CreditKey, List[Interval]] = {}
+    for event in events:
+        if event.start_time is None or (
+            event.event_type_category and event.event_type_category != "issue"
+        ):
+            continue
+        service = normalize_service(event.service)
+        if service not in SLA_RULES:
+            continue
+        start = to_timestamp(event.start_time)
+        end = to_timestamp(event.end_time) if event.end_time else now_ts
+        if end <= start:
+            continue
+        key = (event.account_id, service, event.region or "global")
+        grouped.setdefault(key, []).append((start, end, (event.arn,)))
+    return grouped
+
+
+def merge_intervals(intervals: List[Interval]) -> List[Interval]:
+    """Merge overlapping intervals with one sort and a single sweep"""
+    merged: List[Interval] = []
+    for start, end, arns in sorted(intervals, key=lambda interval: interval[0]):
+        if merged and start <= merged[-1][1]:
+            last_start, last_end, last_arns = merged[-1]
+            merged[-1] = (last_start, max(last_end, end), last_arns + arns)
+        else:
+            merged.append((start, end, arns))
+    return merged
+
+
+@lru_cache(maxsize=None)
+def _month_span(year: int, month: int) -> Tuple[str, float, float]:
+    days = calendar.monthrange(year, month)[1]
+    month_start = calendar.timegm((year, month, 1, 0, 0, 0))
+    return f"{year:04d}-{month:02d}", float(month_start), float(month_start + days * 86400)
+
+
+def _month_bounds(ts: float) -> Tuple[str, float, float]:
+    moment = time.gmtime(ts)
+    return _month_span(moment.tm_year, moment.tm_mon)
+
+
+def split_by_month(start: float, end: float) -> Iterator[Tuple[str, float, float]]:
+    """Yield (YYYY-MM, seconds in that month, seconds in the month) for an interval"""
+    while start < end:
+        month, month_start, month_end = _month_bounds(start)
+        yield month, min(end, month_end) - start, month_end - month_start
+        start = month_end
+
+
+def evaluate_credits(
+    events: Iterable[HealthEvent], now: Optional[datetime] = None
+) -> List[MonthlyCredit]:
+    """
+    Compute monthly uptime and credit percentage for every account, service,
+    region and month touched by an event, sorted by month then credit
+    """
+    credits: List[MonthlyCredit] = []
+    for key, intervals in collect_intervals(events, now).items():
+        account_id, service, region = key
+        rule = SLA_RULES[service]
+        months: Dict[str, List] = {}
+        for start, end, arns in merge_intervals(intervals):
+            for month, seconds, month_seconds in split_by_month(start, end):
+                entry = months.setdefault(month, [0.0, month_seconds, []])
+                entry[0] += seconds
+                entry[2].extend(arns)
+        for month, (downtime, month_seconds, arns) in months.items():
+            uptime = 100.0 * (1.0 - downtime / month_seconds)
+            credits.append(
+                MonthlyCredit(
+                    account_id,
+                    service,
+                    region,
+                    month,
+                    downtime,
+                    uptime,
+                    credit_for_uptime(rule, uptime),
+                    tuple(dict.fromkeys(arns)),
+                )
+            )
+    credits.sort(key=lambda c: (c.month, -c.credit_percent, c.service, c.region))
+    return credits
+
+
+def eligible_credits(credits: Iterable[MonthlyCredit]) -> List[MonthlyCredit]:
+    """Only the months that earned a credit"""
+    return [credit for credit in credits if credit.credit_percent > 0]
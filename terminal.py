@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Shared Terminal Console
+The rich Console is only created (and rich imported) on first use
+"""
+
+import os
+import sys
+from typing import Any, Dict
+
+
+class LazyConsole:
+    """Proxy that builds the rich Console the first time it is used"""
+
+    def __init__(self):
+        self._console = None
+        self._options: Dict[str, Any] = {}
+
+    def configure(self, **options: Any) -> None:
+        """Set rich Console options (e.g. stderr=True); takes effect on next use"""
+        self._options = options
+        self._console = None
+
+    def get(self) -> Any:
+        """Return the underlying rich Console, creating it if needed"""
+        if self._console is None:
+            from rich.console import Console
+
+            # Fix for Windows encoding issues with emojis
+            if sys.platform == "win32":
+                os.environ["PYTHONIOENCODING"] = "utf-8"
+                self._console = Console(
+                    force_terminal=True, legacy_windows=False, **self._options
+                )
+            else:
+                self._console = Console(**self._options)
+        return self._console
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get(), name)
+
+
+console = LazyConsole()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Unit tests for affected entity resolution
+"""
+
+import sys
+from io import StringIO
+from unittest import TestCase, main
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+
+from affected_entities import ENTITIES_KEY, attach_affected_entities, entity_count
+from fake_health import make_api_events
+
+
+def paged_entities(per_event):
+    """Fake describe_affected_entities returning `per_event` entities in pages of 100"""
+
+    def describe_affected_entities(filter, maxResults, nextToken=None):
+        arns = filter["eventArns"]
+        total = len(arns) * per_event
+        offset = int(nextToken or 0)
+        response = {
+            "entities": [
+                {
+                    "eventArn": arns[i // per_event],
+                    "entityValue": f"i-{i % per_event:08x}",
+                    "entityArn": f"ent/{i}",
+                }
+                for i in range(offset, min(offset + maxResults, total))
+            ]
+        }
+        if offset + maxResults < total:
+            response["nextToken"] = str(offset + maxResults)
+        return response
+
+    return describe_affected_entities
+
+
+class TestAffectedEntities(TestCase):
+    """Test cases for attach_affected_entities"""
+
+    def test_batches_and_pagination(self):
+        """Events are batched 10 per request and every page is followed"""
+        health = MagicMock()
+        health.describe_affected_entities.side_effect = paged_entities(per_event=25)
+
+        events = attach_affected_entities(health, make_api_events(35))
+
+        self.assertTrue(all(entity_count(e) == 25 for e in events))
+        for call in health.describe_affected_entities.call_args_list:
+            self.assertLessEqual(len(call.kwargs["filter"]["eventArns"]), 10)
+            self.assertEqual(call.kwargs["maxResults"], 100)
+
+    def test_large_entity_lists_are_compact(self):
+        """Tens of thousands of entities are kept as a tuple of strings"""
+        health = MagicMock()
+        health.describe_affected_entities.side_effect = paged_entities(per_event=20000)
+
+        event = attach_affected_entities(health, make_api_events(1))[0]
+
+        self.assertIsInstance(event[ENTITIES_KEY], tuple)
+        self.assertEqual(len(event[ENTITIES_KEY]), 20000)
+        self.assertTrue(all(isinstance(v, str) for v in event[ENTITIES_KEY]))
+        self.assertEqual(health.describe_affected_entities.call_count, 200)
+
+    def test_events_without_entities(self):
+        """Events with no entities get an empty tuple, not a missing key"""
+        health = MagicMock()
+        health.describe_affected_entities.return_value = {"entities": []}
+
+        events = attach_affected_entities(health, make_api_events(3))
+
+        self.assertEqual([entity_count(e) for e in events], [0, 0, 0])
+        self.assertIsNone(entity_count({"arn": "x"}))
+
+    def test_organization_entities_matched_per_account(self):
+        """Organization rows are matched on (event ARN, account ID)"""
+        health = MagicMock()
+        arn = make_api_events(1)[0]["arn"]
+        rows = [dict(arn=arn, awsAccountId="111111111111"), dict(arn=arn, awsAccountId="222222222222")]
+        health.describe_affected_entities_for_organization.return_value = {
+            "entities": [
+                {"eventArn": arn, "awsAccountId": "111111111111", "entityValue": "i-1"},
+                {"eventArn": arn, "awsAccountId": "111111111111", "entityValue": "i-2"},
+                {"eventArn": arn, "awsAccountId": "222222222222", "entityValue": "db-1"},
+            ]
+        }
+
+        attach_affected_entities(health, rows, organization=True)
+
+        self.assertEqual(rows[0][ENTITIES_KEY], ("i-1", "i-2"))
+        self.assertEqual(rows[1][ENTITIES_KEY], ("db-1",))
+        filters = health.describe_affected_entities_for_organization.call_args.kwargs[
+            "organizationEntityFilters"
+        ]
+        self.assertEqual(len(filters), 2)
+
+    @patch("affected_entities._warned", False)
+    def test_denied_lookup_leaves_entities_unknown(self):
+        """AccessDenied or throttling skips entities with one warning; the fetch goes on"""
+        from main import fetch_health_events
+
+        health = MagicMock()
+        health.describe_events.return_value = {"events": make_api_events(25)}
+        health.describe_event_details.return_value = {"successfulSet": []}
+        health.describe_affected_entities.side_effect = ClientError(
+            {"Error": {"Code": "AccessDeniedException", "Message": "no"}},
+            "DescribeAffectedEntities",
+        )
+
+        old_stdout = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            with patch("main.get_client", return_value=health):
+                events = fetch_health_events(resolve_entities=True)
+            output = sys.stdout.getvalue()
+        finally:
+            sys.stdout = old_stdout
+
+        self.assertEqual(len(events), 25)
+        self.assertTrue(all(event.entities is None for event in events))
+        self.assertEqual(output.count("Affected entities unavailable"), 1)
+
+        health.describe_affected_entities.side_effect = ClientError(
+            {"Error": {"Code": "ValidationException", "Message": "bad"}},
+            "DescribeAffectedEntities",
+        )
+        with self.assertRaises(ClientError):
+            attach_affected_entities(health, make_api_events(1))
+
+    def test_display_results_entities_column(self):
+        """display_results shows an Entities column once entities are resolved"""
+        from health_event import to_health_events
+        from main import display_results
+
+        events = make_api_events(1)
+        events[0][ENTITIES_KEY] = tuple(f"i-{n}" for n in range(1234))
+        events = to_health_events(events)
+
+        old_stdout = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            display_results(events)
+            output = sys.stdout.getvalue()
+        finally:
+            sys.stdout = old_stdout
+
+        self.assertIn("Entities", output)
+        self.assertIn("1,234", output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the asyncio fetch engine against an in-process fake Health API
+"""
+
+import asyncio
+import copy
+import sys
+from datetime import datetime
+from io import StringIO
+from unittest import TestCase, main, skipIf
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+
+from affected_entities import ENTITIES_KEY
+from async_engine import OperationLimiter, fetch_events_async
+from fake_health import make_api_events
+
+try:
+    import aiobotocore  # noqa: F401
+
+    HAS_AIOBOTOCORE = True
+except ImportError:
+    HAS_AIOBOTOCORE = False
+
+
+class FakeAsyncHealth:
+    """Async stand-in for an aiobotocore Health client with injectable latency"""
+
+    def __init__(
+        self, events, page_size=100, latency=0.001, fail_details=False, entities_error=None
+    ):
+        self.events = events
+        self.page_size = page_size
+        self.latency = latency
+        self.fail_details = fail_details
+        self.entities_error = entities_error
+        self.in_flight = {}
+        self.peak = {}
+        self.calls = {}
+        self.cancelled = 0
+
+    async def _enter(self, operation):
+        self.calls[operation] = self.calls.get(operation, 0) + 1
+        self.in_flight[operation] = self.in_flight.get(operation, 0) + 1
+        self.peak[operation] = max(self.peak.get(operation, 0), self.in_flight[operation])
+        try:
+            await asyncio.sleep(self.latency)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight[operation] -= 1
+
+    async def describe_events(self, filter, maxResults, nextToken=None):
+        await self._enter("describe_events")
+        offset = int(nextToken or 0)
+        response = {"events": copy.deepcopy(self.events[offset:offset + maxResults])}
+        if offset + maxResults < len(self.events):
+            response["nextToken"] = str(offset + maxResults)
+        return response
+
+    async def describe_event_details(self, eventArns):
+        await self._enter("describe_event_details")
+        if self.fail_details and eventArns[0].endswith("_0"):
+            raise RuntimeError("boom")
+        return {
+            "successfulSet": [
+                {"event": {"arn": arn}, "eventDescription": {"latestDescription": arn[-4:]}}
+                for arn in eventArns
+            ]
+        }
+
+    async def describe_affected_entities(self, filter, maxResults, nextToken=None):
+        await self._enter("describe_affected_entities")
+        if self.entities_error:
+            raise ClientError(
+                {"Error": {"Code": self.entities_error, "Message": "no"}},
+                "DescribeAffectedEntities",
+            )
+        return {
+            "entities": [
+                {"eventArn": arn, "entityValue": f"i-{arn[-2:]}"} for arn in filter["eventArns"]
+            ]
+        }
+
+
+class TestAsyncEngine(TestCase):
+    """Test cases for fetch_events_async"""
+
+    def test_full_pipeline(self):
+        """Every page is fetched, enriched and resolved in API order"""
+        health = FakeAsyncHealth(make_api_events(350))
+
+        events = asyncio.run(fetch_events_async(health, {}, resolve_entities=True))
+
+        self.assertEqual([e["arn"] for e in events], [e["arn"] for e in make_api_events(350)])
+        self.assertTrue(all(e["description"] == e["arn"][-4:] for e in events))
+        self.assertTrue(all(len(e[ENTITIES_KEY]) == 1 for e in events))
+        self.assertEqual(health.calls["describe_events"], 4)
+        self.assertEqual(health.calls["describe_event_details"], 35)
+
+    def test_matches_threaded_pipeline(self):
+        """The async engine returns the same event dicts as the threaded one"""
+        from main import iter_health_events
+
+        async_events = asyncio.run(
+            fetch_events_async(FakeAsyncHealth(make_api_events(120)), {}, resolve_entities=True)
+        )
+
+        sync_health = MagicMock()
+        sync_health.describe_events.side_effect = [
+            {"events": make_api_events(120)[:100], "nextToken": "100"},
+            {"events": make_api_events(120)[100:]},
+        ]
+        sync_health.describe_event_details.side_effect = lambda eventArns: {
+            "successfulSet": [
+                {"event": {"arn": a}, "eventDescription": {"latestDescription": a[-4:]}}
+                for a in eventArns
+            ]
+        }
+        sync_health.describe_affected_entities.side_effect = lambda filter, maxResults: {
+            "entities": [
+                {"eventArn": a, "entityValue": f"i-{a[-2:]}"} for a in filter["eventArns"]
+            ]
+        }
+        sync_events = [
+            e
+            for page in iter_health_events(
+                sync_health, datetime(2024, 1, 1), datetime(2024, 3, 1), resolve_entities=True
+            )
+            for e in page
+        ]
+
+        self.assertEqual(async_events, sync_events)
+
+    def test_semaphores_bound_concurrency(self):
+        """In-flight calls per operation never exceed the configured limit"""
+        health = FakeAsyncHealth(make_api_events(500), latency=0.005)
+        limiter = OperationLimiter({"describe_event_details": 3, "describe_affected_entities": 2})
+
+        asyncio.run(fetch_events_async(health, {}, resolve_entities=True, limiter=limiter))
+
+        self.assertEqual(health.peak["describe_event_details"], 3)
+        self.assertEqual(health.peak["describe_affected_entities"], 2)
+
+    def test_failure_cancels_outstanding_work(self):
+        """An error in one batch cancels the others and propagates"""
+        health = FakeAsyncHealth(make_api_events(300), latency=0.01, fail_details=True)
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(fetch_events_async(health, {}))
+
+        self.assertGreater(health.cancelled, 0)
+        self.assertTrue(all(count == 0 for count in health.in_flight.values()))
+
+    @patch("affected_entities._warned", False)
+    def test_denied_entities_are_skipped(self):
+        """AccessDenied on entity batches leaves entities unknown, like the threaded path"""
+        health = FakeAsyncHealth(make_api_events(25), entities_error="AccessDeniedException")
+
+        old_stdout = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            events = asyncio.run(fetch_events_async(health, {}, resolve_entities=True))
+            output = sys.stdout.getvalue()
+        finally:
+            sys.stdout = old_stdout
+
+        self.assertEqual(len(events), 25)
+        self.assertTrue(all(e[ENTITIES_KEY] is None for e in events))
+        self.assertTrue(all(e["description"] for e in events))
+        self.assertEqual(output.count("Affected entities unavailable"), 1)
+
+        health = FakeAsyncHealth(make_api_events(5), entities_error="InternalFailure")
+        with self.assertRaises(ClientError):
+            asyncio.run(fetch_events_async(health, {}, resolve_entities=True))
+
+    def test_aiobotocore_client_is_traced(self):
+        """The async client feeds the tracer's API counters like the threaded clients"""
+        import async_engine
+
+        client = MagicMock()
+        client.meta.service_model.service_id.hyphenize.return_value = "health"
+
+        class ClientContext:
+            async def __aenter__(self):
+                return client
+
+            async def __aexit__(self, *exc):
+                return False
+
+        session = MagicMock()
+        session.create_client.return_value = ClientContext()
+        aiobotocore_session = MagicMock(get_session=MagicMock(return_value=session))
+
+        async def fetch(*args):
+            return []
+
+        with patch.dict(sys.modules, {"aiobotocore.session": aiobotocore_session}), patch(
+            "async_engine.fetch_events_async", side_effect=fetch
+        ), patch("async_engine.tracer") as mock_tracer:
+            asyncio.run(async_engine._fetch_with_aiobotocore({}, False, "us-east-1", None))
+
+        mock_tracer.attach.assert_called_once_with(client)
+
+    @skipIf(HAS_AIOBOTOCORE, "aiobotocore is installed")
+    def test_missing_dependency_hint(self):
+        """Without aiobotocore the sync entry point explains how to install it"""
+        from async_engine import fetch_health_events_async
+
+        with self.assertRaises(ImportError) as ctx:
+            fetch_health_events_async({})
+        self.assertIn("pip install", str(ctx.exception))
+
+
+if __name__ == "__main__":
+    main()
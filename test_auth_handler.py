@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Unit tests for credential detection in auth_handler
+"""
+
+from unittest import TestCase, main
+from unittest.mock import MagicMock, patch
+
+from auth_handler import AuthMethod, AWSAuthHandler
+from clients import ClientFactory
+
+
+def fake_session(method):
+    session = MagicMock()
+    if method is None:
+        session.get_credentials.return_value = None
+    else:
+        session.get_credentials.return_value = MagicMock(method=method)
+    session.client.return_value.get_caller_identity.return_value = {
+        "Account": "123456789012",
+        "Arn": "arn:aws:iam::123456789012:user/hunter",
+    }
+    return session
+
+
+class TestCredentialDetection(TestCase):
+    """Test cases for AWSAuthHandler.detect_credentials"""
+
+    def test_method_from_credential_provider(self):
+        """The auth method comes from botocore's resolved provider"""
+        cases = {
+            "env": AuthMethod.ENV_VARS,
+            "shared-credentials-file": AuthMethod.AWS_CREDENTIALS_FILE,
+            "sso": AuthMethod.AWS_SSO,
+            "iam-role": AuthMethod.IAM_ROLE,
+            "container-role": AuthMethod.IAM_ROLE,
+            "assume-role": AuthMethod.ASSUME_ROLE,
+            "something-new": AuthMethod.UNKNOWN,
+        }
+        for provider, expected in cases.items():
+            handler = AWSAuthHandler(ClientFactory(fake_session(provider)))
+            self.assertEqual(handler.detect_credentials(), (True, expected))
+
+    def test_no_credentials(self):
+        """No resolved credentials means no STS call at all"""
+        session = fake_session(None)
+        handler = AWSAuthHandler(ClientFactory(session))
+
+        self.assertEqual(handler.detect_credentials(), (False, None))
+        session.client.assert_not_called()
+
+    @patch("urllib.request.urlopen")
+    def test_no_metadata_probe(self, mock_urlopen):
+        """Detection never probes the EC2 instance metadata endpoint"""
+        handler = AWSAuthHandler(ClientFactory(fake_session("shared-credentials-file")))
+        handler.detect_credentials()
+        mock_urlopen.assert_not_called()
+
+    def test_identity_resolved_once(self):
+        """A shared identity skips STS; otherwise STS is called only once"""
+        session = fake_session("env")
+        handler = AWSAuthHandler(ClientFactory(session), identity={"Account": "111111111111"})
+        handler.detect_credentials()
+        handler.get_identity()
+        session.client.assert_not_called()
+
+        handler = AWSAuthHandler(ClientFactory(session))
+        handler.detect_credentials()
+        handler.get_identity()
+        sts = session.client.return_value
+        self.assertEqual(sts.get_caller_identity.call_count, 1)
+
+
+class TestGetCredentials(TestCase):
+    """Test cases for main.get_credentials sharing the identity"""
+
+    @patch("main.caller_identity", None)
+    @patch("main.AWSAuthHandler")
+    @patch("main.get_client")
+    def test_single_sts_call(self, mock_boto_client, mock_handler):
+        """get_credentials calls STS once and hands the identity to the handler"""
+        import main as hunter
+
+        sts = MagicMock()
+        sts.get_caller_identity.return_value = {"Account": "123456789012"}
+        mock_boto_client.return_value = sts
+        mock_handler.return_value.resolve_auth_method.return_value = AuthMethod.ENV_VARS
+
+        self.assertTrue(hunter.get_credentials())
+
+        sts.get_caller_identity.assert_called_once()
+        mock_handler.assert_called_once_with(identity={"Account": "123456789012"})
+        mock_handler.return_value.detect_credentials.assert_not_called()
+        self.assertEqual(hunter.caller_identity, {"Account": "123456789012"})
+        self.assertEqual(hunter.caller_account(), "123456789012")
+        self.assertIn("sts:GetCallerIdentity", hunter.startup_timings)
+
+
+if __name__ == "__main__":
+    main()
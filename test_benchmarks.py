@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the synthetic Health backend and the benchmark harness
+"""
+
+import json
+import sys
+from pathlib import Path
+from unittest import TestCase, main
+from unittest.mock import patch
+
+from botocore.exceptions import ClientError
+
+from fake_health import BackendConfig, FakeHealthClient, make_health_events
+from rate_limiter import DEFAULT_RATE, AdaptiveRateLimiter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "benchmarks"))
+
+from bench_hunter import find_regressions, run_benchmarks  # noqa: E402
+
+
+class TestBenchmarks(TestCase):
+    """Test cases for the benchmark suite"""
+
+    def test_fake_backend_pages_and_counts_calls(self):
+        """Page size caps maxResults and every call is counted"""
+        client = FakeHealthClient(make_health_events(250), BackendConfig(page_size=40))
+
+        pages, token = [], None
+        while True:
+            response = client.describe_events(maxResults=100, nextToken=token)
+            pages.append(len(response["events"]))
+            token = response.get("nextToken")
+            if not token:
+                break
+
+        self.assertEqual(pages, [40] * 6 + [10])
+        self.assertEqual(client.calls["DescribeEvents"], 7)
+
+    def test_failure_injection_exercises_retries(self):
+        """Injected failedSet entries are retried by fetch_health_events"""
+        from main import fetch_health_events
+
+        client = FakeHealthClient(make_health_events(200), BackendConfig(failure_rate=0.2))
+        with patch("main.get_client", return_value=client), patch("enrichment.time.sleep"):
+            events = fetch_health_events()
+
+        self.assertEqual(len(events), 200)
+        self.assertGreater(client.failures, 0)
+        self.assertGreater(client.calls["DescribeEventDetails"], 20)
+        self.assertGreater(sum(1 for e in events if e.description), 190)
+
+    def test_throttles_drive_the_rate_limiter(self):
+        """Throttled attempts back the limiter off; a call throttled every time raises"""
+        from main import fetch_health_events
+
+        limiter = AdaptiveRateLimiter(sleep=lambda seconds: None)
+        config = BackendConfig(throttle_rate=1.0, throttle_delay=0.0, max_attempts=3)
+        client = FakeHealthClient(make_health_events(10), config, limiter)
+        with self.assertRaises(ClientError) as ctx:
+            client.describe_events()
+
+        self.assertEqual(ctx.exception.response["Error"]["Code"], "ThrottlingException")
+        self.assertEqual(client.throttles, 3)
+        self.assertEqual(limiter.stats().throttles, 3)
+        self.assertLess(limiter.stats().rate, DEFAULT_RATE)
+
+        limiter = AdaptiveRateLimiter(sleep=lambda seconds: None)
+        config = BackendConfig(throttle_rate=0.3, throttle_delay=0.0)
+        client = FakeHealthClient(make_health_events(200), config, limiter)
+        with patch("main.get_client", return_value=client):
+            events = fetch_health_events()
+
+        self.assertEqual(len(events), 200)
+        self.assertGreater(limiter.stats().throttles, 0)
+        self.assertEqual(limiter.stats().throttles, client.throttles)
+
+    def test_report_is_json(self):
+        """A small run produces one JSON-serializable result per size"""
+        report = run_benchmarks([100, 500], measure_memory=True, repeat=1)
+        report = json.loads(json.dumps(report))
+
+        self.assertEqual([r["events"] for r in report["results"]], [100, 500])
+        result = report["results"][1]
+        self.assertEqual(result["fetched"], 500)
+        self.assertEqual(result["calls_by_operation"]["DescribeEvents"], 5)
+        self.assertGreater(result["peak_memory_mb"], 0)
+
+    def test_find_regressions(self):
+        """Slowdowns beyond the tolerance and the noise floor are reported"""
+        baseline = {"results": [{"events": 100, "fetch_s": 1.0, "render_s": 0.01}]}
+        current = {"results": [{"events": 100, "fetch_s": 1.5, "render_s": 0.03}]}
+
+        regressions = find_regressions(current, baseline, tolerance=0.25)
+
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("fetch_s", regressions[0])
+        self.assertEqual(find_regressions(current, current), [])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared client factory
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase, main
+from unittest.mock import MagicMock
+
+import boto3
+
+from clients import CLIENT_CONFIG_OPTIONS, ClientFactory, get_client_factory, reset_client_factory
+
+
+def make_session():
+    return boto3.Session(
+        aws_access_key_id="testing", aws_secret_access_key="testing", region_name="us-east-1"
+    )
+
+
+class TestClientFactory(TestCase):
+    """Test cases for ClientFactory"""
+
+    def test_clients_are_memoized(self):
+        """Each (service, region, account) gets exactly one client"""
+        factory = ClientFactory(make_session())
+
+        health = factory.client("health", "us-east-1")
+        self.assertIs(factory.client("health", "us-east-1"), health)
+        self.assertIsNot(factory.client("health", "us-east-2"), health)
+        self.assertIsNot(factory.client("sts"), health)
+
+    def test_tuned_config(self):
+        """Clients use the shared pool size, standard retries and timeouts"""
+        health = ClientFactory(make_session()).client("health", "us-east-1")
+
+        config = health.meta.config
+        self.assertEqual(
+            config.max_pool_connections, CLIENT_CONFIG_OPTIONS["max_pool_connections"]
+        )
+        self.assertEqual(config.retries["mode"], "standard")
+        self.assertEqual(config.connect_timeout, CLIENT_CONFIG_OPTIONS["connect_timeout"])
+        self.assertEqual(config.read_timeout, CLIENT_CONFIG_OPTIONS["read_timeout"])
+
+    def test_concurrent_access_creates_one_client(self):
+        """Threads racing for a client all receive the same instance"""
+        session = MagicMock()
+        session.client.side_effect = lambda *args, **kwargs: MagicMock()
+        factory = ClientFactory(session)
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            clients = list(pool.map(lambda _: factory.client("health"), range(200)))
+
+        self.assertEqual(len({id(c) for c in clients}), 1)
+        self.assertEqual(session.client.call_count, 1)
+
+    def test_account_sessions_share_models(self):
+        """Per-account clients use that account's session and the shared loader"""
+        factory = ClientFactory(make_session())
+        account_session = make_session()
+
+        factory.add_account_session("123456789012", account_session)
+        client = factory.client("health", "us-east-1", "123456789012")
+
+        self.assertIsNot(client, factory.client("health", "us-east-1"))
+        self.assertIs(
+            account_session._session.get_component("data_loader"),
+            factory.session._session.get_component("data_loader"),
+        )
+
+    def test_assume_role_registers_credentials(self):
+        """assume_role stores the temporary credentials for the account"""
+        factory = ClientFactory(make_session())
+        sts = MagicMock()
+        sts.assume_role.return_value = {
+            "Credentials": {
+                "AccessKeyId": "ASIAEXAMPLE",
+                "SecretAccessKey": "secret",
+                "SessionToken": "token",
+            }
+        }
+        factory._clients[("sts", "us-east-1", None)] = sts
+
+        factory.assume_role("123456789012", "arn:aws:iam::123456789012:role/R", "test")
+
+        client = factory.client("health", "us-east-1", "123456789012")
+        credentials = client._request_signer._credentials
+        self.assertEqual(credentials.access_key, "ASIAEXAMPLE")
+
+    def test_process_wide_factory(self):
+        """get_client_factory returns one factory until it is reset"""
+        factory = get_client_factory()
+        self.assertIs(get_client_factory(), factory)
+        replacement = reset_client_factory()
+        self.assertIsNot(replacement, factory)
+        self.assertIs(get_client_factory(), replacement)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Unit tests for incident correlation and the --collapse view
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+from unittest import TestCase, main
+from unittest.mock import patch
+
+from correlation import correlate_events
+from fake_health import FakeHealthClient, make_event, make_health_events
+
+
+NOW = datetime(2024, 6, 1, 12, 0)
+
+
+def incident_event(n, start, end=None, **kwargs):
+    return make_event(n, status="open" if end is None else "closed", start=start, end=end, **kwargs)
+
+
+class TestCorrelation(TestCase):
+    """Test cases for correlate_events"""
+
+    def test_overlapping_events_form_one_incident(self):
+        """Overlapping or nearly adjacent events merge across regions and accounts"""
+        base = datetime(2024, 5, 1, 10, 0)
+        events = [
+            incident_event(1, base, base + timedelta(hours=1), account_id="111", entities=("i-1",)),
+            incident_event(
+                2,
+                base + timedelta(minutes=30),
+                base + timedelta(hours=2),
+                region="eu-west-1",
+                account_id="222",
+                entities=("i-1", "i-2"),
+            ),
+            # Starts within the slack after the previous end
+            incident_event(
+                3,
+                base + timedelta(hours=2, minutes=10),
+                base + timedelta(hours=3),
+                region="ap-south-1",
+                account_id="111",
+            ),
+            # Far later: a separate incident
+            incident_event(4, base + timedelta(days=2), base + timedelta(days=2, hours=1)),
+        ]
+
+        incidents = correlate_events(events, now=NOW)
+
+        self.assertEqual([len(incident) for incident in incidents], [1, 3])
+        merged = incidents[1]
+        self.assertEqual(merged.accounts, {"111", "222"})
+        self.assertEqual(merged.regions, {"us-east-1", "eu-west-1", "ap-south-1"})
+        self.assertEqual(merged.entities, {"i-1", "i-2"})
+        self.assertEqual(merged.start_time, base)
+        self.assertEqual(merged.end_time, base + timedelta(hours=3))
+        self.assertFalse(merged.is_open)
+
+    def test_types_and_open_events(self):
+        """Different services or types never merge; open events run until now"""
+        base = datetime(2024, 5, 31, 10, 0)
+        events = [
+            incident_event(1, base),
+            incident_event(2, base + timedelta(hours=1), base + timedelta(hours=2)),
+            incident_event(3, base, service="RDS"),
+            make_event(4, status="open", start_time=None),
+        ]
+
+        incidents = correlate_events(events, now=NOW)
+
+        self.assertEqual(len(incidents), 3)
+        ec2 = next(i for i in incidents if i.service == "EC2" and i.start_time is not None)
+        self.assertEqual(len(ec2), 2)
+        self.assertTrue(ec2.is_open)
+        self.assertIsNone(ec2.end_time)
+        self.assertIsNone(incidents[-1].start_time)
+
+    def test_correlates_100k_events_quickly(self):
+        """Sort-and-sweep handles 100k events in well under the budget"""
+        base = datetime(2024, 3, 1)
+        services = ["EC2", "RDS", "S3", "LAMBDA"]
+        events = [
+            incident_event(
+                n,
+                base + timedelta(minutes=7 * n),
+                base + timedelta(minutes=7 * n + 20),
+                service=services[n % 4],
+                region=f"us-test-{n % 7}",
+                account_id=str(n % 50),
+            )
+            for n in range(100_000)
+        ]
+
+        start = time.perf_counter()
+        incidents = correlate_events(events, now=NOW)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(sum(len(incident) for incident in incidents), 100_000)
+        self.assertLess(elapsed, 5.0)
+
+    def test_window_is_shown_in_utc(self):
+        """Aware datetimes in another zone are converted before formatting"""
+        from main import format_incident_window
+
+        sao_paulo = timezone(timedelta(hours=-3))
+        start = datetime(2024, 5, 1, 19, 13, tzinfo=sao_paulo)
+        incidents = correlate_events(
+            [
+                incident_event(1, start, start + timedelta(hours=1)),
+                incident_event(2, datetime(2024, 5, 1, 22, 13), service="RDS"),
+            ],
+            now=NOW,
+        )
+
+        self.assertEqual(
+            sorted(format_incident_window(incident) for incident in incidents),
+            ["2024-05-01 22:13 → 2024-05-01 23:13", "2024-05-01 22:13 → ongoing"],
+        )
+
+    @patch("main.get_credentials", return_value=True)
+    def test_main_collapse(self, mock_creds):
+        """--collapse renders one row per incident"""
+        from main import main as cli_main
+
+        client = FakeHealthClient(make_health_events(300))
+        old_stdout = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            with patch("main.get_client", return_value=client):
+                result = cli_main(["--no-cache", "--skip-entities", "--collapse"])
+            output = sys.stdout.getvalue()
+        finally:
+            sys.stdout = old_stdout
+
+        self.assertEqual(result, 0)
+        self.assertIn("AWS Health Incidents", output)
+        self.assertIn("from 300 events", output)
+
+
+if __name__ == "__main__":
+    main()
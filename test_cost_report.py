@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Unit tests for CUR ingestion and credit pricing
+"""
+
+import csv
+import gzip
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+from pathlib import Path
+from unittest import TestCase, main, skipIf, skipUnless
+from unittest.mock import patch
+
+from cost_report import (
+    aggregate_csv,
+    estimate_credits,
+    event_estimates,
+    load_monthly_spend,
+    spend_for,
+)
+from sla_rules import MonthlyCredit
+
+try:
+    import pyarrow  # noqa: F401
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+HEADER = [
+    "identity/LineItemId",
+    "lineItem/UsageAccountId",
+    "lineItem/UsageStartDate",
+    "lineItem/ProductCode",
+    "lineItem/UsageType",
+    "lineItem/UnblendedCost",
+    "product/region",
+]
+
+ROWS = [
+    ["1", "111111111111", "2024-03-01T00:00:00Z", "AmazonEC2", "BoxUsage", "100.0", "us-east-1"],
+    ["2", "111111111111", "2024-03-15T00:00:00Z", "AmazonEC2", "BoxUsage", "50.5", "us-east-1"],
+    ["3", "111111111111", "2024-04-01T00:00:00Z", "AmazonEC2", "BoxUsage", "70.0", "us-east-1"],
+    ["4", "222222222222", "2024-03-02T00:00:00Z", "AmazonEC2", "BoxUsage", "25.0", "us-east-1"],
+    ["5", "111111111111", "2024-03-02T00:00:00Z", "AmazonS3", "Requests", "9.5", "eu-west-1"],
+    ["6", "111111111111", "2024-03-02T00:00:00Z", "AmazonCloudFront", "DataTransfer", "", "global"],
+]
+
+
+def write_cur(path, rows=ROWS, header=HEADER, opener=open):
+    with opener(path, "wt", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def make_credit(account_id=None, service="EC2", region="us-east-1", credit=10.0, arns=("a", "b")):
+    return MonthlyCredit(account_id, service, region, "2024-03", 3600.0, 99.5, credit, arns)
+
+
+class TestCostReport(TestCase):
+    """Test cases for the CUR reader"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_aggregate_csv(self):
+        """Costs are summed per account, service, region and month"""
+        path = self.dir / "cur.csv"
+        write_cur(path)
+
+        spend = aggregate_csv(path)
+
+        self.assertEqual(spend[("111111111111", "EC2", "us-east-1", "2024-03")], 150.5)
+        self.assertEqual(spend[("111111111111", "EC2", "us-east-1", "2024-04")], 70.0)
+        self.assertEqual(spend[("111111111111", "S3", "eu-west-1", "2024-03")], 9.5)
+        self.assertEqual(len(spend), 4)
+
+    def test_gzip_and_directory_input(self):
+        """Directories are scanned for .csv.gz parts, which are merged"""
+        write_cur(self.dir / "part-1.csv.gz", ROWS[:2], opener=gzip.open)
+        write_cur(self.dir / "part-2.csv.gz", ROWS[2:], opener=gzip.open)
+
+        spend = load_monthly_spend([str(self.dir)])
+
+        self.assertEqual(spend[("111111111111", "EC2", "us-east-1", "2024-03")], 150.5)
+        self.assertEqual(spend[("222222222222", "EC2", "us-east-1", "2024-03")], 25.0)
+
+    def test_cur2_column_names_without_region(self):
+        """CUR 2.0 headers are accepted; missing region means global"""
+        path = self.dir / "cur2.csv"
+        write_cur(
+            path,
+            [["111111111111", "2024-03-01", "AWSLambda", "3.0"]],
+            header=[
+                "line_item_usage_account_id",
+                "line_item_usage_start_date",
+                "line_item_product_code",
+                "line_item_unblended_cost",
+            ],
+        )
+        self.assertEqual(
+            aggregate_csv(path), {("111111111111", "Lambda", "global", "2024-03"): 3.0}
+        )
+
+    def test_missing_column(self):
+        """Files without a cost column are rejected with a clear error"""
+        path = self.dir / "bad.csv"
+        write_cur(path, [["1"]], header=["identity/LineItemId"])
+        with self.assertRaisesRegex(ValueError, "UsageStartDate"):
+            aggregate_csv(path)
+
+    def test_estimates(self):
+        """Spend is joined by the event's or caller's account, else summed across accounts"""
+        path = self.dir / "cur.csv"
+        write_cur(path)
+        spend = aggregate_csv(path)
+
+        self.assertEqual(spend_for(spend, make_credit("111111111111")), 150.5)
+        self.assertEqual(spend_for(spend, make_credit()), 175.5)
+        self.assertEqual(spend_for(spend, make_credit(), account="222222222222"), 25.0)
+
+        estimates = estimate_credits(
+            [make_credit(), make_credit(service="S3", region="eu-west-1", credit=0.0)], spend
+        )
+        self.assertEqual(len(estimates), 1)
+        self.assertAlmostEqual(estimates[0].amount, 17.55)
+        self.assertEqual(
+            event_estimates(estimates), {("a", None): 8.775, ("b", None): 8.775}
+        )
+
+    def test_large_file_streams(self):
+        """A large file is aggregated without holding its rows in memory"""
+        path = self.dir / "big.csv.gz"
+        with gzip.open(path, "wt", newline="") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(HEADER)
+            for n in range(50000):
+                writer.writerow(
+                    [n, f"{n % 50:012d}", "2024-03-01T00:00:00Z", "AmazonEC2", "Box", "0.5", "us-east-1"]
+                )
+
+        spend = aggregate_csv(path)
+
+        self.assertEqual(len(spend), 50)
+        self.assertAlmostEqual(sum(spend.values()), 25000.0)
+
+    @skipIf(HAS_PYARROW, "pyarrow is installed")
+    def test_parquet_requires_pyarrow(self):
+        """Without pyarrow, Parquet input explains how to install it"""
+        path = self.dir / "cur.parquet"
+        path.write_bytes(b"PAR1")
+        with self.assertRaisesRegex(ImportError, "aws-sla-hunter\\[cur\\]"):
+            load_monthly_spend([str(path)])
+
+    @skipUnless(HAS_PYARROW, "pyarrow is not installed")
+    def test_aggregate_parquet(self):
+        """Parquet files are grouped batch by batch with the same result as CSV"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        columns = list(zip(*ROWS))
+        table = pa.table({name: list(values) for name, values in zip(HEADER, columns)})
+        table = table.set_column(
+            HEADER.index("lineItem/UnblendedCost"),
+            "lineItem/UnblendedCost",
+            pa.array([float(v or 0) for v in columns[5]]),
+        )
+        pq.write_table(table, self.dir / "cur.parquet")
+
+        csv_path = self.dir / "cur.csv"
+        write_cur(csv_path)
+        self.assertEqual(
+            load_monthly_spend([str(self.dir / "cur.parquet")]), aggregate_csv(csv_path)
+        )
+
+    @patch("main.caller_identity", {"Account": "111111111111"})
+    @patch("main.get_credentials", return_value=True)
+    @patch("main.fetch_health_events")
+    def test_main_cur_option(self, mock_fetch, mock_creds):
+        """--cur prices credits against the caller's spend, per month and per event"""
+        from health_event import HealthEvent
+        from main import main as cli_main
+
+        path = self.dir / "cur.csv"
+        write_cur(path)
+        start = datetime(2024, 3, 10, tzinfo=timezone.utc)
+        mock_fetch.return_value = [
+            HealthEvent(
+                "arn:aws:health:us-east-1::event/EC2/AWS_EC2_OPERATIONAL_ISSUE/ID_1",
+                service="EC2",
+                event_type_category="issue",
+                region="us-east-1",
+                start_time=start,
+                end_time=start + timedelta(hours=10),
+            )
+        ]
+
+        old_stdout = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            result = cli_main(["--cur", str(path), "--no-cache"])
+            output = sys.stdout.getvalue()
+        finally:
+            sys.stdout = old_stdout
+
+        self.assertEqual(result, 0)
+        # 30% of the caller's $150.50 EC2 spend in us-east-1 for March, shown
+        # in the events table's Est. Credit column and the recoverable total
+        self.assertIn("Est. Credit", output)
+        self.assertEqual(output.count("$45.15"), 2)
+
+
+if __name__ == "__main__":
+    main()
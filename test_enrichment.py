@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Unit tests for batched describe_event_details enrichment
+"""
+
+import threading
+import time
+from unittest import TestCase, main
+from unittest.mock import MagicMock
+
+from enrichment import DETAILS_BATCH_SIZE, chunked, enrich_events, fetch_details_batch
+from fake_health import make_api_events
+
+
+def details_response(arns, failed=()):
+    return {
+        "successfulSet": [
+            {
+                "event": {"arn": arn},
+                "eventDescription": {"latestDescription": f"desc {arn[-4:]}"},
+            }
+            for arn in arns
+            if arn not in failed
+        ],
+        "failedSet": [
+            {"eventArn": arn, "errorName": "ThrottlingException"} for arn in failed
+        ],
+    }
+
+
+class TestEnrichment(TestCase):
+    """Test cases for the enrichment stage"""
+
+    def test_chunked(self):
+        """Items are split into API-sized batches"""
+        batches = list(chunked(range(25), DETAILS_BATCH_SIZE))
+        self.assertEqual([len(b) for b in batches], [10, 10, 5])
+
+    def test_batches_respect_api_limit(self):
+        """No describe_event_details call exceeds 10 ARNs"""
+        health = MagicMock()
+        health.describe_event_details.side_effect = (
+            lambda eventArns: details_response(eventArns)
+        )
+
+        events = enrich_events(health, make_api_events(95))
+
+        self.assertEqual(health.describe_event_details.call_count, 10)
+        for call in health.describe_event_details.call_args_list:
+            self.assertLessEqual(len(call.kwargs["eventArns"]), DETAILS_BATCH_SIZE)
+        self.assertTrue(all(e["description"].startswith("desc") for e in events))
+
+    def test_failed_set_is_retried(self):
+        """ARNs in failedSet are retried until they succeed"""
+        health = MagicMock()
+        arns = [e["arn"] for e in make_api_events(3)]
+        health.describe_event_details.side_effect = [
+            details_response(arns, failed={arns[1]}),
+            details_response([arns[1]]),
+        ]
+
+        descriptions, failed = fetch_details_batch(health, arns, backoff=0)
+
+        self.assertEqual(set(descriptions), set(arns))
+        self.assertEqual(failed, [])
+        self.assertEqual(
+            health.describe_event_details.call_args.kwargs["eventArns"], [arns[1]]
+        )
+
+    def test_failed_set_gives_up(self):
+        """Persistently failing ARNs are reported after the last attempt"""
+        health = MagicMock()
+        arns = [e["arn"] for e in make_api_events(2)]
+        health.describe_event_details.side_effect = (
+            lambda eventArns: details_response(eventArns, failed=set(eventArns))
+        )
+
+        descriptions, failed = fetch_details_batch(
+            health, arns, max_attempts=3, backoff=0
+        )
+
+        self.assertEqual(descriptions, {})
+        self.assertEqual(len(failed), 2)
+        self.assertEqual(health.describe_event_details.call_count, 3)
+
+    def test_batches_run_concurrently(self):
+        """Batches are dispatched in parallel over the thread pool"""
+        health = MagicMock()
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def slow_details(eventArns):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.pop()
+            return details_response(eventArns)
+
+        health.describe_event_details.side_effect = slow_details
+
+        started = time.perf_counter()
+        enrich_events(health, make_api_events(80), max_workers=8)
+        elapsed = time.perf_counter() - started
+
+        self.assertGreater(max(peak), 1)
+        self.assertLess(elapsed, 8 * 0.05)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the on-disk event cache and incremental sync
+"""
+
+import shutil
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest import TestCase, main
+from unittest.mock import MagicMock, patch
+
+from event_cache import EventCache
+from fake_health import FakeHealthClient, make_api_event, make_health_events
+
+
+class TestEventCache(TestCase):
+    """Test cases for EventCache storage"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.cache = EventCache(Path(self.tmp) / "events.db")
+        self.window = (datetime(2023, 12, 1), datetime(2024, 3, 1))
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.tmp)
+
+    def test_lazy_open(self):
+        """Constructing a cache does not create the database file"""
+        cache = EventCache(Path(self.tmp) / "sub" / "events.db")
+        self.assertFalse(cache.path.exists())
+
+    def test_roundtrip_preserves_datetimes(self):
+        """Stored events come back with datetime fields intact"""
+        event = make_api_event(1)
+        event["description"] = "Increased error rates"
+        self.cache.upsert([event])
+
+        loaded = self.cache.load(*self.window)
+
+        self.assertEqual(len(loaded), 1)
+        self.assertEqual(loaded[0]["startTime"], event["startTime"])
+        self.assertEqual(loaded[0]["description"], "Increased error rates")
+
+    def test_upsert_replaces_by_arn(self):
+        """Re-writing an ARN updates its status instead of duplicating it"""
+        self.cache.upsert([make_api_event(1, status="open")])
+        self.assertEqual(len(self.cache.open_arns()), 1)
+
+        self.cache.upsert([make_api_event(1, status="closed")])
+
+        self.assertEqual(self.cache.open_arns(), [])
+        self.assertEqual(len(self.cache.load(*self.window)), 1)
+
+    def test_watermark_requires_covered_window(self):
+        """A watermark is only used when the earlier sync covered the window"""
+        start, _ = self.window
+        self.assertIsNone(self.cache.get_watermark(start))
+
+        synced = datetime(2024, 3, 1, 12, 0)
+        self.cache.set_watermark(synced, start)
+
+        self.assertEqual(
+            self.cache.get_watermark(start), synced.replace(tzinfo=timezone.utc)
+        )
+        self.assertIsNone(self.cache.get_watermark(start - timedelta(days=1)))
+
+
+class TestIncrementalSync(TestCase):
+    """Test cases for sync_health_events cold and warm runs"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.cache = EventCache(Path(self.tmp) / "events.db")
+        self.start = datetime(2023, 12, 1)
+        self.end = datetime(2024, 3, 1)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.tmp)
+
+    def _health(self, pages):
+        health = MagicMock()
+        health.describe_events.side_effect = pages
+        health.describe_event_details.side_effect = lambda eventArns: {
+            "successfulSet": [
+                {"event": {"arn": arn}, "eventDescription": {"latestDescription": "d"}}
+                for arn in eventArns
+            ]
+        }
+        return health
+
+    def test_cold_then_warm_sync(self):
+        """Warm runs only fetch deltas and re-check open events"""
+        from main import sync_health_events
+
+        events = [make_api_event(i) for i in range(150)] + [make_api_event(150, status="open")]
+        cold = self._health(
+            [{"events": events[:100], "nextToken": "t"}, {"events": events[100:]}]
+        )
+
+        result = sync_health_events(cold, self.cache, self.start, self.end)
+
+        self.assertEqual(len(result), 151)
+        self.assertNotIn("lastUpdatedTimes", cold.describe_events.call_args.kwargs["filter"])
+        self.assertEqual(cold.describe_event_details.call_count, 16)
+
+        # Warm run: one new event, and the open one is re-checked and now closed
+        warm = self._health(
+            [
+                {"events": [make_api_event(200)]},
+                {"events": [make_api_event(150, status="closed")]},
+            ]
+        )
+
+        result = sync_health_events(warm, self.cache, self.start, self.end)
+
+        self.assertEqual(len(result), 152)
+        delta_filter = warm.describe_events.call_args_list[0].kwargs["filter"]
+        self.assertIn("lastUpdatedTimes", delta_filter)
+        recheck_filter = warm.describe_events.call_args_list[1].kwargs["filter"]
+        self.assertEqual(recheck_filter, {"eventArns": [make_api_event(150)["arn"]]})
+        self.assertEqual(warm.describe_event_details.call_count, 1)
+        self.assertEqual(self.cache.open_arns(), [])
+        rechecked = self.cache.get([make_api_event(150)["arn"]])
+        self.assertEqual(rechecked[make_api_event(150)["arn"]]["description"], "d")
+
+    def test_accounts_do_not_share_a_scope(self):
+        """Two accounts synced into one database never see each other's events"""
+        from main import fetch_health_events
+
+        results = {}
+        for account, seed in (("111111111111", 1), ("222222222222", 2)):
+            raw = make_health_events(40, seed=seed)
+            client = FakeHealthClient(raw)
+            with patch("main.get_client", return_value=client):
+                events = fetch_health_events(cache=self.cache, account=account)
+            # Each account's first sync is a cold one, not a delta on the other's
+            self.assertEqual(client.calls["DescribeEvents"], 1)
+            results[account] = (sorted(e["arn"] for e in raw), sorted(e.arn for e in events))
+
+        for expected, fetched in results.values():
+            self.assertEqual(fetched, expected)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Unit tests for filter pushdown and the client-side filter stage
+"""
+
+import shutil
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import TestCase, main
+from unittest.mock import patch
+
+from event_cache import DEFAULT_SCOPE, EventCache
+from event_filters import MAX_FILTER_VALUES, REGION, SERVICE, EventFilter, describe_plan
+from fake_health import REGIONS, FakeHealthClient, make_event, make_health_events
+
+
+class TestEventFilters(TestCase):
+    """Test cases for EventFilter plans"""
+
+    def test_exact_values_are_pushed_down(self):
+        """Plain codes, regions and a single status become API filter fields"""
+        plan = EventFilter(["ec2", "rds"], ["us-east-1"], ["aws_ec2_api_issue"], ["open"]).plan()
+
+        self.assertEqual(plan.api_fields["services"], ["EC2", "RDS"])
+        self.assertEqual(plan.api_fields["regions"], ["us-east-1"])
+        self.assertEqual(plan.api_fields["eventTypeCodes"], ["AWS_EC2_API_ISSUE"])
+        self.assertEqual(plan.api_fields["eventStatusCodes"], ["open"])
+        self.assertNotEqual(plan.cache_scope, DEFAULT_SCOPE)
+        self.assertFalse(EventFilter(statuses=["open", "closed"]).plan())
+
+    def test_unpushable_predicates_run_client_side(self):
+        """Patterns and over-long lists are checked on each event instead"""
+        regions = [f"us-test-{n}" for n in range(MAX_FILTER_VALUES + 1)]
+        plan = EventFilter(services=["ELASTIC*"], regions=regions).plan()
+
+        self.assertEqual(plan.api_fields, {})
+        self.assertEqual(plan.cache_scope, DEFAULT_SCOPE)
+        kept = plan.apply(
+            [
+                make_event(0, "ELASTICLOADBALANCING", "us-test-3"),
+                make_event(1, "EC2", "us-test-3"),
+                make_event(2, "ELASTICACHE", "eu-west-1"),
+            ]
+        )
+        self.assertEqual([event.service for event in kept], ["ELASTICLOADBALANCING"])
+        self.assertEqual(plan.dropped, {SERVICE: 1, REGION: 1})
+        self.assertEqual(
+            describe_plan(plan),
+            "Filters: nothing sent to the Health API; 3 events received, "
+            "2 dropped client-side (1 by service, 1 by region), 1 kept",
+        )
+
+    def test_availability_zones(self):
+        """Zones alone are pushed; mixed with regions they push their region"""
+        self.assertEqual(
+            EventFilter(regions=["us-east-1a"]).plan().api_fields,
+            {"availabilityZones": ["us-east-1a"]},
+        )
+
+        plan = EventFilter(regions=["eu-west-1", "us-east-1a"]).plan()
+        self.assertEqual(plan.api_fields, {"regions": ["eu-west-1", "us-east-1"]})
+        kept = plan.apply(
+            [
+                make_event(0, region="eu-west-1"),
+                make_event(1, availability_zone="us-east-1a"),
+                make_event(2, availability_zone="us-east-1b"),
+            ]
+        )
+        self.assertEqual(len(kept), 2)
+
+        # Organization filters have no availabilityZones field
+        org_plan = EventFilter(regions=["us-east-1a"]).plan(organization=True)
+        self.assertEqual(org_plan.api_fields, {"regions": ["us-east-1"]})
+        self.assertEqual(len(org_plan.predicates), 1)
+
+    def test_pushdown_transfers_fewer_pages(self):
+        """Pushed-down fields shrink the pages fetched; the result only holds matches"""
+        from main import fetch_health_events
+
+        raw = make_health_events(1000)
+        unfiltered = FakeHealthClient(raw)
+        with patch("main.get_client", return_value=unfiltered):
+            fetch_health_events()
+
+        plan = EventFilter(["ec2"], [REGIONS[0]]).plan()
+        client = FakeHealthClient(raw)
+        with patch("main.get_client", return_value=client):
+            events = fetch_health_events(filter_plan=plan)
+
+        expected = sum(1 for e in raw if e["service"] == "EC2" and e["region"] == REGIONS[0])
+        self.assertEqual(len(events), expected)
+        self.assertEqual(plan.received, expected)
+        self.assertLess(client.calls["DescribeEvents"], unfiltered.calls["DescribeEvents"])
+
+    def test_filtered_sync_uses_its_own_cache_scope(self):
+        """A filtered sync leaves the unfiltered watermark untouched"""
+        from main import fetch_health_events
+
+        tmp = tempfile.mkdtemp()
+        cache = EventCache(Path(tmp) / "events.db")
+        try:
+            plan = EventFilter(["rds"], statuses=["closed"]).plan()
+            client = FakeHealthClient(make_health_events(300))
+            with patch("main.get_client", return_value=client):
+                events = fetch_health_events(cache=cache, filter_plan=plan)
+            window_start = datetime.utcnow() - timedelta(days=89)
+            default_watermark = cache.get_watermark(window_start)
+            filtered_watermark = cache.get_watermark(window_start, plan.cache_scope)
+        finally:
+            cache.close()
+            shutil.rmtree(tmp)
+
+        self.assertTrue(events)
+        self.assertTrue(all(e.service == "RDS" and e.status == "closed" for e in events))
+        self.assertIsNone(default_watermark)
+        self.assertIsNotNone(filtered_watermark)
+
+    @patch("main.get_credentials", return_value=True)
+    def test_main_reports_filter_counts(self, mock_creds):
+        """The run reports pushed fields and client-side drops"""
+        from main import main as cli_main
+
+        client = FakeHealthClient(make_health_events(400))
+        old_stdout = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            with patch("main.get_client", return_value=client):
+                result = cli_main(
+                    ["--no-cache", "--skip-entities", "--service", "EC2", "--event-type", "*API*"]
+                )
+            output = sys.stdout.getvalue()
+        finally:
+            sys.stdout = old_stdout
+
+        self.assertEqual(result, 0)
+        self.assertIn("Filters: services sent to the Health API", output)
+        self.assertIn("by event type", output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Unit tests for Health endpoint hedging and failover
+"""
+
+import sys
+import threading
+import time
+from io import StringIO
+from unittest import TestCase, main
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError, EndpointConnectionError
+
+from clients import ClientFactory, reset_client_factory
+from health_endpoint import HealthEndpointSelector, is_endpoint_failure
+
+
+def client_error(code, status=400):
+    return ClientError(
+        {"Error": {"Code": code, "Message": code}, "ResponseMetadata": {"HTTPStatusCode": status}},
+        "DescribeEvents",
+    )
+
+
+class StubHealthClient:
+    """describe_events that can be held back or fail"""
+
+    def __init__(self, region, error=None, gate=None):
+        self.region = region
+        self.error = error
+        self.gate = gate
+        self.calls = 0
+
+    def describe_events(self, **kwargs):
+        self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(timeout=5)
+        if self.error is not None:
+            raise self.error
+        return {"events": []}
+
+
+class TestHealthEndpoint(TestCase):
+    """Test cases for HealthEndpointSelector"""
+
+    def setUp(self):
+        self.gate = threading.Event()
+
+    def tearDown(self):
+        # Let any held-back probe thread finish
+        self.gate.set()
+
+    def select(self, clients, hedge_delay=5.0):
+        selector = HealthEndpointSelector(hedge_delay=hedge_delay)
+        return selector, selector.select(lambda region: clients[region])
+
+    def test_healthy_primary_is_kept(self):
+        """A prompt primary answer wins without touching the secondary"""
+        clients = {
+            "us-east-1": StubHealthClient("us-east-1"),
+            "us-east-2": StubHealthClient("us-east-2"),
+        }
+        selector, region = self.select(clients)
+
+        self.assertEqual(region, "us-east-1")
+        self.assertFalse(selector.failed_over)
+        self.assertEqual(clients["us-east-2"].calls, 0)
+
+    def test_slow_primary_is_hedged(self):
+        """After the hedge delay the secondary is tried and the faster one sticks"""
+        clients = {
+            "us-east-1": StubHealthClient("us-east-1", gate=self.gate),
+            "us-east-2": StubHealthClient("us-east-2"),
+        }
+        selector, region = self.select(clients, hedge_delay=0.05)
+
+        self.assertEqual(region, "us-east-2")
+        self.assertTrue(selector.failed_over)
+        self.assertIn("us-east-2", selector.latencies)
+        # Sticky: no further probing
+        self.assertEqual(selector.select(lambda r: clients[r]), "us-east-2")
+        self.assertEqual(clients["us-east-2"].calls, 1)
+
+    def test_failing_primary_fails_over_immediately(self):
+        """Connection errors skip the hedge delay"""
+        clients = {
+            "us-east-1": StubHealthClient(
+                "us-east-1", error=EndpointConnectionError(endpoint_url="https://health")
+            ),
+            "us-east-2": StubHealthClient("us-east-2"),
+        }
+        started = time.monotonic()
+        selector, region = self.select(clients, hedge_delay=5.0)
+
+        self.assertEqual(region, "us-east-2")
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertIn("us-east-1", selector.errors)
+
+    def test_api_errors_prove_the_endpoint_is_up(self):
+        """AccessDenied and friends are left for the real call to report"""
+        clients = {
+            "us-east-1": StubHealthClient(
+                "us-east-1", error=client_error("SubscriptionRequiredException")
+            ),
+            "us-east-2": StubHealthClient("us-east-2"),
+        }
+        _, region = self.select(clients)
+        self.assertEqual(region, "us-east-1")
+
+    def test_all_endpoints_down(self):
+        """When every endpoint fails, the primary's error is raised and nothing is chosen"""
+        primary_error = client_error("ServiceUnavailable", 503)
+        clients = {
+            "us-east-1": StubHealthClient("us-east-1", error=primary_error),
+            "us-east-2": StubHealthClient("us-east-2", error=client_error("InternalFailure", 500)),
+        }
+        selector = HealthEndpointSelector()
+        with self.assertRaises(ClientError) as ctx:
+            selector.select(lambda region: clients[region])
+
+        self.assertIs(ctx.exception, primary_error)
+        self.assertIsNone(selector.region)
+
+    def test_is_endpoint_failure(self):
+        """Only transport errors and 5xx responses trigger failover"""
+        self.assertTrue(is_endpoint_failure(client_error("Whatever", 502)))
+        self.assertTrue(is_endpoint_failure(EndpointConnectionError(endpoint_url="x")))
+        self.assertFalse(is_endpoint_failure(client_error("AccessDenied", 403)))
+        self.assertFalse(is_endpoint_failure(client_error("ThrottlingException", 400)))
+
+    def test_factory_uses_selected_region(self):
+        """Health clients requested without a region follow the failover"""
+        created = {}
+
+        def make_client(service, region_name=None, config=None):
+            client = MagicMock()
+            if region_name == "us-east-1":
+                client.describe_events.side_effect = EndpointConnectionError(endpoint_url="x")
+            created[(service, region_name)] = client
+            return client
+
+        session = MagicMock()
+        session.client.side_effect = make_client
+        factory = ClientFactory(session)
+
+        health = factory.client("health")
+
+        self.assertIs(health, created[("health", "us-east-2")])
+        self.assertIs(factory.client("sts"), created[("sts", "us-east-1")])
+
+        factory = reset_client_factory(factory)
+        try:
+            from main import display_health_endpoint
+
+            old_stdout = sys.stdout
+            sys.stdout = StringIO()
+            try:
+                display_health_endpoint()
+                output = sys.stdout.getvalue()
+            finally:
+                sys.stdout = old_stdout
+        finally:
+            reset_client_factory()
+        self.assertIn("failed; used us-east-2", output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the normalized HealthEvent model
+"""
+
+from datetime import datetime, timezone
+from unittest import TestCase, main
+
+from affected_entities import ENTITIES_KEY
+from health_event import HealthEvent, parse_datetime, to_health_events
+
+
+def make_raw_event(**overrides):
+    raw = {
+        "arn": "arn:aws:health:us-east-1::event/EC2/AWS_EC2_OPERATIONAL_ISSUE/ID_1",
+        "service": "EC2",
+        "eventTypeCode": "AWS_EC2_OPERATIONAL_ISSUE",
+        "eventTypeCategory": "issue",
+        "region": "us-east-1",
+        "startTime": datetime(2024, 1, 1, tzinfo=timezone.utc),
+        "lastUpdatedTime": datetime(2024, 1, 2, tzinfo=timezone.utc),
+        "statusCode": "open",
+        "description": "Elevated API error rates",
+    }
+    raw.update(overrides)
+    return raw
+
+
+class TestHealthEvent(TestCase):
+    """Test cases for HealthEvent"""
+
+    def test_from_api(self):
+        """API fields are mapped onto the slotted record"""
+        event = HealthEvent.from_api(make_raw_event())
+
+        self.assertEqual(event.service, "EC2")
+        self.assertEqual(event.region, "us-east-1")
+        self.assertTrue(event.is_open)
+        self.assertEqual(event.start_time.year, 2024)
+        self.assertEqual(event.description, "Elevated API error rates")
+        self.assertIsNone(event.account_id)
+        self.assertIsNone(event.entity_count)
+        self.assertFalse(hasattr(event, "__dict__"))
+
+    def test_status_variants(self):
+        """statusCode from the API and legacy eventStatus both normalize"""
+        self.assertEqual(HealthEvent.from_api(make_raw_event(statusCode="closed")).status, "closed")
+        legacy = make_raw_event(eventStatus="OPEN")
+        del legacy["statusCode"]
+        self.assertTrue(HealthEvent.from_api(legacy).is_open)
+
+    def test_repeated_strings_are_shared(self):
+        """Service, region and type strings are interned across records"""
+        first, second = to_health_events(
+            [
+                make_raw_event(service="".join(["E", "C2"])),
+                make_raw_event(service="".join(["EC", "2"])),
+            ]
+        )
+        self.assertIs(first.service, second.service)
+        self.assertIs(first.event_type_code, second.event_type_code)
+
+    def test_cached_shape(self):
+        """ISO strings, account tags and entity tuples are accepted"""
+        raw = make_raw_event(
+            startTime="2024-03-01T10:00:00Z",
+            awsAccountId="123456789012",
+            **{ENTITIES_KEY: ["i-1", "i-2"]}
+        )
+        event = HealthEvent.from_api(raw)
+
+        self.assertEqual(event.start_time, datetime(2024, 3, 1, 10, tzinfo=timezone.utc))
+        self.assertEqual(event.account_id, "123456789012")
+        self.assertEqual(event.entities, ("i-1", "i-2"))
+        self.assertEqual(event.entity_count, 2)
+
+    def test_parse_datetime(self):
+        """Datetimes pass through; missing values stay None"""
+        now = datetime.utcnow()
+        self.assertIs(parse_datetime(now), now)
+        self.assertIsNone(parse_datetime(None))
+
+    def test_format_status_reads_api_status(self):
+        """Events with the real API statusCode render as open"""
+        from main import format_status
+
+        status = format_status(HealthEvent.from_api(make_raw_event()))
+        self.assertIn("Open", str(status))
+
+
+if __name__ == "__main__":
+    main()
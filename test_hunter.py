@@ -7,11 +7,15 @@ Includes automatic screenshot generation for README
 import sys
 import os
 import argparse
+import threading
+import time
 from io import StringIO
 from datetime import datetime, timedelta
 from unittest import TestCase, main, mock
 from unittest.mock import MagicMock, patch, Mock
 
+from fake_health import make_api_events
+
 # Fix Windows encoding for emojis
 if sys.platform == "win32":
     sys.stdout.reconfigure(encoding='utf-8')
@@ -23,7 +27,10 @@ class TestAwsSLAHunter(TestCase):
 
     def setUp(self):
         """Set up test fixtures"""
-        self.mock_events = [
+        from health_event import to_health_events
+
+        # API-shaped events, and the normalized records the CLI renders
+        self.raw_events = [
             {
                 "arn": "arn:aws:health:us-east-1::event/EC2/123456",
                 "service": "EC2",
@@ -52,8 +59,9 @@ class TestAwsSLAHunter(TestCase):
                 "description": "ELB performance degradation in us-west-2",
             },
         ]
+        self.mock_events = to_health_events(self.raw_events)
 
-    @patch("main.boto3.client")
+    @patch("main.get_client")
     def test_get_credentials_success(self, mock_boto_client):
         """Test successful credential verification"""
         from main import get_credentials
@@ -64,9 +72,9 @@ class TestAwsSLAHunter(TestCase):
 
         result = get_credentials()
         self.assertTrue(result)
-        mock_boto_client.assert_called_with("sts", region_name="us-east-1")
+        mock_boto_client.assert_called_with("sts")
 
-    @patch("main.boto3.client")
+    @patch("main.get_client")
     @patch("main.console.print")
     def test_get_credentials_no_credentials(self, mock_print, mock_boto_client):
         """Test credential verification with missing credentials"""
@@ -81,7 +89,7 @@ class TestAwsSLAHunter(TestCase):
         self.assertFalse(result)
         self.assertTrue(mock_print.called)
 
-    @patch("main.boto3.client")
+    @patch("main.get_client")
     def test_fetch_health_events(self, mock_boto_client):
         """Test fetching health events from AWS"""
         from main import fetch_health_events
@@ -90,7 +98,7 @@ class TestAwsSLAHunter(TestCase):
         mock_boto_client.return_value = mock_health
 
         # Mock the describe_events response
-        mock_health.describe_events.return_value = {"events": self.mock_events[:2]}
+        mock_health.describe_events.return_value = {"events": self.raw_events[:2]}
         mock_health.describe_event_details.return_value = {"successfulSet": []}
 
         events = fetch_health_events()
@@ -102,7 +110,7 @@ class TestAwsSLAHunter(TestCase):
         self.assertIn("eventTypeCategories", call_args.kwargs["filter"])
         self.assertIn("eventStatusCodes", call_args.kwargs["filter"])
 
-    @patch("main.boto3.client")
+    @patch("main.get_client")
     @patch("main.console.print")
     def test_fetch_health_events_no_events(self, mock_print, mock_boto_client):
         """Test fetching when no events exist"""
@@ -169,7 +177,7 @@ class TestAwsSLAHunter(TestCase):
         self.assertTrue(len(event_type) > 0)
         self.assertLessEqual(len(event_type), 25)
 
-    @patch("main.boto3.client")
+    @patch("main.get_client")
     @patch("main.get_credentials")
     @patch("main.fetch_health_events")
     @patch("main.display_results")
@@ -188,7 +196,7 @@ class TestAwsSLAHunter(TestCase):
         mock_creds.return_value = True
         mock_fetch.return_value = self.mock_events
 
-        result = main()
+        result = main([])
         self.assertEqual(result, 0)
         mock_display.assert_called_once()
         mock_cta.assert_called_once()
@@ -200,10 +208,10 @@ class TestAwsSLAHunter(TestCase):
 
         mock_creds.return_value = False
 
-        result = main()
+        result = main([])
         self.assertEqual(result, 1)
 
-    @patch("main.boto3.client")
+    @patch("main.get_client")
     @patch("main.get_credentials")
     @patch("main.fetch_health_events")
     def test_main_with_mock_data(self, mock_fetch, mock_creds, mock_boto_client):
@@ -218,7 +226,7 @@ class TestAwsSLAHunter(TestCase):
         sys.stdout = StringIO()
 
         try:
-            result = main()
+            result = main([])
             output = sys.stdout.getvalue()
             self.assertEqual(result, 0)
             # Verify output contains expected elements
@@ -226,7 +234,7 @@ class TestAwsSLAHunter(TestCase):
         finally:
             sys.stdout = old_stdout
 
-    @patch("main.boto3.client")
+    @patch("main.get_client")
     def test_cta_contains_link(self, mock_boto_client):
         """Test CTA contains correct link"""
         from main import display_cta
@@ -276,6 +284,137 @@ class TestAwsSLAHunter(TestCase):
             sys.stdout = old_stdout
 
 
+class TestHealthEventPagination(TestCase):
+    """Streaming describe_events pagination against a stubbed Health client"""
+
+    def setUp(self):
+        import boto3
+        from botocore.stub import Stubber
+
+        self.health = boto3.client(
+            "health",
+            region_name="us-east-1",
+            aws_access_key_id="testing",
+            aws_secret_access_key="testing",
+        )
+        self.stubber = Stubber(self.health)
+        self.event_filter = {
+            "startTimes": [{"from": datetime(2024, 1, 1), "to": datetime(2024, 3, 31)}],
+            "eventTypeCategories": ["issue"],
+            "eventStatusCodes": ["open", "closed"],
+        }
+
+    def _stub_pages(self, total, page_size, trailing_token=False):
+        pages = 0
+        for offset in range(0, total, page_size):
+            expected = {"filter": self.event_filter, "maxResults": page_size}
+            if offset:
+                expected["nextToken"] = f"token-{offset}"
+            response = {"events": make_api_events(min(page_size, total - offset), offset)}
+            if offset + page_size < total or trailing_token:
+                response["nextToken"] = f"token-{offset + page_size}"
+            self.stubber.add_response("describe_events", response, expected)
+            pages += 1
+        return pages
+
+    def test_follows_next_token_to_exhaustion(self):
+        """Thousands of events across many pages are all yielded, page by page"""
+        from main import iter_health_event_pages
+
+        expected_pages = self._stub_pages(total=5000, page_size=100)
+
+        with self.stubber:
+            pages = list(iter_health_event_pages(self.health, self.event_filter))
+
+        self.assertEqual(len(pages), expected_pages)
+        self.assertTrue(all(len(page) <= 100 for page in pages))
+        arns = {event["arn"] for page in pages for event in page}
+        self.assertEqual(len(arns), 5000)
+        self.stubber.assert_no_pending_responses()
+
+    def test_streams_first_page_before_later_requests(self):
+        """The first page is available before any later page is requested"""
+        from main import iter_health_event_pages
+
+        self._stub_pages(total=300, page_size=100)
+        requests = []
+        self.health.meta.events.register(
+            "before-parameter-build.health.DescribeEvents", lambda **kwargs: requests.append(1)
+        )
+
+        with self.stubber:
+            pages = iter_health_event_pages(self.health, self.event_filter)
+            first = next(pages)
+            self.assertEqual(len(first), 100)
+            self.assertEqual(len(requests), 1)
+            self.assertEqual(sum(len(page) for page in pages), 200)
+        self.assertEqual(len(requests), 3)
+        self.stubber.assert_no_pending_responses()
+
+    def test_prefetch_preserves_order_and_errors(self):
+        """Prefetched pages keep their order and producer errors reach the caller"""
+        from main import iter_health_event_pages, prefetch_pages
+
+        self._stub_pages(total=1000, page_size=50, trailing_token=True)
+        self.stubber.add_client_error("describe_events", service_error_code="ThrottlingException")
+
+        with self.stubber:
+            seen = []
+            with self.assertRaises(Exception) as ctx:
+                for page in prefetch_pages(iter_health_event_pages(self.health, self.event_filter, 50)):
+                    seen.extend(page)
+
+        self.assertIn("ThrottlingException", str(ctx.exception))
+        self.assertEqual(
+            [event["arn"] for event in seen],
+            [event["arn"] for event in make_api_events(1000)],
+        )
+
+    def test_prefetch_stops_pulling_when_the_consumer_stops(self):
+        """A consumer that stops early costs no further pages and frees the producer"""
+        from main import prefetch_pages
+
+        pulled = []
+
+        def pages():
+            for n in range(100):
+                pulled.append(n)
+                yield [n]
+
+        stream = prefetch_pages(pages(), depth=1)
+        self.assertEqual(next(stream), [0])
+        # Let the producer fill the buffer and block on the next page
+        time.sleep(0.2)
+        stream.close()
+
+        producers = [t for t in threading.enumerate() if t.name == "health-prefetch"]
+        for producer in producers:
+            producer.join(timeout=2)
+        self.assertFalse(any(producer.is_alive() for producer in producers))
+        # Page 0 consumed, page 1 buffered, page 2 blocked: nothing pulled after
+        self.assertEqual(pulled, [0, 1, 2])
+
+    @patch("main.get_client")
+    def test_fetch_health_events_collects_all_pages(self, mock_boto_client):
+        """fetch_health_events enriches and returns every page"""
+        from main import fetch_health_events
+
+        mock_health = MagicMock()
+        mock_boto_client.return_value = mock_health
+        mock_health.describe_events.side_effect = [
+            {"events": make_api_events(100), "nextToken": "page-2"},
+            {"events": make_api_events(40, first=100)},
+        ]
+        mock_health.describe_event_details.return_value = {"successfulSet": []}
+
+        events = fetch_health_events()
+
+        self.assertEqual(len(events), 140)
+        self.assertEqual(mock_health.describe_events.call_count, 2)
+        self.assertEqual(
+            mock_health.describe_events.call_args.kwargs["nextToken"], "page-2"
+        )
+
 def generate_screenshot():
     """Generate a screenshot of the CLI output with mock data"""
     import os
@@ -315,7 +454,7 @@ def generate_screenshot():
         import subprocess
 
         # Run main.py with mocked AWS
-        with patch("main.boto3.client") as mock_boto:
+        with patch("main.get_client") as mock_boto:
             mock_sts = MagicMock()
             mock_health = MagicMock()
             mock_boto.side_effect = lambda service, **kwargs: (
@@ -333,7 +472,7 @@ def generate_screenshot():
             sys.stdout = StringIO()
 
             try:
-                main()
+                main([])
                 output = sys.stdout.getvalue()
             finally:
                 sys.stdout = old_stdout
@@ -401,7 +540,7 @@ def generate_screenshot():
         print("PIL not available, generating text-based output instead...")
         from main import display_results, display_cta
 
-        with patch("main.boto3.client") as mock_boto:
+        with patch("main.get_client") as mock_boto:
             mock_sts = MagicMock()
             mock_health = MagicMock()
             mock_boto.side_effect = lambda service, **kwargs: (
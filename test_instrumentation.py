@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Unit tests for per-stage instrumentation and trace export
+"""
+
+import json
+import pstats
+import sys
+import tempfile
+import threading
+from io import StringIO
+from pathlib import Path
+from unittest import TestCase, main
+from unittest.mock import MagicMock, patch
+
+import boto3
+from botocore.awsrequest import AWSResponse
+
+from fake_health import make_api_events
+from instrumentation import NO_STAGE, SPAN_KIND_CLIENT, Tracer, otlp_attribute
+
+
+class FakeRawResponse:
+    def stream(self, **kwargs):
+        return iter([])
+
+
+def make_health_client():
+    return boto3.client(
+        "health",
+        region_name="us-east-1",
+        aws_access_key_id="testing",
+        aws_secret_access_key="testing",
+    )
+
+
+class TestInstrumentation(TestCase):
+    """Test cases for the Tracer"""
+
+    def test_spans_nest_under_the_current_stage(self):
+        """Worker-thread spans are parented to the stage running at the time"""
+        tracer = Tracer()
+        with tracer.stage("fetch") as stage:
+            with tracer.span("page", page=1) as page:
+                with tracer.span("batch"):
+                    pass
+            worker = threading.Thread(target=lambda: tracer.span("worker").__enter__())
+            worker.start()
+            worker.join()
+
+        spans = {span.name: span for span in tracer.spans}
+        self.assertIsNone(stage.parent_id)
+        self.assertEqual(spans["page"].parent_id, stage.span_id)
+        self.assertEqual(spans["batch"].parent_id, page.span_id)
+        self.assertGreaterEqual(stage.duration, page.duration)
+
+    def test_span_limit(self):
+        """Spans past the limit are counted, not kept"""
+        tracer = Tracer(max_spans=5)
+        with tracer.stage("fetch"):
+            for _ in range(10):
+                with tracer.span("batch"):
+                    pass
+        self.assertEqual(len(tracer.spans), 5)
+        self.assertEqual(tracer.dropped, 6)
+
+    def test_client_calls_retries_and_bytes(self):
+        """botocore hooks count calls, retried attempts and response bytes"""
+        tracer = Tracer()
+        health = tracer.attach(make_health_client())
+        responses = [
+            (500, b'{"__type": "InternalFailure"}'),
+            (200, b'{"events": []}'),
+            (200, b'{"events": []}'),
+        ]
+
+        def fake_send(request, **kwargs):
+            status, body = responses.pop(0)
+            response = AWSResponse(
+                request.url, status, {"content-length": str(len(body))}, FakeRawResponse()
+            )
+            response._content = body
+            return response
+
+        health.meta.events.register("before-send.health", fake_send)
+        with patch("botocore.retries.standard.time.sleep"):
+            with tracer.stage("fetch"):
+                health.describe_events()
+            health.describe_events()
+
+        rows = {row.name: row for row in tracer.stage_summary()}
+        self.assertEqual(rows["fetch"].calls, 1)
+        self.assertEqual(rows["fetch"].retries, 1)
+        self.assertEqual(rows["fetch"].errors, 1)
+        self.assertEqual(rows["fetch"].bytes_received, 29 + 14)
+        self.assertEqual(rows[NO_STAGE].calls, 1)
+        # One latency observation per call, retries included in its duration
+        self.assertEqual(tracer.latency_histograms()["health:DescribeEvents"].count, 2)
+        self.assertEqual(tracer.operation_totals()["health:DescribeEvents"].retries, 1)
+
+    def test_otlp_export(self):
+        """OTLP/JSON spans share the trace ID and carry stage counters"""
+        tracer = Tracer()
+        with tracer.stage("fetch"):
+            with tracer.span("describe_events", SPAN_KIND_CLIENT, page=1):
+                pass
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "trace.json"
+            tracer.write(str(path), "otlp")
+            data = json.loads(path.read_text())
+
+        spans = data["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        self.assertEqual(len(spans), 2)
+        self.assertEqual({span["traceId"] for span in spans}, {tracer.trace_id})
+        self.assertEqual(spans[1]["parentSpanId"], spans[0]["spanId"])
+        self.assertEqual(spans[1]["kind"], SPAN_KIND_CLIENT)
+        self.assertIn(otlp_attribute("aws.api.calls", 0), spans[0]["attributes"])
+        self.assertEqual(len(spans[0]["spanId"]), 16)
+        self.assertEqual(len(tracer.trace_id), 32)
+
+    @patch("main.get_credentials", return_value=True)
+    @patch("main.get_client")
+    def test_main_timings_trace_and_profile(self, mock_get_client, mock_creds):
+        """--timings prints every stage; --trace and --profile write their files"""
+        from main import main as cli_main
+
+        health = MagicMock()
+        health.describe_events.return_value = {"events": make_api_events(30)}
+        health.describe_event_details.return_value = {"successfulSet": []}
+        mock_get_client.return_value = health
+
+        with tempfile.TemporaryDirectory() as tmp:
+            trace = Path(tmp) / "trace.json"
+            profile = Path(tmp) / "run.prof"
+            old_stdout = sys.stdout
+            sys.stdout = StringIO()
+            try:
+                result = cli_main(
+                    [
+                        "--no-cache",
+                        "--skip-entities",
+                        "--timings",
+                        "--trace",
+                        str(trace),
+                        "--profile",
+                        str(profile),
+                    ]
+                )
+                output = sys.stdout.getvalue()
+            finally:
+                sys.stdout = old_stdout
+
+            report = json.loads(trace.read_text())
+            stats = pstats.Stats(str(profile))
+
+        self.assertEqual(result, 0)
+        self.assertIn("Stage timings", output)
+        self.assertEqual(
+            [stage["name"] for stage in report["stages"]],
+            ["credentials", "fetch", "sla credits", "render"],
+        )
+        names = {span["name"] for span in report["spans"]}
+        self.assertIn("describe_events", names)
+        self.assertIn("describe_event_details", names)
+        functions = {func[2] for func in stats.stats}
+        self.assertIn("run", functions)
+        # Page fetching runs on the prefetch thread, enrichment on a pool
+        self.assertIn("iter_health_event_pages", functions)
+        self.assertIn("fetch_details_batch", functions)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the incremental results view
+"""
+
+import sys
+import time
+from io import StringIO
+from unittest import TestCase, main
+from unittest.mock import patch
+
+from fake_health import make_event
+from live_view import EventSummary, LiveResultsView, NewestEvents, visible_rows
+
+
+def make_events(count, start=0, account_id=None):
+    return [
+        make_event(
+            n,
+            service="EC2" if n % 4 else "RDS",
+            status="open" if n % 5 == 0 else "closed",
+            account_id=account_id,
+        )
+        for n in range(start, start + count)
+    ]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLiveView(TestCase):
+    """Test cases for the live results view"""
+
+    def test_summary_counts_incrementally(self):
+        """Counters match a full recount after several pages"""
+        summary = EventSummary()
+        summary.add(make_events(100))
+        summary.add(make_events(50, start=100, account_id="123456789012"))
+
+        self.assertEqual(summary.total, 150)
+        self.assertEqual(summary.open, 30)
+        self.assertEqual(summary.closed, 120)
+        self.assertEqual(summary.services["RDS"], 38)
+        self.assertIn("1 accounts", summary.markup())
+
+    def test_newest_events_are_bounded(self):
+        """Only the newest `limit` events are kept, newest first"""
+        newest = NewestEvents(5)
+        newest.add(make_events(100, start=50))
+        newest.add(make_events(50))
+
+        rows = newest.rows()
+        self.assertEqual(len(rows), 5)
+        self.assertTrue(rows[0].arn.endswith("_149"))
+        self.assertTrue(rows[-1].arn.endswith("_145"))
+
+    def test_visible_rows(self):
+        """Small result sets keep their order; large ones are capped"""
+        events = make_events(10)
+        self.assertIs(visible_rows(events, 100), events)
+        self.assertIs(visible_rows(events, 0), events)
+        self.assertEqual(len(visible_rows(make_events(1000), 20)), 20)
+
+    def test_live_view_renders_per_page(self):
+        """Each render reflects the pages added so far"""
+        built = []
+
+        def build_table(rows, total):
+            built.append((len(rows), total))
+            return f"{len(rows)} of {total}"
+
+        clock = FakeClock()
+        view = LiveResultsView(build_table, max_rows=10, clock=clock)
+        view.render()
+        self.assertEqual(built, [])
+
+        view.add_page(make_events(100))
+        clock.now = 2.0
+        view.render()
+        view.add_page(make_events(100, start=100))
+        view.render(done=True)
+
+        self.assertEqual(built, [(10, 100), (10, 200)])
+        self.assertIn("2 pages", view.progress_markup())
+        self.assertIn("100 events/s", view.progress_markup())
+
+    def test_display_results_caps_large_tables(self):
+        """20k events render the capped table in well under a second"""
+        from main import display_results
+
+        events = make_events(20000)
+        old_stdout = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            started = time.perf_counter()
+            display_results(events, max_rows=50)
+            elapsed = time.perf_counter() - started
+            output = sys.stdout.getvalue()
+        finally:
+            sys.stdout = old_stdout
+
+        self.assertIn("20,000 found", output)
+        self.assertIn("newest of 20,000", output)
+        self.assertIn("4,000 Open", output)
+        self.assertLess(elapsed, 1.0)
+
+    @patch("main.get_credentials", return_value=True)
+    @patch("main.fetch_health_events")
+    def test_main_live_option(self, mock_fetch, mock_creds):
+        """--live feeds pages into the live view instead of a final table"""
+        from main import main as cli_main
+
+        def fake_fetch(on_page=None, **kwargs):
+            events = make_events(300)
+            for start in range(0, 300, 100):
+                on_page(events[start:start + 100])
+            return events
+
+        mock_fetch.side_effect = fake_fetch
+        old_stdout = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            with patch("main.display_results") as mock_display:
+                result = cli_main(["--live", "--no-cache", "--max-rows", "5"])
+            output = sys.stdout.getvalue()
+        finally:
+            sys.stdout = old_stdout
+
+        self.assertEqual(result, 0)
+        mock_display.assert_not_called()
+        self.assertIn("300 found", output)
+        self.assertIn("3 pages", output)
+
+    def test_live_needs_table_output(self):
+        """--live only applies to the table view"""
+        from main import parse_args
+
+        with patch("sys.stderr", new=StringIO()), self.assertRaises(SystemExit):
+            parse_args(["--live", "--output", "jsonl"])
+        with patch("sys.stderr", new=StringIO()), self.assertRaises(SystemExit):
+            parse_args(["--max-rows", "-1"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Prometheus metrics exporter
+"""
+
+import re
+import sys
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from io import StringIO
+from unittest import TestCase, main
+from unittest.mock import patch
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+from fake_health import make_event
+from instrumentation import Histogram, OperationStats
+from metrics_exporter import (
+    CONTENT_TYPE,
+    EventIndex,
+    MetricsServer,
+    MetricsSnapshot,
+    MetricsState,
+    render_metrics,
+)
+from rate_limiter import RateLimitStats
+from sla_rules import evaluate_credits
+from watch import Watcher
+
+
+NOW = datetime.now(timezone.utc)
+
+
+def recent_event(n, status="open", service="EC2", region="us-east-1", days_ago=1, hours=10):
+    start = NOW - timedelta(days=days_ago)
+    end = start + timedelta(hours=hours) if status == "closed" else None
+    return make_event(n, service, region, status, start, end)
+
+
+def make_snapshot(events, **overrides):
+    histogram = Histogram()
+    for seconds in (0.01, 0.2, 20.0):
+        histogram.observe(seconds)
+    stats = OperationStats()
+    stats.calls, stats.attempts, stats.bytes_received = 3, 4, 1024
+    fields = dict(
+        events=events,
+        credits=evaluate_credits(events, NOW),
+        estimates=None,
+        operations={"health:DescribeEvents": stats},
+        latencies={"health:DescribeEvents": histogram},
+        rate_limits=RateLimitStats(3, 1, 0.5, 9.5),
+        cache_hits=30,
+        cache_misses=10,
+        fetch_seconds=1.5,
+        polls=2,
+        poll_failures=1,
+        last_success=NOW,
+    )
+    fields.update(overrides)
+    return MetricsSnapshot(**fields)
+
+
+class TestMetricsExporter(TestCase):
+    """Test cases for the metrics exporter"""
+
+    def test_render_metrics(self):
+        """Event gauges, credits and performance counters are exposed"""
+        events = [
+            recent_event(1, "closed"),
+            recent_event(2, "closed"),
+            recent_event(3, "open", service="RDS", region="eu-west-1"),
+        ]
+        text = render_metrics(make_snapshot(events))
+
+        self.assertIn(
+            'aws_sla_hunter_events{service="EC2",region="us-east-1",status="closed"} 2', text
+        )
+        self.assertIn(
+            'aws_sla_hunter_events{service="RDS",region="eu-west-1",status="open"} 1', text
+        )
+        self.assertRegex(text, r'aws_sla_hunter_sla_credit_percent\{account="",service="EC2",')
+        self.assertNotIn("estimated_credit_usd", text)
+        self.assertIn('aws_sla_hunter_api_retries_total{operation="health:DescribeEvents"} 1', text)
+        self.assertIn(
+            'aws_sla_hunter_api_request_duration_seconds_bucket'
+            '{operation="health:DescribeEvents",le="0.25"} 2',
+            text,
+        )
+        self.assertIn('le="+Inf"} 3', text)
+        self.assertIn("aws_sla_hunter_health_throttles_total 1", text)
+        self.assertIn("aws_sla_hunter_cache_hit_ratio 0.75", text)
+        self.assertIn("aws_sla_hunter_fetch_duration_seconds 1.5", text)
+        self.assertIn("# TYPE aws_sla_hunter_api_request_duration_seconds histogram", text)
+
+    def test_event_index_keeps_latest_and_prunes(self):
+        """Updates replace an event in place; events outside the window drop out"""
+        index = EventIndex(max_events=2)
+        index.update([recent_event(1), recent_event(2, days_ago=100)])
+        index.update([recent_event(1, "closed")])
+
+        self.assertEqual(index.prune(NOW), 1)
+        self.assertEqual([event.status for event in index], ["closed"])
+        index.update([recent_event(3), recent_event(4), recent_event(5)])
+        self.assertEqual(len(index), 2)
+
+    def test_server_serves_published_state(self):
+        """Scrapes return the latest published body; other paths are 404"""
+        state = MetricsState()
+        server = MetricsServer(state, 0).start()
+        try:
+            state.publish("aws_sla_hunter_polls_total 7\n")
+            with urlopen(server.address, timeout=5) as response:
+                body = response.read().decode()
+                content_type = response.headers["Content-Type"]
+            with self.assertRaises(HTTPError) as missing:
+                urlopen(server.address.replace("/metrics", "/other"), timeout=5)
+            missing.exception.close()
+        finally:
+            server.stop()
+
+        self.assertEqual(body, "aws_sla_hunter_polls_total 7\n")
+        self.assertEqual(content_type, CONTENT_TYPE)
+        self.assertEqual(missing.exception.code, 404)
+
+    @patch("main.get_credentials", return_value=True)
+    @patch("main.get_client")
+    @patch("main.fetch_health_events")
+    @patch("main.poll_health_events")
+    def test_main_serve_metrics(self, mock_poll, mock_fetch, mock_get_client, mock_creds):
+        """--serve-metrics publishes after every poll and scrapes call no API"""
+        from main import main as cli_main
+
+        mock_fetch.return_value = [recent_event(1), recent_event(2)]
+        mock_poll.side_effect = [[recent_event(1, "closed")]]
+        scrapes = []
+
+        def wait(seconds):
+            address = re.search(r"http://\S+/metrics", sys.stdout.getvalue()).group(0)
+            calls = (mock_poll.call_count, mock_get_client.call_count)
+            for _ in range(3):
+                with urlopen(address, timeout=5) as response:
+                    scrapes.append(response.read().decode())
+            self.assertEqual((mock_poll.call_count, mock_get_client.call_count), calls)
+            if len(scrapes) > 3:
+                raise KeyboardInterrupt
+            return False
+
+        old_stdout = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            with patch("main.Watcher", partial(Watcher, wait=wait)):
+                result = cli_main(["--serve-metrics", "0", "--no-cache", "--skip-entities"])
+        finally:
+            sys.stdout = old_stdout
+
+        self.assertEqual(result, 0)
+        self.assertEqual(mock_poll.call_count, 1)
+        self.assertIn('status="open"} 2', scrapes[0])
+        self.assertIn('status="closed"} 1', scrapes[-1])
+        self.assertIn("aws_sla_hunter_polls_total 1", scrapes[-1])
+
+    def test_serve_metrics_arguments(self):
+        """--serve-metrics implies watch mode and validates the port"""
+        from main import parse_args
+
+        self.assertEqual(parse_args(["--serve-metrics", "9150"]).watch, 60.0)
+        self.assertEqual(parse_args(["--serve-metrics", "9150", "--watch", "30"]).watch, 30.0)
+        for argv in (["--serve-metrics", "70000"], ["--serve-metrics", "9150", "--async"]):
+            with patch("sys.stderr", new=StringIO()), self.assertRaises(SystemExit):
+                parse_args(argv)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the multi-account assumed-role scanner
+"""
+
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import TestCase, main
+from unittest.mock import patch
+
+from botocore.exceptions import ClientError
+
+from multi_account import (
+    AccountTarget,
+    iter_account_results,
+    load_account_targets,
+    parse_account_target,
+)
+
+
+class FakeFactory:
+    """Stands in for ClientFactory: records assumed roles, hands out account IDs as clients"""
+
+    def __init__(self, denied=()):
+        self.denied = set(denied)
+        self.assumed = []
+
+    def assume_role(self, account_id, role_arn, session_name):
+        if account_id in self.denied:
+            raise ClientError({"Error": {"Code": "AccessDenied", "Message": "no"}}, "AssumeRole")
+        self.assumed.append(role_arn)
+
+    def client(self, service, region="us-east-1", account_id=None):
+        return account_id
+
+
+class TestAccountTargets(TestCase):
+    """Test cases for parsing account lists"""
+
+    def test_parse_account_id_and_role_arn(self):
+        """Bare IDs use the default role; role ARNs are kept as given"""
+        target = parse_account_target("123456789012", role_name="Auditor")
+        self.assertEqual(target.role_arn, "arn:aws:iam::123456789012:role/Auditor")
+
+        arn = "arn:aws:iam::210987654321:role/path/SlaHunter"
+        self.assertEqual(parse_account_target(arn), AccountTarget("210987654321", arn))
+
+        with self.assertRaises(ValueError):
+            parse_account_target("not-an-account")
+
+    def test_load_from_file_deduplicates(self):
+        """Files allow comments and duplicate accounts are scanned once"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "accounts.txt"
+            path.write_text(
+                "# production\n111111111111\n\n"
+                "arn:aws:iam::222222222222:role/Audit  # legacy\n"
+            )
+            targets = load_account_targets(["111111111111"], str(path))
+
+        self.assertEqual([t.account_id for t in targets], ["111111111111", "222222222222"])
+
+
+class TestParallelScan(TestCase):
+    """Test cases for iter_account_results"""
+
+    def setUp(self):
+        self.targets = [parse_account_target(f"{i:012d}") for i in range(1, 41)]
+
+    def test_scans_all_accounts_concurrently(self):
+        """Every account is assumed, scanned, tagged and streamed back"""
+
+        def fetch(health):
+            time.sleep(0.05)
+            return [{"arn": "arn:event/1"}, {"arn": "arn:event/2"}]
+
+        factory = FakeFactory()
+        started = time.perf_counter()
+        results = list(
+            iter_account_results(self.targets, fetch, max_workers=20, factory=factory)
+        )
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(len(results), 40)
+        self.assertTrue(all(r.error is None for r in results))
+        for result in results:
+            self.assertEqual(
+                {e["awsAccountId"] for e in result.events}, {result.account_id}
+            )
+        self.assertLess(elapsed, 40 * 0.05 / 2)
+        self.assertEqual(len(factory.assumed), 40)
+
+    def test_failures_and_timeouts_are_reported(self):
+        """A failing or slow account does not stop the others"""
+        factory = FakeFactory(denied={"000000000001"})
+
+        def fetch(account_id):
+            if account_id == "000000000002":
+                time.sleep(1.0)
+            return []
+
+        results = {
+            r.account_id: r
+            for r in iter_account_results(
+                self.targets[:5], fetch, max_workers=5, timeout=0.2, factory=factory
+            )
+        }
+
+        self.assertEqual(len(results), 5)
+        self.assertIn("AccessDenied", results["000000000001"].error)
+        self.assertIn("Timed out", results["000000000002"].error)
+        self.assertIsNone(results["000000000003"].error)
+
+    def test_timed_out_scan_does_not_delay_exit(self):
+        """The process exits once results are in, not when abandoned scans finish"""
+        script = (
+            "import time\n"
+            "from multi_account import iter_account_results, parse_account_target\n"
+            "from test_multi_account import FakeFactory\n"
+            "targets = [parse_account_target('000000000001')]\n"
+            "results = list(iter_account_results(\n"
+            "    targets, lambda health: time.sleep(6), timeout=0.2, factory=FakeFactory()\n"
+            "))\n"
+            "assert 'Timed out' in results[0].error\n"
+        )
+        started = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", script], cwd=Path(__file__).resolve().parent, check=True
+        )
+        self.assertLess(time.perf_counter() - started, 3.0)
+
+
+class TestAccountsCli(TestCase):
+    """Test cases for the --accounts command-line option"""
+
+    @patch("main.get_credentials", return_value=True)
+    @patch("main.iter_account_results")
+    @patch("main.display_results")
+    def test_main_accounts_option(self, mock_display, mock_results, mock_creds):
+        """--accounts streams per-account results into one merged result set"""
+        from main import main as cli_main
+        from multi_account import AccountResult
+
+        mock_results.return_value = iter(
+            [
+                AccountResult("111111111111", [{"arn": "a", "awsAccountId": "111111111111"}], None, 0.1),
+                AccountResult("222222222222", [], "Timed out after 5s", 5.0),
+            ]
+        )
+
+        result = cli_main(["--accounts", "111111111111", "222222222222", "--workers", "2"])
+
+        self.assertEqual(result, 0)
+        targets = mock_results.call_args.args[0]
+        self.assertEqual(len(targets), 2)
+        self.assertEqual(mock_results.call_args.kwargs["max_workers"], 2)
+        self.assertEqual(len(mock_display.call_args.args[0]), 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Unit tests for service and event-type normalization
+"""
+
+import json
+import sys
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import TestCase, main
+from unittest.mock import patch
+
+import normalization
+from normalization import (
+    clear_caches,
+    get_catalog,
+    load_catalog,
+    normalize_event_type,
+    normalize_service,
+)
+
+
+class TestNormalization(TestCase):
+    """Test cases for the normalization index"""
+
+    def tearDown(self):
+        clear_caches()
+
+    def test_bundled_catalog(self):
+        """The shipped catalog covers the common Health service codes"""
+        catalog = get_catalog()
+        self.assertGreater(len(catalog.services), 50)
+        for code in ("EC2", "RDS", "S3", "LAMBDA", "ELASTICLOADBALANCING", "DYNAMODB"):
+            self.assertIn(code, catalog.services)
+
+    def test_service_names(self):
+        """Exact codes, prefixed codes and unknown codes all normalize"""
+        self.assertEqual(normalize_service("ELASTICLOADBALANCING"), "ELB")
+        self.assertEqual(normalize_service("dynamodb"), "DynamoDB")
+        self.assertEqual(normalize_service("AMAZON_CLOUDFRONT"), "CloudFront")
+        self.assertEqual(normalize_service("SOMETHINGBRANDNEWSERVICE"), "SOMETHINGBRANDN")
+        self.assertEqual(normalize_service(None), "Unknown")
+
+    def test_event_type_names(self):
+        """Catalog labels win; other codes fall back to title case"""
+        self.assertEqual(normalize_event_type("AWS_EC2_OPERATIONAL_ISSUE"), "EC2 Operational Issue")
+        self.assertEqual(
+            normalize_event_type("AWS_FOO_NEW_EVENT_TYPE_WITH_A_LONG_NAME"),
+            "Aws Foo New Event Type Wi",
+        )
+        self.assertEqual(normalize_event_type(""), "Unknown")
+
+    def test_each_code_is_normalized_once(self):
+        """Repeated codes are served from the memo cache"""
+        for _ in range(1000):
+            normalize_service("EC2")
+        info = normalize_service.cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 999)
+
+    def test_custom_catalog_file(self):
+        """Catalogs load from any JSON file; a missing file is empty"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "catalog.json"
+            path.write_text(json.dumps({"services": {"foo": "Foo Service"}}))
+            with patch.object(normalization, "CATALOG_PATH", path):
+                clear_caches()
+                self.assertEqual(normalize_service("FOO"), "Foo Service")
+
+            empty = load_catalog(Path(tmp) / "missing.json")
+        self.assertEqual(empty.services, {})
+
+    def test_missing_bundled_catalog_falls_back_loudly(self):
+        """Without any catalog file the built-in names still match, with a warning"""
+        with tempfile.TemporaryDirectory() as tmp:
+            missing = Path(tmp) / "service_catalog.json"
+            old_stdout = sys.stdout
+            sys.stdout = StringIO()
+            try:
+                with patch.object(normalization, "CATALOG_PATH", missing), patch.object(
+                    normalization, "INSTALLED_CATALOG_PATH", missing
+                ):
+                    clear_caches()
+                    names = [
+                        normalize_service(code)
+                        for code in ("ELASTICLOADBALANCING", "DYNAMODB", "AMAZON_LAMBDA")
+                    ]
+                output = sys.stdout.getvalue()
+            finally:
+                sys.stdout = old_stdout
+
+        self.assertEqual(names, ["ELB", "DynamoDB", "Lambda"])
+        self.assertIn("service_catalog.json not found", output)
+
+    def test_installed_catalog_location(self):
+        """A catalog installed as a data file is found when the module has none beside it"""
+        with tempfile.TemporaryDirectory() as tmp:
+            installed = Path(tmp) / "service_catalog.json"
+            installed.write_text(json.dumps({"services": {"foo": "Foo Service"}}))
+            with patch.object(
+                normalization, "CATALOG_PATH", Path(tmp) / "missing.json"
+            ), patch.object(normalization, "INSTALLED_CATALOG_PATH", installed):
+                clear_caches()
+                self.assertEqual(normalize_service("FOO"), "Foo Service")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the organization-wide Health scan
+"""
+
+import sys
+from datetime import datetime, timedelta
+from io import StringIO
+from unittest import TestCase, main
+from unittest.mock import MagicMock, patch
+
+from instrumentation import tracer
+from organization import fetch_affected_accounts, iter_organization_events
+
+
+def make_org_events(count, start=0):
+    return [
+        {
+            "arn": f"arn:aws:health:us-east-1::event/EC2/AWS_EC2_ISSUE/ORG_{i}",
+            "service": "EC2",
+            "eventTypeCode": "AWS_EC2_OPERATIONAL_ISSUE",
+            "eventTypeCategory": "issue",
+            "region": "us-east-1",
+            "startTime": datetime(2024, 1, 1) + timedelta(hours=i),
+            "statusCode": "closed",
+        }
+        for i in range(start, start + count)
+    ]
+
+
+def org_details(organizationEventDetailFilters):
+    return {
+        "successfulSet": [
+            {
+                "awsAccountId": item.get("awsAccountId"),
+                "event": {"arn": item["eventArn"]},
+                "eventDescription": {"latestDescription": f"{item.get('awsAccountId')}"},
+            }
+            for item in organizationEventDetailFilters
+        ]
+    }
+
+
+class TestOrganizationScan(TestCase):
+    """Test cases for describe_*_for_organization pagination and fan-out"""
+
+    def test_affected_accounts_paginate(self):
+        """Affected accounts are collected across every page"""
+        import boto3
+        from botocore.stub import Stubber
+
+        health = boto3.client(
+            "health",
+            region_name="us-east-1",
+            aws_access_key_id="testing",
+            aws_secret_access_key="testing",
+        )
+        arn = make_org_events(1)[0]["arn"]
+        accounts = [f"{i:012d}" for i in range(250)]
+        with Stubber(health) as stubber:
+            for offset in range(0, 250, 100):
+                expected = {"eventArn": arn, "maxResults": 100}
+                response = {"affectedAccounts": accounts[offset:offset + 100]}
+                if offset:
+                    expected["nextToken"] = f"t{offset}"
+                if offset + 100 < 250:
+                    response["nextToken"] = f"t{offset + 100}"
+                stubber.add_response(
+                    "describe_affected_accounts_for_organization", response, expected
+                )
+
+            self.assertEqual(fetch_affected_accounts(health, arn), accounts)
+            stubber.assert_no_pending_responses()
+
+    def test_events_tagged_by_account(self):
+        """Each event becomes one enriched row per affected account"""
+        health = MagicMock()
+        health.describe_events_for_organization.side_effect = [
+            {"events": make_org_events(100), "nextToken": "p2"},
+            {"events": make_org_events(20, start=100)},
+        ]
+        health.describe_affected_accounts_for_organization.side_effect = (
+            lambda eventArn, maxResults: {
+                "affectedAccounts": ["111111111111", "222222222222"]
+            }
+        )
+        health.describe_event_details_for_organization.side_effect = org_details
+
+        tracer.reset()
+        pages = list(
+            iter_organization_events(health, datetime(2024, 1, 1), datetime(2024, 3, 1))
+        )
+        rows = [row for page in pages for row in page]
+
+        self.assertEqual(len(pages), 2)
+        page_spans = [
+            span
+            for span in tracer.to_dict()["spans"]
+            if span["name"] == "describe_events_for_organization"
+        ]
+        self.assertEqual([span["attributes"]["events"] for span in page_spans], [100, 20])
+        self.assertEqual(len(rows), 240)
+        self.assertEqual(
+            {row["awsAccountId"] for row in rows}, {"111111111111", "222222222222"}
+        )
+        self.assertTrue(all(row["description"] == row["awsAccountId"] for row in rows))
+        for call in health.describe_event_details_for_organization.call_args_list:
+            self.assertLessEqual(len(call.kwargs["organizationEventDetailFilters"]), 10)
+
+    def test_public_events_kept_untagged(self):
+        """Events without affected accounts stay as a single row"""
+        health = MagicMock()
+        health.describe_events_for_organization.return_value = {
+            "events": make_org_events(1)
+        }
+        health.describe_affected_accounts_for_organization.return_value = {
+            "affectedAccounts": [],
+            "eventScopeCode": "PUBLIC",
+        }
+        health.describe_event_details_for_organization.side_effect = org_details
+
+        rows = [
+            row
+            for page in iter_organization_events(
+                health, datetime(2024, 1, 1), datetime(2024, 3, 1)
+            )
+            for row in page
+        ]
+
+        self.assertEqual(len(rows), 1)
+        self.assertIsNone(rows[0]["awsAccountId"])
+        filters = health.describe_event_details_for_organization.call_args.kwargs[
+            "organizationEventDetailFilters"
+        ]
+        self.assertNotIn("awsAccountId", filters[0])
+
+    @patch("main.get_client")
+    def test_fetch_health_events_organization(self, mock_boto_client):
+        """fetch_health_events uses the organizational view when asked"""
+        from main import display_results, fetch_health_events
+
+        health = MagicMock()
+        mock_boto_client.return_value = health
+        health.describe_events_for_organization.return_value = {
+            "events": make_org_events(3)
+        }
+        health.describe_affected_accounts_for_organization.return_value = {
+            "affectedAccounts": ["123456789012"]
+        }
+        health.describe_event_details_for_organization.side_effect = org_details
+
+        events = fetch_health_events(organization=True)
+
+        self.assertEqual(len(events), 3)
+        health.describe_events.assert_not_called()
+
+        old_stdout = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            display_results(events)
+            output = sys.stdout.getvalue()
+        finally:
+            sys.stdout = old_stdout
+        self.assertIn("Account", output)
+        self.assertIn("123456789012", output)
+
+
+if __name__ == "__main__":
+    main()
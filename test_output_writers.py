@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the streaming output writers
+"""
+
+import csv
+import json
+import sys
+import tempfile
+import threading
+from datetime import datetime, timezone
+from io import StringIO
+from pathlib import Path
+from unittest import TestCase, main, skipIf
+from unittest.mock import MagicMock, patch
+
+from fake_health import make_api_events, make_event
+from output_writers import (
+    OUTPUT_FIELDS,
+    CsvWriter,
+    EventWriter,
+    JsonLinesWriter,
+    JsonWriter,
+    open_writer,
+)
+
+try:
+    import pyarrow  # noqa: F401
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+def make_events(count, start=0):
+    return [
+        make_event(
+            n,
+            status="open" if n % 2 else "closed",
+            start=datetime(2024, 1, 1, n % 24, tzinfo=timezone.utc),
+            entities=("i-1", "i-2") if n % 3 == 0 else None,
+        )
+        for n in range(start, start + count)
+    ]
+
+
+class TestOutputWriters(TestCase):
+    """Test cases for the output writers"""
+
+    def test_jsonl_streams_each_page(self):
+        """Each page is written and flushed before the next arrives"""
+        stream = StringIO()
+        writer = JsonLinesWriter(stream)
+
+        writer.write_page(make_events(2))
+        self.assertEqual(len(stream.getvalue().splitlines()), 2)
+        writer.write_page(make_events(3, start=2))
+        writer.close()
+
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(len(records), 5)
+        self.assertEqual(list(records[0]), list(OUTPUT_FIELDS))
+        self.assertEqual(records[0]["start_time"], "2024-01-01T00:00:00+00:00")
+        self.assertEqual(records[0]["entities"], ["i-1", "i-2"])
+        self.assertIsNone(records[1]["entity_count"])
+
+    def test_base_writer_is_abstract(self):
+        """EventWriter itself cannot be instantiated"""
+        with self.assertRaises(TypeError):
+            EventWriter(StringIO())
+
+    def test_json_array(self):
+        """JSON output is one valid array, even when empty"""
+        stream = StringIO()
+        with JsonWriter(stream) as writer:
+            writer.write_page(make_events(2))
+            writer.write_page(make_events(1, start=2))
+        self.assertEqual(len(json.loads(stream.getvalue())), 3)
+
+        empty = StringIO()
+        JsonWriter(empty).close()
+        self.assertEqual(json.loads(empty.getvalue()), [])
+
+    def test_csv(self):
+        """CSV has a stable header and space-separated entities"""
+        stream = StringIO()
+        with CsvWriter(stream) as writer:
+            writer.write_page(make_events(3))
+
+        rows = list(csv.DictReader(StringIO(stream.getvalue())))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]["entities"], "i-1 i-2")
+        self.assertEqual(rows[1]["status"], "open")
+
+    def test_file_output(self):
+        """Writers opened on a path close the file with the writer"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "events.jsonl"
+            with open_writer("jsonl", str(path)) as writer:
+                writer.write_page(make_events(4))
+            self.assertTrue(writer.stream.closed)
+            self.assertEqual(len(path.read_text().splitlines()), 4)
+
+    @skipIf(HAS_PYARROW, "pyarrow is installed")
+    def test_parquet_requires_pyarrow(self):
+        """Without pyarrow, Parquet output explains how to install it"""
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaisesRegex(ImportError, "aws-sla-hunter\\[parquet\\]"):
+                open_writer("parquet", str(Path(tmp) / "events.parquet"))
+
+    @patch("main.get_client")
+    def test_fetch_streams_pages_as_they_arrive(self, mock_get_client):
+        """on_page sees every page while describe_events is still paginating"""
+        from main import fetch_health_events
+
+        health = MagicMock()
+        mock_get_client.return_value = health
+        first_page_written = threading.Event()
+        responses = [
+            {"events": make_api_events(100), "nextToken": "page-2"},
+            {"events": make_api_events(100, first=100), "nextToken": "page-3"},
+            {"events": make_api_events(10, first=200)},
+        ]
+
+        def describe_events(**kwargs):
+            if kwargs.get("nextToken") == "page-3":
+                # The last page is held back until the first one is emitted
+                self.assertTrue(first_page_written.wait(timeout=5))
+            return responses.pop(0)
+
+        health.describe_events.side_effect = describe_events
+        health.describe_event_details.return_value = {"successfulSet": []}
+
+        pages = []
+
+        def on_page(page):
+            pages.append(page)
+            first_page_written.set()
+
+        events = fetch_health_events(on_page=on_page)
+
+        self.assertEqual([len(page) for page in pages], [100, 100, 10])
+        self.assertEqual(len(events), 210)
+
+    @patch("main.get_client")
+    def test_cached_events_are_streamed_once(self, mock_get_client):
+        """With the cache, fetched pages stream first, then the cached remainder"""
+        from event_cache import EventCache
+        from main import fetch_health_events
+
+        health = MagicMock()
+        mock_get_client.return_value = health
+        health.describe_event_details.return_value = {"successfulSet": []}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = EventCache(Path(tmp) / "events.db")
+            now = datetime.utcnow()
+            cold = make_api_events(5)
+            for event in cold:
+                event["startTime"] = now
+            health.describe_events.return_value = {"events": cold}
+            fetch_health_events(cache=cache)
+
+            warm = [dict(cold[0], description="updated")]
+            health.describe_events.return_value = {"events": warm}
+            streamed = []
+            events = fetch_health_events(cache=cache, on_page=streamed.append)
+            cache.close()
+
+        self.assertEqual(len(streamed[0]), 1)
+        streamed_arns = sorted(e.arn for page in streamed for e in page)
+        self.assertEqual(streamed_arns, sorted(e.arn for e in events))
+        self.assertEqual(len(events), 5)
+
+    @patch("main.get_credentials", return_value=True)
+    @patch("main.fetch_health_events")
+    @patch("main.display_results")
+    def test_main_output_jsonl(self, mock_display, mock_fetch, mock_creds):
+        """--output jsonl writes records to stdout and skips the table"""
+        from main import main as cli_main
+        from terminal import console
+
+        def fake_fetch(**kwargs):
+            events = make_events(3)
+            kwargs["on_page"](events)
+            return events
+
+        mock_fetch.side_effect = fake_fetch
+        old_stdout = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            result = cli_main(["--output", "jsonl", "--no-cache"])
+            output = sys.stdout.getvalue()
+        finally:
+            sys.stdout = old_stdout
+            console.configure()
+
+        self.assertEqual(result, 0)
+        mock_display.assert_not_called()
+        lines = output.splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(json.loads(lines[0])["service"], "EC2")
+
+    @patch("main.get_credentials", return_value=True)
+    @patch("main.fetch_health_events")
+    @patch("output_writers.os.dup2")
+    def test_main_survives_a_closed_pipe(self, mock_dup2, mock_fetch, mock_creds):
+        """A reader closing stdout early (`| head -1`) ends the run cleanly"""
+        from main import main as cli_main
+        from terminal import console
+
+        class ClosedPipe(StringIO):
+            def write(self, text):
+                raise BrokenPipeError(32, "Broken pipe")
+
+            def fileno(self):
+                return 99
+
+        def fake_fetch(**kwargs):
+            kwargs["on_page"](make_events(3))
+            self.fail("writing to a closed pipe should end the fetch")
+
+        mock_fetch.side_effect = fake_fetch
+        old_stdout = sys.stdout
+        sys.stdout = ClosedPipe()
+        try:
+            result = cli_main(["--output", "jsonl", "--no-cache"])
+        finally:
+            sys.stdout = old_stdout
+            console.configure()
+
+        self.assertEqual(result, 0)
+        self.assertEqual(mock_dup2.call_args.args[1], 99)
+
+    def test_parquet_needs_a_file(self):
+        """--output parquet without --output-file is a usage error"""
+        from main import parse_args
+
+        with patch("sys.stderr", new=StringIO()), self.assertRaises(SystemExit):
+            parse_args(["--output", "parquet"])
+
+
+if __name__ == "__main__":
+    main()
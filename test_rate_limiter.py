@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the adaptive Health API rate limiter
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase, main
+from unittest.mock import MagicMock, patch
+
+import boto3
+from botocore.awsrequest import AWSResponse
+
+from clients import ClientFactory
+from rate_limiter import AdaptiveRateLimiter, combine_stats
+
+
+class FakeClock:
+    """Manual clock whose sleep() advances time instead of blocking"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept: list = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def make_limiter(clock: FakeClock, **kwargs) -> AdaptiveRateLimiter:
+    return AdaptiveRateLimiter(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+class FakeRawResponse:
+    def stream(self, **kwargs):
+        return iter([])
+
+
+class TestAdaptiveRateLimiter(TestCase):
+    """Test cases for AdaptiveRateLimiter"""
+
+    def test_burst_then_steady_rate(self):
+        """A full bucket allows `burst` calls, then calls are spaced at 1/rate"""
+        clock = FakeClock()
+        limiter = make_limiter(clock, rate=5.0, burst=3.0)
+
+        waits = [limiter.acquire() for _ in range(6)]
+
+        self.assertEqual(waits[:3], [0.0, 0.0, 0.0])
+        for wait in waits[3:]:
+            self.assertAlmostEqual(wait, 0.2)
+        self.assertAlmostEqual(clock.now, 0.6)
+        self.assertAlmostEqual(limiter.stats().wait_time, 0.6)
+
+    def test_throttle_halves_rate_and_adds_penalty(self):
+        """A throttle cuts the rate and makes the next caller wait"""
+        clock = FakeClock()
+        limiter = make_limiter(clock, rate=8.0, burst=4.0)
+
+        with patch("rate_limiter.random.uniform", return_value=0.5):
+            limiter.on_throttle()
+
+        self.assertEqual(limiter.rate, 4.0)
+        # 1.5 tokens of debt at 4 req/s
+        self.assertAlmostEqual(limiter.acquire(), 0.375)
+        self.assertEqual(limiter.stats().throttles, 1)
+
+    def test_concurrent_throttles_count_as_one_decrease(self):
+        """Throttles inside the cooldown are counted but cut the rate once"""
+        clock = FakeClock()
+        limiter = make_limiter(clock, rate=8.0)
+
+        for _ in range(5):
+            limiter.on_throttle()
+        self.assertEqual(limiter.rate, 4.0)
+
+        clock.now += 2.0
+        limiter.on_throttle()
+        self.assertEqual(limiter.rate, 2.0)
+        self.assertEqual(limiter.stats().throttles, 6)
+
+    def test_rate_bounds(self):
+        """Successes raise the rate up to max_rate; throttles stop at min_rate"""
+        clock = FakeClock()
+        limiter = make_limiter(clock, rate=1.0, min_rate=0.5, max_rate=1.2)
+
+        for _ in range(10):
+            limiter.on_success()
+        self.assertAlmostEqual(limiter.rate, 1.2)
+
+        for _ in range(5):
+            clock.now += 2.0
+            limiter.on_throttle()
+        self.assertEqual(limiter.rate, 0.5)
+
+    def test_threads_share_the_budget(self):
+        """Concurrent callers never exceed burst + rate * elapsed"""
+        clock = FakeClock()
+        lock = threading.Lock()
+
+        def sleep(seconds):
+            with lock:
+                clock.slept.append(seconds)
+
+        limiter = AdaptiveRateLimiter(rate=10.0, burst=5.0, clock=clock, sleep=sleep)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: limiter.acquire(), range(25)))
+
+        # Time stands still, so callers queue behind each other at 1/rate
+        self.assertEqual(limiter.stats().calls, 25)
+        self.assertAlmostEqual(max(clock.slept), 2.0)
+        self.assertAlmostEqual(limiter.stats().wait_time, sum(0.1 * n for n in range(1, 21)))
+
+    def test_combine_stats(self):
+        """Per-account limiters are summed for the run summary"""
+        clock = FakeClock()
+        first, second = make_limiter(clock, rate=2.0), make_limiter(clock, rate=3.0)
+        first.acquire()
+        second.acquire()
+        second.on_throttle()
+
+        stats = combine_stats([first, second])
+        self.assertEqual((stats.calls, stats.throttles), (2, 1))
+        self.assertAlmostEqual(stats.rate, 3.5)
+
+
+class TestClientIntegration(TestCase):
+    """The limiter observes real botocore request attempts"""
+
+    def make_factory(self):
+        session = boto3.Session(
+            aws_access_key_id="testing",
+            aws_secret_access_key="testing",
+            region_name="us-east-1",
+        )
+        return ClientFactory(session)
+
+    def test_health_clients_share_one_limiter_per_account(self):
+        """Health clients are paced; other services are not"""
+        factory = self.make_factory()
+        factory.client("health", "us-east-1")
+        factory.client("health", "us-east-2")
+        factory.client("sts")
+
+        self.assertEqual(list(factory._limiters), [None])
+
+    def test_throttled_attempts_are_paced_and_counted(self):
+        """Throttling responses feed the limiter; retries acquire tokens too"""
+        factory = self.make_factory()
+        health = factory.client("health", "us-east-1")
+        responses = [
+            (400, b'{"__type": "ThrottlingException", "message": "Rate exceeded"}'),
+            (200, b'{"events": []}'),
+        ]
+
+        def fake_send(request, **kwargs):
+            status, body = responses.pop(0)
+            response = AWSResponse(request.url, status, {}, FakeRawResponse())
+            response._content = body
+            return response
+
+        # Registered after the limiter, so tokens are acquired before sending
+        health.meta.events.register("before-send.health", fake_send)
+        with patch("botocore.retries.standard.time.sleep"), patch(
+            "botocore.endpoint.time.sleep"
+        ), patch.object(factory.rate_limiter(), "_sleep"):
+            self.assertEqual(health.describe_events()["events"], [])
+
+        stats = factory.rate_limit_stats()
+        self.assertEqual(stats.calls, 2)
+        self.assertEqual(stats.throttles, 1)
+        self.assertLess(stats.rate, 10.0)
+
+    def test_async_client_is_paced_without_blocking(self):
+        """aiobotocore clients get a coroutine hook that sleeps on the loop"""
+        limiter = AdaptiveRateLimiter(rate=5.0, burst=1.0)
+        client = MagicMock()
+        client.meta.service_model.service_id.hyphenize.return_value = "health"
+        limiter.attach_async(client)
+        hooks = {call.args[0]: call.args[1] for call in client.meta.events.register.call_args_list}
+
+        async def send_three():
+            for _ in range(3):
+                await hooks["before-send.health"]()
+
+        with patch("time.sleep") as blocking_sleep:
+            asyncio.run(send_three())
+        blocking_sleep.assert_not_called()
+        self.assertEqual(limiter.stats().calls, 3)
+        self.assertGreater(limiter.stats().wait_time, 0.0)
+        self.assertIn("needs-retry.health", hooks)
+
+
+if __name__ == "__main__":
+    main()
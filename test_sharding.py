@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Unit tests for --since/--until windows and date-range sharding
+"""
+
+import shutil
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+from pathlib import Path
+from unittest import TestCase, main
+from unittest.mock import patch
+
+from event_cache import EventCache
+from fake_health import FakeHealthClient, make_health_events
+from sharding import iter_sharded_pages, parse_time_bound, split_window
+
+
+class RecordingHealthClient(FakeHealthClient):
+    """Remembers the startTimes window of every describe_events call"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.windows = set()
+
+    def describe_events(self, filter=None, **kwargs):
+        for window in (filter or {}).get("startTimes", []):
+            with self._lock:
+                self.windows.add((window["from"], window["to"]))
+        return super().describe_events(filter=filter, **kwargs)
+
+
+class TestSharding(TestCase):
+    """Test cases for time windows and sharded fetching"""
+
+    def test_parse_time_bound(self):
+        """Dates, offsets and relative durations all become naive UTC"""
+        now = datetime(2024, 6, 1, 12, 0)
+
+        self.assertEqual(parse_time_bound("2024-05-01"), datetime(2024, 5, 1))
+        self.assertEqual(
+            parse_time_bound("2024-05-01T10:00:00-03:00"), datetime(2024, 5, 1, 13, 0)
+        )
+        self.assertEqual(parse_time_bound("2024-05-01T10:00Z"), datetime(2024, 5, 1, 10, 0))
+        self.assertEqual(parse_time_bound("30d", now), now - timedelta(days=30))
+        self.assertEqual(parse_time_bound("6h", now), now - timedelta(hours=6))
+        with self.assertRaises(ValueError):
+            parse_time_bound("last tuesday")
+
+    def test_split_window(self):
+        """Sub-ranges are contiguous, cover the window and respect the minimum span"""
+        start, end = datetime(2024, 1, 1), datetime(2024, 3, 31)
+
+        windows = split_window(start, end, 4)
+        self.assertEqual(len(windows), 4)
+        self.assertEqual(windows[0][0], start)
+        self.assertEqual(windows[-1][1], end)
+        for (_, previous_end), (next_start, _) in zip(windows, windows[1:]):
+            self.assertEqual(previous_end, next_start)
+
+        self.assertEqual(len(split_window(start, start + timedelta(days=2), 8)), 2)
+        self.assertEqual(split_window(start, end, 1), [(start, end)])
+
+    def test_iter_sharded_pages_deduplicates(self):
+        """Events matched by two shards are yielded once"""
+        first = [[{"arn": "a"}, {"arn": "b"}], [{"arn": "c"}]]
+        second = [[{"arn": "c"}, {"arn": "d"}]]
+
+        pages = list(iter_sharded_pages([iter(first), iter(second)]))
+
+        arns = [event["arn"] for page in pages for event in page]
+        self.assertEqual(sorted(arns), ["a", "b", "c", "d"])
+
+    def test_iter_sharded_pages_errors_and_early_exit(self):
+        """A shard's error reaches the caller; abandoning the merge frees the shards"""
+
+        def failing():
+            yield [{"arn": "a"}]
+            raise RuntimeError("throttled")
+
+        with self.assertRaises(RuntimeError):
+            list(iter_sharded_pages([failing()]))
+
+        released = threading.Event()
+
+        def endless():
+            try:
+                n = 0
+                while True:
+                    n += 1
+                    yield [{"arn": str(n)}]
+            finally:
+                released.set()
+
+        pages = iter_sharded_pages([endless(), endless()], depth=1)
+        next(pages)
+        pages.close()
+        self.assertTrue(released.wait(5))
+
+    def test_sharded_fetch_matches_single_chain(self):
+        """Sharding returns the same events through parallel startTimes windows"""
+        from main import fetch_health_events
+
+        raw = make_health_events(700)
+        results = {}
+        for shards in (1, 4):
+            client = RecordingHealthClient(raw)
+            with patch("main.get_client", return_value=client):
+                events = fetch_health_events(shards=shards)
+            results[shards] = sorted(event.arn for event in events)
+            self.assertEqual(len(client.windows), shards)
+
+        self.assertEqual(len(results[1]), 700)
+        self.assertEqual(results[4], results[1])
+
+    def test_window_older_than_retention_comes_from_cache(self):
+        """A window the API no longer keeps is served by the cache alone"""
+        from main import fetch_health_events
+
+        tmp = tempfile.mkdtemp()
+        cache = EventCache(Path(tmp) / "events.db")
+        try:
+            old = datetime(2023, 1, 1, tzinfo=timezone.utc)
+            raw = make_health_events(50, now=old)
+            cache.upsert(raw)
+            with patch("main.get_client") as mock_get_client:
+                events = fetch_health_events(
+                    cache=cache,
+                    start_time=datetime(2022, 9, 1),
+                    end_time=datetime(2023, 1, 1),
+                )
+        finally:
+            cache.close()
+            shutil.rmtree(tmp)
+
+        mock_get_client.assert_not_called()
+        self.assertEqual(len(events), 50)
+
+    def test_narrow_window_keeps_older_updates(self):
+        """A --since run does not advance the watermark past updates to older events"""
+        from main import fetch_health_events
+
+        tmp = tempfile.mkdtemp()
+        cache = EventCache(Path(tmp) / "events.db")
+        try:
+            now = datetime.now(timezone.utc)
+            raw = make_health_events(300)
+            client = FakeHealthClient(raw)
+            # No skew, so the update below falls strictly between the syncs
+            with patch("main.get_client", return_value=client), patch(
+                "main.SYNC_WATERMARK_SKEW", timedelta(0)
+            ):
+                fetch_health_events(cache=cache)
+
+                # A closed event from 30-90 days ago is updated after the first run
+                old = next(
+                    event
+                    for event in raw
+                    if event["statusCode"] == "closed"
+                    and now - timedelta(days=80) < event["startTime"] < now - timedelta(days=40)
+                )
+                old["endTime"] += timedelta(hours=5)
+                old["lastUpdatedTime"] = datetime.now(timezone.utc)
+
+                fetch_health_events(cache=cache, start_time=datetime.utcnow() - timedelta(days=30))
+                events = fetch_health_events(cache=cache)
+        finally:
+            cache.close()
+            shutil.rmtree(tmp)
+
+        updated = next(event for event in events if event.arn == old["arn"])
+        self.assertEqual(updated.end_time, old["endTime"])
+
+    def test_window_arguments(self):
+        """--since/--until are parsed and validated"""
+        from main import parse_args
+
+        args = parse_args(["--since", "2024-01-01", "--until", "2024-02-01", "--shards", "8"])
+        self.assertEqual(args.since, datetime(2024, 1, 1))
+        self.assertEqual(args.shards, 8)
+        for argv in (
+            ["--since", "2024-02-01", "--until", "2024-01-01"],
+            ["--since", "someday"],
+            ["--until", "2024-01-01", "--watch", "60"],
+            ["--shards", "0"],
+        ):
+            with patch("sys.stderr", new=StringIO()), self.assertRaises(SystemExit):
+                parse_args(argv)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the SLA eligibility engine
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+from unittest import TestCase, main
+
+from fake_health import make_event
+from sla_rules import (
+    SLA_RULES,
+    credit_for_uptime,
+    eligible_credits,
+    evaluate_credits,
+    merge_intervals,
+    split_by_month,
+)
+
+
+UTC = timezone.utc
+
+
+def outage(n, start, hours, **kwargs):
+    end = start + timedelta(hours=hours) if hours is not None else None
+    return make_event(n, start=start, end=end, **kwargs)
+
+
+class TestSlaRules(TestCase):
+    """Test cases for the SLA rules engine"""
+
+    def test_credit_tiers(self):
+        """Each service maps uptime to its published credit tier"""
+        ec2 = SLA_RULES["EC2"]
+        self.assertEqual(credit_for_uptime(ec2, 99.995), 0.0)
+        self.assertEqual(credit_for_uptime(ec2, 99.5), 10.0)
+        self.assertEqual(credit_for_uptime(ec2, 98.0), 30.0)
+        self.assertEqual(credit_for_uptime(ec2, 90.0), 100.0)
+        self.assertEqual(credit_for_uptime(SLA_RULES["S3"], 99.95), 0.0)
+
+    def test_merge_overlapping_intervals(self):
+        """Overlapping and touching intervals merge; gaps stay separate"""
+        merged = merge_intervals(
+            [(10.0, 20.0, ("c",)), (0.0, 5.0, ("a",)), (4.0, 8.0, ("b",)), (20.0, 25.0, ("d",))]
+        )
+        self.assertEqual(merged, [(0.0, 8.0, ("a", "b")), (10.0, 25.0, ("c", "d"))])
+
+    def test_split_by_month(self):
+        """Intervals crossing a month boundary are apportioned to each month"""
+        start = datetime(2024, 1, 31, 23, tzinfo=UTC).timestamp()
+        parts = list(split_by_month(start, start + 2 * 3600))
+
+        self.assertEqual([p[0] for p in parts], ["2024-01", "2024-02"])
+        self.assertEqual([p[1] for p in parts], [3600.0, 3600.0])
+        self.assertEqual(parts[1][2], 29 * 86400)
+
+    def test_overlapping_events_are_not_double_counted(self):
+        """Two overlapping EC2 events count their union once"""
+        start = datetime(2024, 3, 10, tzinfo=UTC)
+        events = [
+            outage(1, start, 4),
+            outage(2, start + timedelta(hours=2), 4),
+            outage(3, start, 1, region="eu-west-1"),
+        ]
+
+        credits = {(c.region, c.month): c for c in evaluate_credits(events)}
+
+        us_east = credits[("us-east-1", "2024-03")]
+        self.assertEqual(us_east.downtime_seconds, 6 * 3600)
+        self.assertEqual(len(us_east.event_arns), 2)
+        self.assertAlmostEqual(us_east.uptime_percent, 100 * (1 - 6 / (31 * 24)))
+        self.assertEqual(us_east.credit_percent, 10.0)
+        self.assertEqual(credits[("eu-west-1", "2024-03")].downtime_seconds, 3600)
+
+    def test_open_events_and_unsupported_services(self):
+        """Open events run until now; services without an SLA rule are skipped"""
+        start = datetime(2024, 5, 1, tzinfo=UTC)
+        now = start + timedelta(days=2)
+        events = [
+            outage(1, start, None, status="open"),
+            outage(2, start, 10, service="SOMETHINGELSE"),
+            outage(3, datetime(2024, 5, 1), 1, service="S3"),
+        ]
+
+        credits = evaluate_credits(events, now=now)
+
+        self.assertEqual({c.service for c in credits}, {"EC2", "S3"})
+        ec2 = next(c for c in credits if c.service == "EC2")
+        self.assertEqual(ec2.downtime_seconds, 2 * 86400)
+        self.assertEqual(ec2.credit_percent, 100.0)
+        self.assertEqual(len(eligible_credits(credits)), 2)
+
+    def test_accounts_are_evaluated_separately(self):
+        """The same outage in two accounts yields one row per account"""
+        start = datetime(2024, 6, 1, tzinfo=UTC)
+        events = [
+            outage(1, start, 12, account_id="111111111111"),
+            outage(1, start, 12, account_id="222222222222"),
+        ]
+        credits = evaluate_credits(events)
+        self.assertEqual(
+            sorted(c.account_id for c in credits), ["111111111111", "222222222222"]
+        )
+
+    def test_year_of_events_across_accounts_is_fast(self):
+        """A year of events over 300 accounts evaluates well under a second"""
+        base = datetime(2024, 1, 1, tzinfo=UTC)
+        services = list(SLA_RULES)
+        events = [
+            outage(
+                n,
+                base + timedelta(hours=(n * 37) % 8760),
+                1 + n % 5,
+                service=services[n % len(services)],
+                region=("us-east-1", "eu-west-1", "ap-southeast-2")[n % 3],
+                account_id=f"{n % 300:012d}",
+            )
+            for n in range(30000)
+        ]
+
+        started = time.perf_counter()
+        credits = evaluate_credits(events, now=base + timedelta(days=366))
+        elapsed = time.perf_counter() - started
+
+        self.assertTrue(credits)
+        self.assertLess(elapsed, 1.0)
+
+    def test_display_sla_credits(self):
+        """Eligible service-months are rendered with their credit"""
+        from main import display_sla_credits
+
+        start = datetime(2024, 3, 10, tzinfo=UTC)
+        old_stdout = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            display_sla_credits(evaluate_credits([outage(1, start, 10)]))
+            output = sys.stdout.getvalue()
+        finally:
+            sys.stdout = old_stdout
+
+        self.assertIn("SLA Credit Eligibility", output)
+        self.assertIn("10h 00m", output)
+        self.assertIn("30%", output)
+
+
+if __name__ == "__main__":
+    main()
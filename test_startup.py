@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Startup budget tests: heavy modules must stay off the import path
+"""
+
+import os
+import subprocess
+import sys
+from unittest import TestCase, main
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Modules that must only be imported on code paths that use them
+HEAVY_MODULES = ("boto3", "botocore", "rich")
+
+# Cumulative `import main` budget in microseconds (boto3 + rich alone cost ~300ms)
+IMPORT_BUDGET_US = 200_000
+
+
+def run_importtime(*args):
+    """Run python -X importtime and return (exit code, {module: cumulative us})"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=HERE,
+        capture_output=True,
+        text=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative)
+    return result.returncode, modules
+
+
+class TestStartup(TestCase):
+    """Test cases for the lazy-import startup path"""
+
+    def assertNoHeavyImports(self, modules):
+        heavy = sorted(
+            name for name in modules if name.split(".")[0] in HEAVY_MODULES
+        )
+        self.assertEqual(heavy, [], "heavy modules imported at startup")
+
+    def test_import_main_is_light(self):
+        """Importing main pulls in neither boto3, botocore nor rich"""
+        code, modules = run_importtime("-c", "import main")
+
+        self.assertEqual(code, 0)
+        self.assertNoHeavyImports(modules)
+        self.assertLess(modules["main"], IMPORT_BUDGET_US)
+
+    def test_help_is_light(self):
+        """--help exits without importing heavy modules"""
+        code, modules = run_importtime("main.py", "--help")
+
+        self.assertEqual(code, 0)
+        self.assertNoHeavyImports(modules)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Unit tests for watch mode
+"""
+
+import sys
+from datetime import datetime, timedelta
+from functools import partial
+from io import StringIO
+from unittest import TestCase, main
+from unittest.mock import patch
+
+from fake_health import make_event
+from watch import (
+    CLOSED,
+    NEW,
+    REOPENED,
+    UPDATED,
+    WATERMARK_SKEW,
+    EventTracker,
+    Watcher,
+    classify_change,
+)
+
+
+BASE = datetime(2024, 1, 1)
+
+
+def watched_event(n, status="open", updated_minutes=0, account_id=None):
+    return make_event(
+        n,
+        status=status,
+        start=BASE,
+        last_updated=BASE + timedelta(minutes=updated_minutes),
+        account_id=account_id,
+    )
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = BASE + timedelta(days=1)
+
+    def __call__(self):
+        self.now += timedelta(minutes=1)
+        return self.now
+
+
+class TestWatch(TestCase):
+    """Test cases for change detection and polling"""
+
+    def test_classify_change(self):
+        """Status transitions win over plain updates"""
+        self.assertEqual(classify_change(None, ("open", BASE)), NEW)
+        self.assertEqual(classify_change(("open", BASE), ("closed", BASE)), CLOSED)
+        self.assertEqual(classify_change(("closed", BASE), ("open", BASE)), REOPENED)
+        later = BASE + timedelta(minutes=5)
+        self.assertEqual(classify_change(("open", BASE), ("open", later)), UPDATED)
+        self.assertIsNone(classify_change(("open", BASE), ("open", BASE)))
+
+    def test_tracker_reports_only_changes(self):
+        """Re-polled events that did not change are not reported"""
+        tracker = EventTracker()
+        tracker.prime([watched_event(1), watched_event(2)])
+
+        changes = tracker.update(
+            [
+                watched_event(1),
+                watched_event(2, status="closed", updated_minutes=9),
+                watched_event(3),
+            ],
+            BASE,
+        )
+
+        self.assertEqual(
+            [(c.kind, c.event.arn[-2:]) for c in changes], [(CLOSED, "_2"), (NEW, "_3")]
+        )
+        self.assertEqual(tracker.update([watched_event(3)], BASE), [])
+        # The same ARN in another account is a different event
+        self.assertEqual(tracker.update([watched_event(1, account_id="1" * 12)], BASE)[0].kind, NEW)
+
+    def test_memory_is_bounded(self):
+        """Days of polling keep tracked events and history at their caps"""
+        tracker = EventTracker(max_events=100, history_size=50)
+        for poll in range(200):
+            tracker.update([watched_event(poll * 50 + n) for n in range(50)], BASE)
+
+        self.assertEqual(len(tracker), 100)
+        self.assertEqual(len(tracker.history), 50)
+        self.assertEqual(tracker.counts[NEW], 10000)
+
+    def test_watcher_advances_watermark(self):
+        """Each poll asks for updates since the last successful poll, minus the skew"""
+        since = []
+        responses = [[watched_event(1)], RuntimeError("boom"), [watched_event(1, status="closed")]]
+
+        def poll(updated_since):
+            since.append(updated_since)
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        clock = FakeClock()
+        polls = iter([False, False, False, True])
+        watcher = Watcher(poll, 0.0, BASE, clock=clock, wait=lambda seconds: next(polls))
+        reported, errors = [], []
+        watcher.run(reported.extend, errors.append)
+
+        first_poll = BASE + timedelta(days=1, minutes=1)
+        self.assertEqual(since, [BASE - WATERMARK_SKEW] + [first_poll - WATERMARK_SKEW] * 2)
+        self.assertEqual([c.kind for c in reported], [NEW, CLOSED])
+        self.assertEqual(len(errors), 1)
+        self.assertEqual((watcher.polls, watcher.failures), (2, 1))
+
+    def test_stop_ends_the_loop(self):
+        """stop() from a callback ends the watch after the current poll"""
+        watcher = Watcher(lambda since: [watched_event(1)], 0.0, BASE)
+        watcher.run(lambda changes: watcher.stop())
+        self.assertEqual(watcher.polls, 1)
+
+    @patch("main.get_credentials", return_value=True)
+    @patch("main.fetch_health_events")
+    @patch("main.poll_health_events")
+    def test_main_watch_option(self, mock_poll, mock_fetch, mock_creds):
+        """--watch shows the baseline, then only transitions until interrupted"""
+        from main import main as cli_main
+
+        mock_fetch.return_value = [watched_event(1), watched_event(2)]
+        mock_poll.side_effect = [
+            [watched_event(1)],
+            [watched_event(1, status="closed", updated_minutes=3), watched_event(3)],
+        ]
+        waits = iter([False, False])
+
+        def wait(seconds):
+            try:
+                return next(waits)
+            except StopIteration:
+                raise KeyboardInterrupt
+
+        old_stdout = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            with patch("main.Watcher", partial(Watcher, wait=wait)):
+                result = cli_main(["--watch", "60", "--no-cache"])
+            output = sys.stdout.getvalue()
+        finally:
+            sys.stdout = old_stdout
+
+        self.assertEqual(result, 0)
+        self.assertIn("2 found", output)
+        self.assertIn("CLOSED", output)
+        self.assertIn("NEW", output)
+        self.assertIn("Stopped after 2 polls: 1 closed, 1 new", output)
+
+    def test_watch_arguments(self):
+        """Too-short intervals and multi-account scans are rejected"""
+        from main import parse_args
+
+        self.assertEqual(parse_args(["--watch", "60"]).watch, 60.0)
+        for argv in (["--watch", "1"], ["--watch", "60", "--accounts", "123456789012"]):
+            with patch("sys.stderr", new=StringIO()), self.assertRaises(SystemExit):
+                parse_args(argv)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Watch Mode
+Polls for Health events updated since a watermark and reports what changed
+"""
+
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from datetime import datetime, timedelta
+from typing import Callable, Deque, Iterable, List, NamedTuple, Optional, Tuple
+
+from health_event import HealthEvent
+
+# Shortest allowed --watch interval, to stay well inside Health API quotas
+MIN_WATCH_INTERVAL = 10.0
+
+# Each poll re-reads this far behind the watermark so updates indexed late
+# are not missed; re-read events that did not change are not reported
+WATERMARK_SKEW = timedelta(minutes=5)
+
+# Events whose last known state is kept; the least recently updated are
+# forgotten first, so memory stays flat however long the watch runs
+MAX_TRACKED_EVENTS = 50000
+
+# Recent changes kept for the end-of-watch summary
+HISTORY_SIZE = 1000
+
+# Change kinds
+NEW = "new"
+CLOSED = "closed"
+REOPENED = "reopened"
+UPDATED = "updated"
+
+EventKey = Tuple[str, Optional[str]]
+EventState = Tuple[Optional[str], Optional[datetime]]
+
+
+class EventChange(NamedTuple):
+    """An event that is new or changed since the previous poll"""
+
+    kind: str
+    event: HealthEvent
+    detected: datetime
+
+
+def classify_change(previous: Optional[EventState], current: EventState) -> Optional[str]:
+    """The change kind between two (status, last_updated) states, or None"""
+    if previous is None:
+        return NEW
+    if previous[0] != current[0]:
+        return CLOSED if current[0] == "closed" else REOPENED
+    if previous[1] != current[1]:
+        return UPDATED
+    return None
+
+
+class EventTracker:
+    """Last known status of each event plus a bounded history of changes"""
+
+    def __init__(
+        self, max_events: int = MAX_TRACKED_EVENTS, history_size: int = HISTORY_SIZE
+    ):
+        self.max_events = max_events
+        # Only (status, last_updated) per event, ordered least recently updated first
+        self._states: "OrderedDict[EventKey, EventState]" = OrderedDict()
+        self.history: Deque[EventChange] = deque(maxlen=history_size)
+        self.counts: Counter = Counter()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def _record(self, event: HealthEvent) -> Optional[str]:
+        key = (event.arn, event.account_id)
+        state = (event.status, event.last_updated)
+        previous = self._states.pop(key, None)
+        self._states[key] = state
+        return classify_change(previous, state)
+
+    def _evict(self) -> None:
+        while len(self._states) > self.max_events:
+            self._states.popitem(last=False)
+
+    def prime(self, events: Iterable[HealthEvent]) -> None:
+        """Record a baseline without reporting it as changes"""
+        for event in events:
+            self._record(event)
+        self._evict()
+
+    def update(self, events: Iterable[HealthEvent], detected: datetime) -> List[EventChange]:
+        """Record polled events and return the ones that are new or changed"""
+        changes: List[EventChange] = []
+        for event in events:
+            kind = self._record(event)
+            if kind is not None:
+                changes.append(EventChange(kind, event, detected))
+                self.counts[kind] += 1
+        self._evict()
+        self.history.extend(changes)
+        return changes
+
+
+class Watcher:
+    """
+    Calls `poll(updated_since)` every `interval` seconds, advancing the
+    watermark after each successful poll, until stopped
+    """
+
+    def __init__(
+        self,
+        poll: Callable[[datetime], List[HealthEvent]],
+        interval: float,
+        watermark: datetime,
+        tracker: Optional[EventTracker] = None,
+        clock: Callable[[], datetime] = datetime.utcnow,
+        wait: Optional[Callable[[float], bool]] = None,
+    ):
+        self.poll = poll
+        self.interval = interval
+        self.watermark = watermark
+        self.tracker = tracker or EventTracker()
+        self.polls = 0
+        self.failures = 0
+        # Wall time of the latest successful poll and when it started
+        self.last_duration: Optional[float] = None
+        self.last_success: Optional[datetime] = None
+        self._clock = clock
+        self.stopped = threading.Event()
+        # Returns True when the watch should stop instead of polling
+        self._wait = wait or self.stopped.wait
+
+    def stop(self) -> None:
+        self.stopped.set()
+
+    def poll_once(self) -> List[EventChange]:
+        started = self._clock()
+        timer = time.monotonic()
+        events = self.poll(self.watermark - WATERMARK_SKEW)
+        self.last_duration = time.monotonic() - timer
+        self.last_success = started
+        self.watermark = started
+        self.polls += 1
+        return self.tracker.update(events, started)
+
+    def run(
+        self,
+        on_changes: Callable[[List[EventChange]], None],
+        on_error: Optional[Callable[[Exception], None]] = None,
+        on_poll: Optional[Callable[[List[EventChange]], None]] = None,
+    ) -> None:
+        """
+        Poll on a fixed schedule; a failed poll keeps the watermark and retries.
+        `on_poll` runs after every poll with its changes (none if it failed).
+        """
+        next_poll = time.monotonic() + self.interval
+        while not self.stopped.is_set() and not self._wait(
+            max(0.0, next_poll - time.monotonic())
+        ):
+            # Start-to-start spacing; a slow poll delays the next, never bunches them
+            next_poll = time.monotonic() + self.interval
+            try:
+                changes = self.poll_once()
+            except Exception as e:
+                if on_error is None:
+                    raise
+                self.failures += 1
+                on_error(e)
+                changes = []
+            if changes:
+                on_changes(changes)
+            if on_poll is not None:
+                on_poll(changes)